@@ -1,94 +1,101 @@
-import geojson, json, random
+import geojson, json, os, random, sys
 import pandas as pd
 import numpy as np
 from copy import deepcopy
 
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), '..'))
+from rts_gmlc import source_data
 
-bus_df = pd.read_csv('../../SourceData/bus.csv')
-buses = list(bus_df.T.to_dict().values())
 
-bus_features = []
+def create_geojson(folder=None, output_dir='../../FormattedData/GIS', d=0.1):
+    bus_df = source_data.bus(folder)
+    buses = list(bus_df.T.to_dict().values())
 
-bus_table = {}
-gen_count = {}
+    bus_features = []
 
-for x in buses:
-    bus_table[x['Bus ID']] = x
-    gen_count['Bus ID'] = 0
+    bus_table = {}
+    gen_count = {}
 
-    xy = x['lng'], x['lat']
-    props = deepcopy(x)
-    props.pop('lng')
-    props.pop('lat')
-    geom = geojson.Point(xy)
-    f = geojson.Feature(geometry=geom, properties=props)
-    bus_features.append(f)
+    for x in buses:
+        bus_table[x['Bus ID']] = x
+        gen_count['Bus ID'] = 0
 
-bus_collect = geojson.FeatureCollection(features=bus_features)
+        xy = x['lng'], x['lat']
+        props = deepcopy(x)
+        props.pop('lng')
+        props.pop('lat')
+        geom = geojson.Point(xy)
+        f = geojson.Feature(geometry=geom, properties=props)
+        bus_features.append(f)
 
-with open('../../FormattedData/GIS/bus.geojson', 'w') as io:
-    json.dump(bus_collect, io, indent=4)
+    bus_collect = geojson.FeatureCollection(features=bus_features)
 
+    with open(os.path.join(output_dir, 'bus.geojson'), 'w') as io:
+        json.dump(bus_collect, io, indent=4)
 
-##### Process branches #####
-branch_df = pd.read_csv('../../SourceData/branch.csv')
-branches = list(branch_df.T.to_dict().values())
 
-branch_features = []
+    ##### Process branches #####
+    branch_df = source_data.branch(folder)
+    branches = list(branch_df.T.to_dict().values())
 
-for x in branches:
-    bf = bus_table[x['From Bus']]
-    bt = bus_table[x['To Bus']]    
+    branch_features = []
 
-    pf = bf['lng'], bf['lat']
-    pt = bt['lng'], bt['lat']
-    xy = pf, pt
+    for x in branches:
+        bf = bus_table[x['From Bus']]
+        bt = bus_table[x['To Bus']]
 
-    geom = geojson.LineString(xy)
-    f = geojson.Feature(geometry=geom, properties=x)
-    branch_features.append(f)
+        pf = bf['lng'], bf['lat']
+        pt = bt['lng'], bt['lat']
+        xy = pf, pt
 
-branch_collect = geojson.FeatureCollection(features=branch_features)
+        geom = geojson.LineString(xy)
+        f = geojson.Feature(geometry=geom, properties=x)
+        branch_features.append(f)
 
-with open('../../FormattedData/GIS/branch.geojson', 'w') as io:
-    json.dump(branch_collect, io, indent=4)
+    branch_collect = geojson.FeatureCollection(features=branch_features)
 
+    with open(os.path.join(output_dir, 'branch.geojson'), 'w') as io:
+        json.dump(branch_collect, io, indent=4)
 
 
 
-##### Process generators #####
-gen_df = pd.read_csv('../../SourceData/gen.csv')
-gens = list(gen_df.T.to_dict().values())
 
-gen_features = []
-gen_conn_features = []
-d = 0.1
+    ##### Process generators #####
+    gen_df = source_data.gen(folder)
+    gens = list(gen_df.T.to_dict().values())
 
-for x in gens:
-    b = bus_table[x['Bus ID']]
-    theta = random.uniform(-np.pi, np.pi)
-    A = random.uniform(0,d)
-    dx = A*np.cos(theta)
-    dy = A*np.sin(theta)
+    gen_features = []
+    gen_conn_features = []
 
-    pg = b['lng'] + dx, b['lat'] + dy 
-    geom = geojson.Point(pg)
-    f = geojson.Feature(geometry=geom, properties=x)
-    gen_features.append(f)
+    for x in gens:
+        b = bus_table[x['Bus ID']]
+        theta = random.uniform(-np.pi, np.pi)
+        A = random.uniform(0,d)
+        dx = A*np.cos(theta)
+        dy = A*np.sin(theta)
 
-    pb = b['lng'], b['lat'] 
-    xy = pb, pg
-    geom = geojson.LineString(xy)
-    f = geojson.Feature(geometry=geom, properties=x)
-    gen_conn_features.append(f)
+        pg = b['lng'] + dx, b['lat'] + dy
+        geom = geojson.Point(pg)
+        f = geojson.Feature(geometry=geom, properties=x)
+        gen_features.append(f)
 
-gen_collect = geojson.FeatureCollection(features=gen_features)
-gen_conn_collect = geojson.FeatureCollection(features=gen_conn_features)
+        pb = b['lng'], b['lat']
+        xy = pb, pg
+        geom = geojson.LineString(xy)
+        f = geojson.Feature(geometry=geom, properties=x)
+        gen_conn_features.append(f)
 
-with open('../../FormattedData/GIS/gen.geojson', 'w') as io:
-    json.dump(gen_collect, io, indent=4)
+    gen_collect = geojson.FeatureCollection(features=gen_features)
+    gen_conn_collect = geojson.FeatureCollection(features=gen_conn_features)
 
-with open('../../FormattedData/GIS/gen_conn.geojson', 'w') as io:
-    json.dump(gen_conn_collect, io, indent=4)
+    with open(os.path.join(output_dir, 'gen.geojson'), 'w') as io:
+        json.dump(gen_collect, io, indent=4)
 
-# import ipdb; ipdb.set_trace()
\ No newline at end of file
+    with open(os.path.join(output_dir, 'gen_conn.geojson'), 'w') as io:
+        json.dump(gen_conn_collect, io, indent=4)
+
+
+if __name__ == '__main__':
+    create_geojson('../../SourceData')
+
+# import ipdb; ipdb.set_trace()
@@ -401,10 +401,10 @@ mpc.gencost = [
 	1	11172.01435	11172.01435	4	30.00000	735.09774	45.33333	1018.20610	60.66667	1337.84562	76.00000	1683.09260
 	1	11172.01435	11172.01435	4	30.00000	735.09774	45.33333	1018.20610	60.66667	1337.84562	76.00000	1683.09260
 	1	28046.68102	28046.68102	4	170.00000	4772.49548	231.66667	6203.57553	293.33333	7855.66994	355.00000	9738.36720
-	1	5665.23443	5665.23443	4	22.00000	1122.43477	33.00000	1417.43201	44.00000	1742.48912	55.00000	2075.88432
-	1	5665.23443	5665.23443	4	22.00000	1122.43477	33.00000	1417.43201	44.00000	1742.48912	55.00000	2075.88432
-	1	5665.23443	5665.23443	4	22.00000	1122.43477	33.00000	1417.43201	44.00000	1742.48912	55.00000	2075.88432
-	1	5665.23443	5665.23443	4	22.00000	1122.43477	33.00000	1417.43201	44.00000	1742.48912	55.00000	2075.88432
+	1	5665.23443	5665.23443	4	22.00000	1122.43478	33.00000	1417.43201	44.00000	1742.48912	55.00000	2075.88432
+	1	5665.23443	5665.23443	4	22.00000	1122.43478	33.00000	1417.43201	44.00000	1742.48912	55.00000	2075.88432
+	1	5665.23443	5665.23443	4	22.00000	1122.43478	33.00000	1417.43201	44.00000	1742.48912	55.00000	2075.88432
+	1	5665.23443	5665.23443	4	22.00000	1122.43478	33.00000	1417.43201	44.00000	1742.48912	55.00000	2075.88432
 	1	703.75920	703.75920	4	5.00000	897.29298	7.33333	1187.80064	9.66667	1479.58817	12.00000	1791.41904
 	1	703.75920	703.75920	4	5.00000	897.29298	7.33333	1187.80064	9.66667	1479.58817	12.00000	1791.41904
 	1	22784.79562	22784.79562	4	62.00000	1500.19723	93.00000	2132.59734	124.00000	2829.87580	155.00000	3668.44490
@@ -425,8 +425,8 @@ mpc.gencost = [
 	1	5665.23443	5665.23443	4	22.00000	1116.10638	33.00000	1492.56031	44.00000	1897.96238	55.00000	2366.39182
 	1	5665.23443	5665.23443	4	22.00000	1116.10638	33.00000	1492.56031	44.00000	1897.96238	55.00000	2366.39182
 	1	28046.68102	28046.68102	4	170.00000	5170.31357	231.66667	6688.64875	293.33333	8361.59810	355.00000	10458.83751
-	1	5665.23443	5665.23443	4	22.00000	1122.43477	33.00000	1417.43201	44.00000	1742.48912	55.00000	2075.88432
-	1	5665.23443	5665.23443	4	22.00000	1122.43477	33.00000	1417.43201	44.00000	1742.48912	55.00000	2075.88432
+	1	5665.23443	5665.23443	4	22.00000	1122.43478	33.00000	1417.43201	44.00000	1742.48912	55.00000	2075.88432
+	1	5665.23443	5665.23443	4	22.00000	1122.43478	33.00000	1417.43201	44.00000	1742.48912	55.00000	2075.88432
 	1	5665.23443	5665.23443	4	22.00000	1216.84757	33.00000	1501.96739	44.00000	1800.72745	55.00000	2160.80453
 	1	5665.23443	5665.23443	4	22.00000	1216.84757	33.00000	1501.96739	44.00000	1800.72745	55.00000	2160.80453
 	1	22784.79562	22784.79562	4	62.00000	1426.14416	93.00000	2001.92316	124.00000	2679.08278	155.00000	3412.47031
@@ -465,7 +465,7 @@ mpc.gencost = [
 	1	28046.68102	28046.68102	4	170.00000	4877.56703	231.66667	6507.36825	293.33333	8374.48424	355.00000	10331.01276
 	1	28046.68102	28046.68102	4	170.00000	4877.56703	231.66667	6507.36825	293.33333	8374.48424	355.00000	10331.01276
 	1	0.00000	0.00000	4	0.00000		0		0.33333		0		0.66667		0		1.00000		0
-	1	63999.82230	63999.82230	4	396.00000	3208.98600	397.33333	3219.79067	398.66667	3230.59533	400.00000	3241.40000
+	1	63999.82230	63999.82230	4	396.00000	3208.98600	397.33333	3208.98600	398.66667	3208.98600	400.00000	3208.98600
 	1	0.00000	0.00000	4	0.00000		0		16.66667		0		33.33333		0		50.00000		0
 	1	0.00000	0.00000	4	0.00000		0		16.66667		0		33.33333		0		50.00000		0
 	1	0.00000	0.00000	4	0.00000		0		16.66667		0		33.33333		0		50.00000		0
@@ -715,7 +715,7 @@ mpc.gen_name = {
 	'122_HYDRO_4'	'HYDRO'	'Hydro';
 	'122_HYDRO_5'	'HYDRO'	'Hydro';
 	'122_HYDRO_6'	'HYDRO'	'Hydro';
-	'201_HYDRO_4'	'HYDRO'	'Hydro';
+	'201_HYDRO_4'	'ROR'	'Hydro';
 	'214_SYNC_COND_1'	'SYNC_COND'	'Sync_Cond';
 	'215_HYDRO_1'	'HYDRO'	'Hydro';
 	'215_HYDRO_2'	'HYDRO'	'Hydro';
@@ -1,20 +1,73 @@
 import argparse
 
 from script import *
+from rts_gmlc import build_cache
+import dcpf
+import scenarios
+import timeseries_cases
 
 def create(**kwargs):
 
     folder = kwargs.pop('folder')
-    create_rts_MATPOWER_file(folder)
+    use_cache = kwargs.pop('use_cache', True)
+    formats = kwargs.pop('formats', ['m'])
+    case = kwargs.pop('case', 'RTS_GMLC')
+    if case == '-':
+        # straight to stdout, e.g. to pipe the case into another tool
+        create_rts_MATPOWER_file(folder, formats, sys.stdout if formats == ['m'] else sys.stdout.buffer)
+        return
+    output_dir, stem = os.path.split(os.path.abspath(case))
+    os.makedirs(output_dir, exist_ok=True)
+    # NOTE: the case is only rebuilt when gen, bus, branch or the converter code changed
+    build_cache.build('MATPOWER', lambda: create_rts_MATPOWER_file(folder, formats, os.path.join(output_dir, stem)),
+                      inputs=[source_data.table_path(table, folder) for table in ('gen', 'bus', 'branch', 'dc_branch')],
+                      output_dir=output_dir, patterns=[stem + '.' + f for f in formats],
+                      options={'formats': sorted(formats), 'stem': stem},
+                      code=[os.path.join(curr_dir, 'script.py')], use_cache=use_cache)
 
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='Create RTS MATPOWER file.')
     parser.add_argument('--folder', dest='folder', default='../../SourceData',
                        help='source data folder path')
+    parser.add_argument('--no-cache', dest='use_cache', action='store_false',
+                       help='always rebuild instead of restoring unchanged output from the build cache')
+    parser.add_argument('--format', dest='formats', nargs='+', default=['m'], choices=FORMATS,
+                       help='output files: m (MATLAB script), mat (MATLAB v5 struct), npz (NumPy arrays)')
+    parser.add_argument('--case', dest='case', default='RTS_GMLC',
+                       help='path of the case without extension, - writes a single format to stdout')
+    parser.add_argument('--scenarios', dest='scenarios', default=None,
+                       help='CSV or YAML file of overrides, writes one case per scenario instead of RTS_GMLC')
+    parser.add_argument('--output', dest='output', default='scenarios',
+                       help='folder for the scenario cases')
+    parser.add_argument('--timeseries', dest='timeseries', default=None, choices=timeseries_cases.LAYOUTS,
+                       help='write the load and renewable time series as cases instead of the static case: '
+                            'stack (one .npz of 3-D arrays), day (one .npz per day) or snapshot (one case per period)')
+    parser.add_argument('--simulation', dest='simulation', default='DAY_AHEAD', choices=['DAY_AHEAD', 'REAL_TIME'],
+                       help='time series resolution, hourly DAY_AHEAD or 5 minute REAL_TIME')
+    parser.add_argument('--start', dest='start', default=None, help='first time series day, e.g. 2020-07-01')
+    parser.add_argument('--end', dest='end', default=None, help='time series end (exclusive), e.g. 2020-07-08')
+    parser.add_argument('--validate', dest='validate', nargs='?', const='MATPOWER-out.txt', default=None,
+                       help='solve the DC power flow of the case and compare it to a MATPOWER printout '
+                            '(default: MATPOWER-out.txt) instead of writing files')
+    parser.add_argument('--processes', dest='processes', type=int, default=None,
+                       help='worker processes for the scenario cases (default: one per CPU)')
 
     args = parser.parse_args()
 
     # todo : check if folder exists
-    create(folder = args.folder)
-
+    if args.validate:
+        result = dcpf.validate(create_mpc(args.folder), args.validate)
+        print('DC power flow in {seconds:.4f} s, max angle difference {angle:.4f} deg, '
+              'max flow difference {flow:.4f} MW'.format(**result))
+        if result['angle'] > dcpf.ANGLE_TOLERANCE or result['flow'] > dcpf.FLOW_TOLERANCE:
+            sys.exit(1)
+    elif args.timeseries:
+        timeseries_cases.export(args.case, folder = args.folder, simulation = args.simulation, start = args.start,
+                                end = args.end, layout = args.timeseries,
+                                formats = args.formats if args.timeseries == 'snapshot' else ['npz'])
+    elif args.scenarios:
+        scenarios.generate(args.scenarios, args.output, folder = args.folder, formats = args.formats,
+                           processes = args.processes)
+    else:
+        create(folder = args.folder, use_cache = args.use_cache, formats = args.formats, case = args.case)
@@ -0,0 +1,142 @@
+import re
+import time
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse import linalg
+
+# column positions as in MATPOWER's idx_bus / idx_gen / idx_brch and its bus types
+BUS_I, BUS_TYPE, PD, GS, VA = 0, 1, 2, 4, 8
+GEN_BUS, PG, GEN_STATUS = 0, 1, 7
+F_BUS, T_BUS, BR_X, TAP, SHIFT, BR_STATUS = 0, 1, 3, 8, 9, 10
+REF, NONE = 3, 4
+# MATPOWER prints angles to 0.001 degrees and flows to 0.01 MW
+ANGLE_TOLERANCE = 1e-3
+FLOW_TOLERANCE = 1e-2
+
+
+def _base(matrix):
+    # the topology of a stack of snapshots is the one of its first snapshot
+    matrix = np.asarray(matrix)
+    return matrix[0] if matrix.ndim == 3 else matrix
+
+
+def make_bdc(mpc):
+    # Bbus, Bf, Pbusinj and Pfinj of MATPOWER's makeBdc, with buses and branches in case order
+    bus, branch = _base(mpc['bus']), mpc['branch']
+    n_bus, n_branch = len(bus), len(branch)
+    index = {int(b): i for i, b in enumerate(bus[:, BUS_I])}
+    f = np.array([index[int(b)] for b in branch[:, F_BUS]])
+    t = np.array([index[int(b)] for b in branch[:, T_BUS]])
+    tap = np.where(branch[:, TAP] == 0, 1.0, branch[:, TAP])
+    b = branch[:, BR_STATUS] / branch[:, BR_X] / tap
+    rows = np.r_[np.arange(n_branch), np.arange(n_branch)]
+    Cft = sparse.csr_matrix((np.r_[np.ones(n_branch), -np.ones(n_branch)], (rows, np.r_[f, t])),
+                            shape=(n_branch, n_bus))
+    Bf = sparse.csr_matrix((np.r_[b, -b], (rows, np.r_[f, t])), shape=(n_branch, n_bus))
+    Bbus = (Cft.T @ Bf).tocsc()
+    Pfinj = b * (-branch[:, SHIFT] * np.pi / 180)
+    return Bbus, Bf, Cft.T @ Pfinj, Pfinj
+
+
+def factorize(mpc):
+    # One sparse LU of the reduced B matrix, shared by every snapshot or scenario solved with it.
+    # Only the bus loads and generator dispatch may differ between them, not the branches.
+    Bbus, Bf, Pbusinj, Pfinj = make_bdc(mpc)
+    types = _base(mpc['bus'])[:, BUS_TYPE]
+    ref = np.flatnonzero(types == REF)
+    if len(ref) != 1:
+        raise ValueError('Expected one reference bus, found {}'.format(len(ref)))
+    pvpq = np.flatnonzero((types != REF) & (types != NONE))
+    return {
+        'Bbus': Bbus, 'Bf': Bf, 'Pbusinj': Pbusinj, 'Pfinj': Pfinj, 'ref': ref[0], 'pvpq': pvpq,
+        'lu': linalg.splu(Bbus[pvpq][:, pvpq].tocsc()),
+    }
+
+
+def _stack(matrix):
+    # a single case matrix becomes a stack of one
+    matrix = np.asarray(matrix, dtype=float)
+    return matrix[None] if matrix.ndim == 2 else matrix
+
+
+def solve(mpc, bus=None, gen=None, factors=None):
+    # DC power flow of mpc as MATPOWER's rundcpf solves it, for (n, n_bus, 13) bus and (n, n_gen, 21)
+    # gen stacks at once (the mpc matrices when not given), e.g. the arrays of timeseries_cases.
+    # Returns (n, n_bus) angles in degrees, (n, n_branch) from end flows in MW and the (n, n_gen)
+    # dispatch with the mismatch picked up by the first online unit at the reference bus. The mpc
+    # bus and gen may be such stacks themselves, the buses and units are those of the first one.
+    factors = factors or factorize(mpc)
+    bus = _stack(mpc['bus'] if bus is None else bus)
+    gen = _stack(mpc['gen'] if gen is None else gen)
+    base = mpc['baseMVA']
+    n, n_bus = bus.shape[:2]
+    ref, pvpq = factors['ref'], factors['pvpq']
+
+    index = {int(b): i for i, b in enumerate(_base(mpc['bus'])[:, BUS_I])}
+    gen_bus = np.array([index[int(b)] for b in _base(mpc['gen'])[:, GEN_BUS]])
+    online = gen[:, :, GEN_STATUS] > 0
+    # (n, n_bus) injections in p.u.: online dispatch minus load and shunt conductance
+    Pbus = np.zeros((n, n_bus))
+    np.add.at(Pbus.T, gen_bus, (gen[:, :, PG] * online).T)
+    Pbus = (Pbus - bus[:, :, PD] - bus[:, :, GS]) / base - factors['Pbusinj']
+
+    Va = np.radians(bus[:, :, VA])
+    rhs = Pbus[:, pvpq] - Va[:, [ref]] * factors['Bbus'][pvpq][:, [ref]].toarray().T
+    # all snapshots are right hand sides of the same factorization
+    Va[:, pvpq] = factors['lu'].solve(np.ascontiguousarray(rhs.T)).T
+
+    flows = (factors['Bf'] @ Va.T).T + factors['Pfinj']
+    dispatch = gen[:, :, PG].copy()
+    at_ref = np.flatnonzero(gen_bus == ref)
+    mismatch = (factors['Bbus'][[ref]] @ Va.T).ravel() - Pbus[:, ref]
+    on = online[:, at_ref]
+    rows = np.flatnonzero(on.any(axis=1))
+    dispatch[rows, at_ref[on[rows].argmax(axis=1)]] += mismatch[rows] * base
+    return np.degrees(Va), flows * base, dispatch
+
+
+def read_reference(path='MATPOWER-out.txt'):
+    # bus angles and from end branch flows of the first (DC) power flow printed by run.m
+    with open(path) as f:
+        text = f.read()
+    runs = re.split(r'\n(?=MATPOWER Version )', text)
+    if len(runs) < 2 or 'DC Power Flow' not in runs[1].splitlines()[0]:
+        raise ValueError('{} does not start with a DC power flow'.format(path))
+    section = None
+    buses, angles, branches, flows = [], [], [], []
+    for line in runs[1].splitlines():
+        if 'Bus Data' in line or 'Branch Data' in line:
+            section = line.split()[1]
+            continue
+        fields = line.split()
+        if not fields or not fields[0].isdigit():
+            continue
+        if section == 'Bus':
+            buses.append(int(fields[0]))
+            # the reference bus angle is marked with a *
+            angles.append(float(fields[2].rstrip('*')))
+        elif section == 'Branch':
+            branches.append((int(fields[1]), int(fields[2])))
+            flows.append(float(fields[3]))
+    return np.array(buses), np.array(angles), np.array(branches), np.array(flows)
+
+
+def validate(mpc, reference='MATPOWER-out.txt'):
+    # Largest angle (degrees) and flow (MW) differences to the printed MATPOWER results, matched
+    # by bus number and by branch position. The printout rounds to 0.001 degrees and 0.01 MW.
+    start = time.perf_counter()
+    angles, flows, _ = solve(mpc)
+    seconds = time.perf_counter() - start
+    buses, ref_angles, branches, ref_flows = read_reference(reference)
+    positions = {int(b): i for i, b in enumerate(mpc['bus'][:, BUS_I])}
+    missing = [b for b in buses if b not in positions]
+    if missing or len(branches) != len(mpc['branch']):
+        raise ValueError('{} is a different network than the case'.format(reference))
+    if not np.array_equal(branches, mpc['branch'][:, [F_BUS, T_BUS]].astype(int)):
+        raise ValueError('{} lists the branches in a different order than the case'.format(reference))
+    return {
+        'angle': np.abs(angles[0, [positions[b] for b in buses]] - ref_angles).max(),
+        'flow': np.abs(flows[0] - ref_flows).max(),
+        'seconds': seconds,
+    }
@@ -0,0 +1,137 @@
+import multiprocessing
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from script import FORMATS, branch_status, gen_status, write_case
+from rts_gmlc import source_data
+
+try:
+    import yaml
+except ImportError:
+    # only needed for YAML scenario specs, CSV specs always work
+    yaml = None
+
+TABLES = ('gen', 'bus', 'branch', 'dc_branch')
+OPERATIONS = ('scale', 'add', 'set')
+# columns that are not in the source tables but can be overridden, e.g. to outage units
+STATUS = {'gen': gen_status, 'branch': branch_status}
+
+# parsed base tables of a pool worker, shared by all the variants it writes
+_base = {}
+
+
+def read_spec(path):
+    # Returns {scenario: [override, ...]} in file order. An override is a dict with table, column,
+    # operation, value and where, a {column: value} filter of the rows it applies to (all when empty).
+    #
+    # CSV: one override per row, with the columns scenario, table, column, operation, value and
+    # an optional where of column=value pairs separated by ';', e.g.
+    #     scenario,table,column,where,operation,value
+    #     peak,bus,MW Load,,scale,1.1
+    #     ng_up,gen,Fuel Price $/MMBTU,Fuel=NG,scale,1.5
+    #     outage,gen,status,GEN UID=101_CT_1,set,0
+    #
+    # YAML: a mapping of scenario names to lists of overrides, the operation is the key of the value:
+    #     ng_up:
+    #       - {table: gen, column: Fuel Price $/MMBTU, where: {Fuel: NG}, scale: 1.5}
+    if os.path.splitext(path)[1].lower() in ('.yml', '.yaml'):
+        if yaml is None:
+            raise ImportError('PyYAML is required to read {}'.format(path))
+        with open(path) as f:
+            spec = yaml.safe_load(f) or {}
+        scenarios = {}
+        for name, overrides in spec.items():
+            scenarios[str(name)] = [_yaml_override(o) for o in overrides or []]
+        return scenarios
+
+    rows = pd.read_csv(path, dtype=str, keep_default_na=False)
+    scenarios = {}
+    for row in rows.to_dict('records'):
+        where = dict(pair.split('=', 1) for pair in row.get('where', '').split(';') if pair.strip())
+        override = {'table': row['table'], 'column': row['column'], 'operation': row['operation'],
+                    'value': float(row['value']), 'where': {k.strip(): v.strip() for k, v in where.items()}}
+        scenarios.setdefault(row['scenario'], []).append(_check(override))
+    return scenarios
+
+
+def _yaml_override(override):
+    operations = [op for op in OPERATIONS if op in override]
+    if len(operations) != 1:
+        raise ValueError('Override {} needs exactly one of {}'.format(override, ', '.join(OPERATIONS)))
+    return _check({'table': override['table'], 'column': override['column'], 'operation': operations[0],
+                   'value': float(override[operations[0]]), 'where': override.get('where') or {}})
+
+
+def _check(override):
+    if override['table'] not in TABLES:
+        raise ValueError('Unknown table {}, expected one of {}'.format(override['table'], ', '.join(TABLES)))
+    if override['operation'] not in OPERATIONS:
+        raise ValueError('Unknown operation {}, expected one of {}'.format(override['operation'], ', '.join(OPERATIONS)))
+    return override
+
+
+def apply(tables, overrides):
+    # Returns new {table: frame} with the overrides applied as array operations on the columns
+    # they touch. Every other column is shared with the base tables, which are never modified.
+    tables = dict(tables)
+    for override in overrides:
+        table, column = override['table'], override['column']
+        frame = tables[table].copy(deep=False)
+        if column not in frame:
+            if column != 'status' or table not in STATUS:
+                raise KeyError('{} has no column {}'.format(table, column))
+            frame[column] = np.broadcast_to(STATUS[table](frame), len(frame))
+        base = frame[column].to_numpy()
+        values = base.astype(float)
+        mask = np.ones(len(frame), dtype=bool)
+        for where, wanted in override['where'].items():
+            mask &= (frame[where].astype(str) == str(wanted)).to_numpy()
+        if override['operation'] == 'scale':
+            values[mask] *= override['value']
+        elif override['operation'] == 'add':
+            values[mask] += override['value']
+        else:
+            values[mask] = override['value']
+        # integer columns stay integers while the results are whole, so unchanged values print the same
+        if np.issubdtype(base.dtype, np.integer) and np.array_equal(values, np.round(values)):
+            values = values.astype(base.dtype)
+        frame[column] = values
+        tables[table] = frame
+    return tables
+
+
+def _init(tables):
+    _base.update(tables)
+
+
+def _write(job):
+    name, overrides, output, formats = job
+    start = time.perf_counter()
+    tables = apply(_base, overrides)
+    write_case(tables['gen'], tables['bus'], tables['branch'], tables['dc_branch'], os.path.join(output, name), formats)
+    return name, time.perf_counter() - start
+
+
+def generate(spec, output, folder=None, formats=('m',), processes=None):
+    # Writes one case per scenario of the spec (a path or a {scenario: overrides} dict) to output.
+    # The base tables are parsed once and handed to the pool, every variant only costs its deltas.
+    unknown = [f for f in formats if f not in FORMATS]
+    if unknown:
+        raise ValueError('Unknown formats {}, expected some of {}'.format(unknown, ', '.join(FORMATS)))
+    scenarios = read_spec(spec) if isinstance(spec, str) else spec
+    os.makedirs(output, exist_ok=True)
+    tables = {table: getattr(source_data, table)(folder) for table in TABLES}
+    jobs = [(name, overrides, output, list(formats)) for name, overrides in scenarios.items()]
+    pool = multiprocessing.Pool(processes, initializer=_init, initargs=(tables,))
+    try:
+        written = []
+        for name, seconds in pool.imap_unordered(_write, jobs):
+            print('{:<30} {:8.3f} s'.format(name, seconds))
+            written.append(name)
+    finally:
+        pool.close()
+        pool.join()
+    return written
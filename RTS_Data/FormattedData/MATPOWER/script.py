@@ -1,65 +1,207 @@
 # coding: utf-8
 
+import contextlib
+import io
 import os
+import sys
 import pandas as pd
 import numpy as np
 
 curr_dir = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(curr_dir, '..'))
+from rts_gmlc import cost_curves, source_data
+
+try:
+    from scipy import io as scipy_io
+except ImportError:
+    # only needed for the .mat output
+    scipy_io = None
 
 DIGITS = 5
+FORMATS = ('m', 'mat', 'npz')
 
 
-def create_rts_MATPOWER_file(folder):
+def _text(column):
+    # str.format without a spec: python ints as ints and floats at full repr precision
+    return np.array([format(v) for v in column.tolist()], dtype=object)
 
-    _generators = pd.read_csv(os.path.join(folder, 'gen.csv'))
-    buses = pd.read_csv(os.path.join(folder, 'bus.csv'))
-    branchdata = pd.read_csv(os.path.join(folder, 'branch.csv'))
 
-    pivot_heat_rate = pd.DataFrame(
-        _generators[[
-            'Output_pct_0', 'Output_pct_1', 'Output_pct_2', 'Output_pct_3', 'HR_incr_1', 'HR_incr_2', 'HR_incr_3',
-            'HR_avg_0'
-        ]]
-    )
+def _fixed(column, digits=DIGITS):
+    return np.char.mod('%.{}f'.format(digits), np.asarray(column, dtype=float)).astype(object)
+
 
-    def io(r):
-        segments = 1
-        x1 = np.linspace(r['Output_pct_0'], r['Output_pct_1'], segments + 1)
-        x2 = np.linspace(r['Output_pct_1'], r['Output_pct_2'], segments + 1)
-        x3 = np.linspace(r['Output_pct_2'], r['Output_pct_3'], segments + 1)
+def _strings(values, digits):
+    # a matrix column as written to the .m file, scalars are the same default on every row
+    if np.ndim(values) == 0:
+        return format(values)
+    return _text(values) if digits is None else _fixed(values, digits)
 
-        if r['HR_avg_0'] <= 3412:
-            r['HR_avg_0'] = 3412
 
-        y1 = (x1 - x1.min()) * r['HR_incr_1'] + r['HR_avg_0'] * x1.min()
-        y2 = (x2 - x2.min()) * r['HR_incr_2'] + y1.max()
-        y3 = (x3 - x3.min()) * r['HR_incr_3'] + y2.max()
+def _numbers(values, digits, n):
+    # a matrix column as MATLAB reads it back from the .m file
+    if digits is not None:
+        return _fixed(values, digits).astype(float)
+    return np.broadcast_to(np.asarray(values, dtype=float), (n,))
 
-        return list(
-            zip(
-                list(np.concatenate([x1[:1], x1[-1:], x2[-1:], x3[-1:]])),
-                list(np.concatenate([y1[:1], y1[-1:], y2[-1:], y3[-1:]]))
-            )
-        )
 
-    pivot_heat_rate['io_cost'] = pivot_heat_rate.apply(io, axis=1)
-    _generators = pd.concat([_generators, pivot_heat_rate['io_cost']], axis=1)
-    #_generators.to_csv('_generators.csv')
+def _block(*columns, sep='\t', prefix='\t', end=''):
+    # one tab separated matrix row per element, plain strings are repeated on every row
+    n = max(len(c) for c in columns if not isinstance(c, str))
+    columns = [[c] * n if isinstance(c, str) else c for c in columns]
+    return '\n'.join(prefix + sep.join(row) + end for row in zip(*columns))
+
+
+def _matrix(columns, n):
+    return np.column_stack([_numbers(values, digits, n) for values, digits in columns])
+
 
-    NaN = pd.np.NaN
+def _areas(buses):
+    # every area with its lowest numbered bus as the (informational) reference bus
+    refbus = buses.groupby('Area', sort=True)['Bus ID'].min()
+    return [(refbus.index.to_series(), None), (refbus, None)]
+
+
+def _dcline(dc_branch):
+    # MATPOWER's dcline columns, the flow limits are the MW rating of the link in both directions
+    rating = dc_branch['MW Load']
+    return [
+        (dc_branch['From Bus'], None), (dc_branch['To Bus'], None),
+        (1, None), (0, None), (0, None), (0, None), (0, None),  #default status, PF, PT, QF, QT
+        (1, None), (1, None),  #default VF, VT
+        (-rating, None), (rating, None),
+        (-9999, None), (9999, None), (-9999, None), (9999, None),  #default QMINF, QMAXF, QMINT, QMAXT
+        (0, None), (0, None),  #default LOSS0, LOSS1
+        (0, None), (0, None), (0, None), (0, None), (0, None), (0, None),  #default MU_PMIN ... MU_QMAXT
+    ]
+
+
+def _bus(buses):
+    bus_type = buses['Bus Type'].map({'PQ': 1, 'PV': 2, 'Ref': 3}).fillna(4).astype(int)
+    return [
+        (buses['Bus ID'], None), (bus_type, None), (buses['MW Load'], None), (buses['MVAR Load'], None),
+        (buses['MW Shunt G'], None), (buses['MVAR Shunt B'], None), (buses['Area'], None), (buses['V Mag'], DIGITS),
+        (buses['V Angle'], DIGITS), (buses['BaseKV'], None), (buses['Zone'].astype(int), None),
+        (1.05, None), (0.95, None),  #default Vmax, Vmin
+    ]
+
+
+def gen_status(_generators):
+    # a status column (e.g. from a scenario outage) wins over the default of renewables and storage off
+    if 'status' in _generators:
+        return _generators['status'].astype(int)
+    return np.where(_generators['Fuel'].isin(['Wind', 'Solar', 'Storage']), 0, 1)
+
+
+def branch_status(branchdata):
+    if 'status' in branchdata:
+        return branchdata['status'].astype(int)
+    return 1  #default
+
+
+def _gen(_generators):
+    status = gen_status(_generators)
+    pmin = _generators['PMin MW'].astype(object).where(_generators['PMin MW'].notna(), 0)
+    ramp = (_generators['Ramp Rate MW/Min'], None)
+    return [
+        (_generators['Bus ID'], None), (_generators['MW Inj'], None), (_generators['MVAR Inj'], None),
+        (_generators['QMax MVAR'], None), (_generators['QMin MVAR'], None), (_generators['V Setpoint p.u.'], DIGITS),
+        (100.0, None),  #default mBase
+        (status, None), (_generators['PMax MW'], None), (pmin, None),
+        (0.0, None), (0.0, None), (0.0, None), (0.0, None), (0.0, None), (0.0, None),  #default Pc1 ... Qc2max
+        ramp, ramp, ramp, ramp,
+        (0.0, None),  #default apf
+    ]
+
+
+def _branch(branchdata):
+    rate = (branchdata['Cont Rating'], None)
+    return [
+        (branchdata['From Bus'].astype(int), None), (branchdata['To Bus'].astype(int), None),
+        (branchdata['R'], DIGITS), (branchdata['X'], DIGITS), (branchdata['B'], DIGITS), rate, rate, rate,
+        (branchdata['Tr Ratio'], None),
+        (0.0, None), (branch_status(branchdata), None), (-180, None), (180, None),  #default angle, angmin, angmax
+    ]
+
+
+def _gencost(_generators):
+    # returns the leading columns, the written cost points per row and the cost points as numbers
+    x, y = cost_curves.curves(_generators, min_heat_rate=cost_curves.MIN_HEAT_RATE)
+    pmax = _generators['PMax MW'].to_numpy(dtype=float)
+    fuel_price = _generators['Fuel Price $/MMBTU'].to_numpy(dtype=float)
+    start_fuel = _generators['Start Heat Cold MBTU'].to_numpy(dtype=float) * fuel_price
+    startup = start_fuel + _generators['Non Fuel Start Cost $'].to_numpy(dtype=float)
+
+    xs = _fixed(x * pmax[:, None])
+    ys = _fixed(cost_curves.fuel_cost(y * pmax[:, None], fuel_price))
+    curve = np.stack([xs, ys], axis=2).reshape(len(xs), -1)
+
+    # without a heat rate curve the cost is zero over a 4 point range
+    free = (y == 0.0).all(axis=1)
+    for _ in range(int((free & (_generators['Fuel'] == 'Sync_Cond').to_numpy()).sum())):
+        print('Synchronous condensor!', file=sys.stderr)
+    free_pmax = np.where(_generators['Fuel'] == 'Sync_Cond', 1, pmax)
+    free_points = _fixed(np.linspace(0, free_pmax, 4, axis=1))
+
+    text = np.where(free, ['\t\t0\t\t'.join(row) + '\t\t0' for row in free_points], ['\t'.join(row) for row in curve])
+    points = np.zeros((len(xs), max(curve.shape[1], 8)))
+    points[:, :curve.shape[1]] = curve.astype(float)
+    points[free] = 0.0
+    points[free, 0:8:2] = free_points[free].astype(float)
+
+    columns = [
+        (1, None), (np.where(np.isnan(startup), 0.0, startup), 5), (np.where(np.isnan(start_fuel), 0.0, start_fuel), 5),
+        (np.where(free, 4, x.shape[1]), None),
+    ]
+    return columns, text, points
+
+
+def _case(_generators, buses, branchdata, dc_branch):
+    gencost, cost_text, cost_points = _gencost(_generators)
+    return {
+        'areas': _areas(buses),
+        'dcline': _dcline(dc_branch),
+        'bus': _bus(buses),
+        'gen': _gen(_generators),
+        'branch': _branch(branchdata),
+        'gencost': gencost,
+        'cost_text': cost_text,
+        'cost_points': cost_points,
+        'bus_name': buses['Bus Name'].str.upper(),
+        'gen_name': (_generators['GEN UID'].str.upper(), _generators['Unit Type'], _generators['Fuel']),
+    }
+
+
+def _struct(case):
+    # the mpc struct with numeric matrices and name cells, as MATPOWER's loadcase returns it
+    n_gen = len(case['cost_points'])
+    return {
+        'version': '2',
+        'baseMVA': 100.0,
+        'areas': _matrix(case['areas'], len(case['areas'][1][0])),
+        'bus': _matrix(case['bus'], len(case['bus_name'])),
+        'gen': _matrix(case['gen'], n_gen),
+        'branch': _matrix(case['branch'], len(case['branch'][0][0])),
+        'gencost': np.column_stack([_matrix(case['gencost'], n_gen), case['cost_points']]),
+        'bus_name': np.array(case['bus_name'].tolist(), dtype=object),
+        'gen_name': np.column_stack([np.array(c.tolist(), dtype=object) for c in case['gen_name']]),
+        'dcline': _matrix(case['dcline'], len(case['dcline'][0][0])).reshape(-1, 23),
+    }
+
+
+def _write_text(case, stream, name='RTS_GMLC'):
+    # writes the .m file section by section, nothing but the current section is held in memory
 
     def s(string, padding=' '):
         return '{:%^80}'.format(padding + string + padding)
 
-    def l(string, string_list):
-        string_list.append(string)
+    separator = ['']
 
-    string_list = []
+    def l(string):
+        # every section after the first starts on a new line
+        stream.write(separator[0] + string)
+        separator[0] = '\n'
 
-    from functools import partial
-    l = partial(l, string_list=string_list)
-
-    l('function mpc = {}'.format('RTS_GMLC'))
+    l('function mpc = {}'.format(name))
     l('')
 
     l(s('RTS-GMLC Test Case'))
@@ -80,45 +222,17 @@ def create_rts_MATPOWER_file(folder):
         '''
 %% area data
 % area refbus
-mpc.areas = [
-        1    101;
-        2    201;
-        3    301;
-            ];'''
+mpc.areas = ['''
     )
+    l(_block(*[_strings(values, digits) for values, digits in case['areas']], sep='    ', prefix='        ', end=';'))
+    l('            ];')
 
     l('''
 %% bus data
 %	bus_i	type	Pd	Qd	Gs	Bs	area	Vm	Va	baseKV	zone	Vmax	Vmin
 mpc.bus = [''')
 
-    bus = dict()
-    for i, b in buses.iterrows():
-        bus['bus_i'] = b['Bus ID']
-        if b['Bus Type'] == 'PQ':
-            bus['type'] = 1
-        elif b['Bus Type'] == 'PV':
-            bus['type'] = 2
-        elif b['Bus Type'] == 'Ref':
-            bus['type'] = 3
-        else:
-            bus['type'] = 4
-        bus['Pd'] = b['MW Load']
-        bus['Qd'] = b['MVAR Load']
-        bus['Gs'] = b['MW Shunt G']
-        bus['Bs'] = b['MVAR Shunt B']
-        bus['area'] = b['Area']
-        bus['Vm'] = b['V Mag']
-        bus['Va'] = b['V Angle']
-        bus['baseKV'] = b['BaseKV']
-        bus['zone'] = int(b['Zone'])
-        bus['Vmax'] = 1.05  #default
-        bus['Vmin'] = 0.95  #default
-        bus["PRECISION"] = DIGITS
-        l(
-            '\t{bus_i}\t{type}\t{Pd}\t{Qd}\t{Gs}\t{Bs}\t{area}\t{Vm:.{PRECISION}f}\t{Va:.{PRECISION}f}\t{baseKV}\t{zone}\t{Vmax}\t{Vmin}'.
-            format(**bus)
-        )
+    l(_block(*[_strings(values, digits) for values, digits in case['bus']]))
 
     l('];')
 
@@ -129,39 +243,7 @@ mpc.bus = [''')
 mpc.gen = ['''
     )
 
-    gen = dict()
-
-    for i, g in _generators.iterrows():
-        gen['bus'] = g['Bus ID']
-        gen['Pg'] = g['MW Inj']
-        gen['Qg'] = g['MVAR Inj']
-        gen['Qmax'] = g['QMax MVAR']
-        gen['Qmin'] = g['QMin MVAR']
-        gen['Vg'] = g['V Setpoint p.u.']
-        gen['mBase'] = 100.0  #default
-        if g['Fuel'] in ['Wind', 'Solar', 'Storage']:
-            gen['status'] = 0
-        else:
-            gen['status'] = 1  #default
-        gen['Pmax'] = g['PMax MW']
-        gen['Pmin'] = g['PMin MW'] if not np.isnan(g['PMin MW']) else 0  #g['Output_pct_0'] * g['Unit Size']
-        gen['Pc1'] = 0.0  #default
-        gen['Pc2'] = 0.0  #default
-        gen['Qc1min'] = 0.0  #default
-        gen['Qc1max'] = 0.0  #default
-        gen['Qc2min'] = 0.0  #default
-        gen['Qc2max'] = 0.0  #default
-        gen['ramp_agc'] = g['Ramp Rate MW/Min']
-        gen['ramp_10'] = g['Ramp Rate MW/Min']
-        gen['ramp_30'] = g['Ramp Rate MW/Min']
-        gen['ramp_q'] = g['Ramp Rate MW/Min']
-        gen['apf'] = 0.0  #default
-        gen["PRECISION"] = DIGITS
-
-        l(
-            '	{bus}	{Pg}	{Qg}	{Qmax}	{Qmin}	{Vg:.{PRECISION}f}	{mBase}	{status}	{Pmax}	{Pmin}	{Pc1}	{Pc2}	{Qc1min}	{Qc1max}	{Qc2min}	{Qc2max}	{ramp_agc}	{ramp_10}	{ramp_30}	{ramp_q}	{apf}'.
-            format(**gen)
-        )
+    l(_block(*[_strings(values, digits) for values, digits in case['gen']]))
 
     l('];')
 
@@ -170,28 +252,7 @@ mpc.gen = ['''
 %	fbus	tbus	r	x	b	rateA	rateB	rateC	ratio	angle	status	angmin	angmax
 mpc.branch = [''')
 
-    branch = dict()
-
-    for i, b in branchdata.iterrows():
-        branch['fbus'] = int(b['From Bus'])
-        branch['tbus'] = int(b['To Bus'])
-        branch['r'] = b['R']
-        branch['x'] = b['X']
-        branch['b'] = b['B']
-        branch['rateA'] = b['Cont Rating']
-        branch['rateB'] = b['Cont Rating']
-        branch['rateC'] = b['Cont Rating']
-        branch['ratio'] = b['Tr Ratio']
-        branch['angle'] = 0.0  #default
-        branch['status'] = 1  #default
-        branch['angmin'] = -180  #default
-        branch['angmax'] = 180  #default
-        branch['PRECISION'] = DIGITS
-
-        l(
-            '	{fbus}	{tbus}	{r:.{PRECISION}f}	{x:.{PRECISION}f}	{b:.{PRECISION}f}	{rateA}	{rateB}	{rateC}	{ratio}	{angle}	{status}	{angmin}	{angmax}'.
-            format(**branch)
-        )
+    l(_block(*[_strings(values, digits) for values, digits in case['branch']]))
 
     l('];')
 
@@ -204,37 +265,7 @@ mpc.branch = [''')
 mpc.gencost = ['''
     )
 
-    gen = dict()
-
-    for i, g in _generators.iterrows():
-        gen['model'] = 1
-        gen['startup'] = (
-            (g['Start Heat Cold MMBTU'] * g['Fuel Price $/MMBTU']) + g['Non Fuel Start Cost $']
-            if not np.isnan((g['Start Heat Cold MMBTU'] * g['Fuel Price $/MMBTU']) + g['Non Fuel Start Cost $']) else 0.0
-        )
-        gen['shutdown'] = (
-            g['Start Heat Cold MMBTU'] * g['Fuel Price $/MMBTU']
-            if not np.isnan(g['Start Heat Cold MMBTU'] * g['Fuel Price $/MMBTU']) else 0.0
-        )
-        gen['cost'] = list()
-        gen['cost'] = g['io_cost']
-        if all(v[1] == 0.0 for v in g['io_cost']):  #np.isnan(g['io_cost']).any():
-            if g['Fuel'] == 'Sync_Cond':
-                print('Synchronous condensor!')
-                g['PMax MW'] = 1
-            gen['ncost'] = 4
-            gen['cost'] = '{:.05f}\t\t0\t\t{:.05f}\t\t0\t\t{:.05f}\t\t0\t\t{:.05f}\t\t0'.format(
-                *(pd.np.linspace(0, g['PMax MW'], 4))
-            )
-        else:
-            gen['cost'] = '\t'.join(
-                [
-                    '{:.05f}\t{:.05f}'.format(x * g['PMax MW'], y * g['PMax MW'] * g['Fuel Price $/MMBTU'] / 1000)
-                    for x, y in gen['cost']
-                ]
-            )  # BTU/kWh * (1000kWH/MWh) * MWh * $/MMBTU  * (1MMBTU/100000BTU) = 1/1000
-            gen['ncost'] = len(g['io_cost'])
-        l('	{model}	{startup:.5f}	{shutdown:.5f}	{ncost}	{cost}'.format(**gen))
+    l(_block(*[_strings(values, digits) for values, digits in case['gencost']] + [case['cost_text']]))
 
     l('];')
 
@@ -243,10 +274,7 @@ mpc.gencost = ['''
 % bus names
 %column_names%	name
 mpc.bus_name = {''')
-    bn = dict()
-    for i, b in buses.iterrows():
-        bn['bn'] = "\t'{:}'".format(b['Bus Name']).upper()
-        l('''{bn};'''.format(**bn))
+    l('\n'.join("\t'" + case['bus_name'] + "';"))
 
     l('};')
 
@@ -255,12 +283,8 @@ mpc.bus_name = {''')
 % generator names types and fuels
 %column_names%	name    type    fuel
 mpc.gen_name = {''')
-    gn = dict()
-    for i, g in _generators.iterrows():
-        gn['gn'] = "\t'{:}'".format(g['GEN UID']).upper()
-        gn['type'] = "'{:}'".format(g['Unit Type'])
-        gn['fuel'] = "'{:}'".format(g['Fuel'])
-        l('{gn}\t{type}\t{fuel};'.format(**gn))
+    names, types, fuels = case['gen_name']
+    l('\n'.join("\t'" + names + "'\t'" + types + "'\t'" + fuels + "';"))
 
     l('};')
 
@@ -268,11 +292,106 @@ mpc.gen_name = {''')
         '''
 %%-----  DC Line Data  -----%%
 % F_BUS T_BUS BR_STATUS PF PT QF QT VF VT PMIN PMAX QMINF QMAXF QMINT QMAXT LOSS0 LOSS1 MU_PMIN MU_PMAX MU_QMINF MU_QMAXF MU_QMINT MU_QMAXT
-mpc.dcline = [
-	113 316 1 0 0 0 0 1 1 -100 100 -9999 9999 -9999 9999 0 0 0 0 0 0 0 0
-];
-'''
+mpc.dcline = ['''
     )
-
-    with open('./RTS_GMLC.m', 'w') as f:
-        f.write('\n'.join(string_list))
+    if len(case['dcline'][0][0]):
+        l(_block(*[_strings(values, digits) for values, digits in case['dcline']], sep=' '))
+    l('];\n')
+
+
+def _open(target, mode):
+    # a path is opened (and closed again), a file object is written as it is
+    if hasattr(target, 'write'):
+        return contextlib.nullcontext(target)
+    return open(target, mode)
+
+
+def write_m(case, target, name=None):
+    # target is a path or a text stream, the MATLAB function is named after the file unless given
+    if name is None:
+        name = os.path.splitext(os.path.basename(target))[0] if isinstance(target, str) else 'RTS_GMLC'
+    with _open(target, 'w') as f:
+        _write_text(case, f, name)
+
+
+def write_mat(mpc, target):
+    # MATLAB v5 file holding the mpc struct, load(path).mpc in MATLAB
+    if scipy_io is None:
+        raise ImportError('scipy is required to write .mat files')
+    struct = dict(mpc)
+    # cells are column vectors in MATPOWER cases
+    struct['bus_name'] = mpc['bus_name'].reshape(-1, 1)
+    with _open(target, 'wb') as f:
+        scipy_io.savemat(f, {'mpc': struct}, oned_as='column')
+
+
+def write_npz(mpc, target):
+    # the names are stored as unicode arrays so that the file loads without pickle
+    arrays = {key: np.asarray(value, dtype=str) if key in ('version', 'bus_name', 'gen_name') else value
+              for key, value in mpc.items()}
+    with _open(target, 'wb') as f:
+        np.savez(f, **arrays)
+
+
+def load_npz(path):
+    with np.load(path) as data:
+        mpc = {key: data[key] for key in data.files}
+    mpc['version'] = str(mpc['version'])
+    mpc['baseMVA'] = float(mpc['baseMVA'])
+    return mpc
+
+
+def read_case(folder):
+    return _case(source_data.gen(folder), source_data.bus(folder), source_data.branch(folder),
+                 source_data.dc_branch(folder))
+
+
+def create_mpc(folder):
+    # the mpc struct in memory, nothing is written
+    return _struct(read_case(folder))
+
+
+def create_text(folder, name='RTS_GMLC'):
+    # the .m file contents in memory, nothing is written
+    text = io.StringIO()
+    write_m(read_case(folder), text, name)
+    return text.getvalue()
+
+
+def write_case(_generators, buses, branchdata, dc_branch, stem, formats=('m',)):
+    # writes stem.<format> for every format from already parsed tables and returns the mpc struct
+    unknown = [f for f in formats if f not in FORMATS]
+    if unknown:
+        raise ValueError('Unknown formats {}, expected some of {}'.format(unknown, ', '.join(FORMATS)))
+
+    case = _case(_generators, buses, branchdata, dc_branch)
+    mpc = _struct(case)
+
+    if 'm' in formats:
+        write_m(case, stem + '.m')
+    if 'mat' in formats:
+        write_mat(mpc, stem + '.mat')
+    if 'npz' in formats:
+        write_npz(mpc, stem + '.npz')
+    return mpc
+
+
+def create_rts_MATPOWER_file(folder, formats=('m',), output='./RTS_GMLC'):
+    # Writes the case for every format and returns the mpc struct. output is the path without
+    # extension, or with a single format a writable file object (text for m, binary otherwise).
+    if hasattr(output, 'write'):
+        if len(formats) != 1:
+            raise ValueError('A file object takes exactly one format, got {}'.format(', '.join(formats)))
+        case = read_case(folder)
+        mpc = _struct(case)
+        if formats[0] == 'm':
+            write_m(case, output)
+        elif formats[0] == 'mat':
+            write_mat(mpc, output)
+        elif formats[0] == 'npz':
+            write_npz(mpc, output)
+        else:
+            raise ValueError('Unknown formats {}, expected some of {}'.format(list(formats), ', '.join(FORMATS)))
+        return mpc
+    return write_case(source_data.gen(folder), source_data.bus(folder), source_data.branch(folder),
+                      source_data.dc_branch(folder), output, formats)
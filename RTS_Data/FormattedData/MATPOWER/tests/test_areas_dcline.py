@@ -0,0 +1,28 @@
+import os, sys
+import numpy as np
+
+path_file = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(path_file, '..'))
+from script import create_mpc, write_case
+from rts_gmlc import replicate
+
+source_folder = os.path.join(path_file, '..', '..', '..', 'SourceData')
+
+
+def test_base_system():
+    mpc = create_mpc(source_folder)
+    np.testing.assert_array_equal(mpc['areas'], [[1, 101], [2, 201], [3, 301]])
+    assert mpc['dcline'].shape == (1, 23)
+    np.testing.assert_array_equal(mpc['dcline'][0, [0, 1, 2, 9, 10]], [113, 316, 1, -100, 100])
+
+
+def test_replicated_system(tmp_path):
+    tables = replicate.replicate(replicate.read_tables(source_folder), 3)
+    mpc = write_case(tables['gen'], tables['bus'], tables['branch'], tables['dc_branch'], str(tmp_path / 'case'), [])
+    np.testing.assert_array_equal(mpc['areas'][:, 0], np.arange(1, 10))
+    # every area refers to its lowest numbered bus
+    bus = mpc['bus']
+    for area, refbus in mpc['areas']:
+        assert refbus == bus[bus[:, 6] == area, 0].min()
+    np.testing.assert_array_equal(mpc['dcline'][:, :2], [[113, 316], [1113, 1316], [2113, 2316]])
+    assert set(mpc['dcline'][:, :2].ravel()) <= set(bus[:, 0])
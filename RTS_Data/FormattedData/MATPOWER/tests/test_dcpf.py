@@ -0,0 +1,27 @@
+import os, sys
+import numpy as np
+
+path_file = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(path_file, '..'))
+from script import create_mpc
+import dcpf
+
+source_folder = os.path.join(path_file, '..', '..', '..', 'SourceData')
+
+
+def test_validate_against_matpower_printout():
+    result = dcpf.validate(create_mpc(source_folder), os.path.join(path_file, '..', 'MATPOWER-out.txt'))
+    assert result['angle'] < dcpf.ANGLE_TOLERANCE
+    assert result['flow'] < dcpf.FLOW_TOLERANCE
+
+
+def test_snapshot_stack_solves_like_the_base_case():
+    # a case whose bus and gen are 3-D stacks of snapshots, as in the time series cases
+    mpc = create_mpc(source_folder)
+    angles, flows, dispatch = dcpf.solve(mpc)
+    stacked = dict(mpc, bus=np.stack([mpc['bus']] * 2), gen=np.stack([mpc['gen']] * 2))
+    stacked_angles, stacked_flows, stacked_dispatch = dcpf.solve(stacked, stacked['bus'], stacked['gen'])
+    assert stacked_angles.shape[0] == 2
+    np.testing.assert_allclose(stacked_angles, np.repeat(angles, 2, axis=0))
+    np.testing.assert_allclose(stacked_flows, np.repeat(flows, 2, axis=0))
+    np.testing.assert_allclose(stacked_dispatch, np.repeat(dispatch, 2, axis=0))
@@ -0,0 +1,14 @@
+import filecmp
+import os, sys
+
+path_file = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(path_file, '..'))
+from script import create_rts_MATPOWER_file
+
+source_folder = os.path.join(path_file, '..', '..', '..', 'SourceData')
+
+
+def test_case_matches_committed_file(tmp_path):
+    # the converter reproduces the committed RTS_GMLC.m byte for byte
+    create_rts_MATPOWER_file(source_folder, ['m'], str(tmp_path / 'RTS_GMLC'))
+    assert filecmp.cmp(str(tmp_path / 'RTS_GMLC.m'), os.path.join(path_file, '..', 'RTS_GMLC.m'), shallow=False)
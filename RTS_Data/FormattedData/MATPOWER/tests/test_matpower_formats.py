@@ -0,0 +1,45 @@
+import os, sys
+import numpy as np
+from scipy import io as scipy_io
+
+path_file = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(path_file, '..'))
+from script import create_rts_MATPOWER_file, load_npz
+import dcpf
+
+source_folder = os.path.join(path_file, '..', '..', '..', 'SourceData')
+
+
+def _m_matrix(path, name):
+    # the numbers of mpc.<name> as printed in the .m file
+    with open(path) as f:
+        text = f.read()
+    block = text.split('mpc.{} = ['.format(name), 1)[1].split('];', 1)[0]
+    rows = [line.replace(';', '').split() for line in block.splitlines()]
+    return np.array([[float(v) for v in row] for row in rows if row])
+
+
+def test_binary_cases_hold_the_m_file_matrices(tmp_path):
+    stem = str(tmp_path / 'RTS_GMLC')
+    mpc = create_rts_MATPOWER_file(source_folder, ['m', 'mat', 'npz'], stem)
+    loaded = load_npz(stem + '.npz')
+    mat = scipy_io.loadmat(stem + '.mat', squeeze_me=True, struct_as_record=False)['mpc']
+    for name in ('bus', 'gen', 'branch', 'gencost', 'areas', 'dcline'):
+        printed = _m_matrix(stem + '.m', name)
+        assert mpc[name].shape == printed.shape
+        # the .m file rounds to the printed digits
+        np.testing.assert_allclose(mpc[name], printed, atol=1e-5)
+        np.testing.assert_array_equal(loaded[name], mpc[name])
+        np.testing.assert_array_equal(np.atleast_2d(getattr(mat, name)), mpc[name])
+    assert list(loaded['bus_name']) == list(mpc['bus_name'])
+    assert loaded['baseMVA'] == mat.baseMVA == 100.0
+
+
+def test_npz_case_is_valid(tmp_path):
+    # a loaded case solves like the case MATPOWER printed
+    stem = str(tmp_path / 'RTS_GMLC')
+    create_rts_MATPOWER_file(source_folder, ['npz'], stem)
+    mpc = load_npz(stem + '.npz')
+    assert mpc['bus'].ndim == mpc['gen'].ndim == 2
+    result = dcpf.validate(mpc, os.path.join(path_file, '..', 'MATPOWER-out.txt'))
+    assert result['angle'] < dcpf.ANGLE_TOLERANCE and result['flow'] < dcpf.FLOW_TOLERANCE
@@ -0,0 +1,32 @@
+import io
+import os, sys
+import numpy as np
+import pytest
+
+path_file = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(path_file, '..'))
+from script import create_rts_MATPOWER_file, create_text
+
+source_folder = os.path.join(path_file, '..', '..', '..', 'SourceData')
+committed_case = os.path.join(path_file, '..', 'RTS_GMLC.m')
+
+
+def test_text_in_memory():
+    with open(committed_case) as f:
+        assert create_text(source_folder) == f.read()
+
+
+def test_case_written_to_file_objects():
+    text = io.StringIO()
+    mpc = create_rts_MATPOWER_file(source_folder, ['m'], text)
+    assert text.getvalue() == create_text(source_folder)
+    binary = io.BytesIO()
+    create_rts_MATPOWER_file(source_folder, ['npz'], binary)
+    binary.seek(0)
+    with np.load(binary) as data:
+        np.testing.assert_array_equal(data['bus'], mpc['bus'])
+
+
+def test_file_object_takes_one_format():
+    with pytest.raises(ValueError):
+        create_rts_MATPOWER_file(source_folder, ['m', 'npz'], io.BytesIO())
@@ -0,0 +1,66 @@
+import os, sys
+import numpy as np
+
+path_file = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(path_file, '..'))
+from script import create_mpc, create_text, load_npz
+from rts_gmlc import source_data
+import scenarios
+
+source_folder = os.path.join(path_file, '..', '..', '..', 'SourceData')
+
+CSV_SPEC = """scenario,table,column,where,operation,value
+peak,bus,MW Load,,scale,1.1
+ng_up,gen,Fuel Price $/MMBTU,Fuel=NG,scale,1.5
+outage,gen,status,GEN UID=101_CT_1,set,0
+"""
+
+YAML_SPEC = """peak:
+  - {table: bus, column: MW Load, scale: 1.1}
+ng_up:
+  - {table: gen, column: Fuel Price $/MMBTU, where: {Fuel: NG}, scale: 1.5}
+outage:
+  - {table: gen, column: status, where: {GEN UID: 101_CT_1}, set: 0}
+"""
+
+
+def _tables():
+    return {table: getattr(source_data, table)(source_folder) for table in scenarios.TABLES}
+
+
+def test_csv_and_yaml_specs_agree(tmp_path):
+    (tmp_path / 'spec.csv').write_text(CSV_SPEC)
+    (tmp_path / 'spec.yaml').write_text(YAML_SPEC)
+    assert scenarios.read_spec(str(tmp_path / 'spec.csv')) == scenarios.read_spec(str(tmp_path / 'spec.yaml'))
+
+
+def test_overrides_touch_only_their_rows():
+    tables = _tables()
+    gen = scenarios.apply(tables, [{'table': 'gen', 'column': 'Fuel Price $/MMBTU', 'operation': 'scale',
+                                   'value': 1.5, 'where': {'Fuel': 'NG'}}])['gen']
+    ng = (tables['gen']['Fuel'] == 'NG').to_numpy()
+    base = tables['gen']['Fuel Price $/MMBTU'].to_numpy()
+    np.testing.assert_allclose(gen['Fuel Price $/MMBTU'].to_numpy()[ng], 1.5 * base[ng])
+    np.testing.assert_array_equal(gen['Fuel Price $/MMBTU'].to_numpy()[~ng], base[~ng])
+    # the base tables are left as they were
+    np.testing.assert_array_equal(source_data.gen(source_folder)['Fuel Price $/MMBTU'].to_numpy(), base)
+
+
+def test_generated_variants(tmp_path):
+    (tmp_path / 'spec.csv').write_text(CSV_SPEC)
+    output = tmp_path / 'scenarios'
+    written = scenarios.generate(str(tmp_path / 'spec.csv'), str(output), folder=source_folder, formats=['npz'],
+                                 processes=2)
+    assert sorted(written) == ['ng_up', 'outage', 'peak']
+    base = create_mpc(source_folder)
+    peak = load_npz(str(output / 'peak.npz'))
+    np.testing.assert_allclose(peak['bus'][:, 2], 1.1 * base['bus'][:, 2])
+    outage = load_npz(str(output / 'outage.npz'))
+    unit = list(base['gen_name'][:, 0]).index('101_CT_1')
+    assert outage['gen'][unit, 7] == 0
+    np.testing.assert_array_equal(np.delete(outage['gen'], unit, axis=0), np.delete(base['gen'], unit, axis=0))
+
+
+def test_variant_without_overrides_is_the_base_case(tmp_path):
+    scenarios.generate({'base': []}, str(tmp_path), folder=source_folder, processes=1)
+    assert (tmp_path / 'base.m').read_text() == create_text(source_folder, 'base')
@@ -0,0 +1,52 @@
+import os, sys
+import numpy as np
+
+path_file = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(path_file, '..'))
+from script import create_mpc, load_npz
+from rts_gmlc import resolver, source_data
+import dcpf
+import timeseries_cases
+
+source_folder = os.path.join(path_file, '..', '..', '..', 'SourceData')
+
+
+def test_stack_keeps_a_valid_base_case(tmp_path):
+    stem = str(tmp_path / 'RTS_GMLC_t')
+    assert timeseries_cases.export(stem, source_folder, start='2020-07-12', end='2020-07-14') == [stem + '.npz']
+    mpc = load_npz(stem + '.npz')
+    base = create_mpc(source_folder)
+    # the base case is 2-D, the snapshots are stacked beside it
+    for name in ('bus', 'gen', 'branch', 'gencost'):
+        np.testing.assert_array_equal(mpc[name], base[name])
+    assert mpc['bus_t'].shape == (48,) + base['bus'].shape
+    assert mpc['gen_t'].shape == (48,) + base['gen'].shape
+    assert len(mpc['time']) == 48 and str(mpc['time'][0]) == '2020-07-12T00:00:00'
+    angles, flows, _ = dcpf.solve(mpc, mpc['bus_t'], mpc['gen_t'])
+    assert angles.shape == (48, len(base['bus'])) and np.isfinite(flows).all()
+
+
+def test_bus_loads_follow_the_area_loads():
+    index, _, mpc, bus, gen = timeseries_cases.snapshots(source_folder, start='2020-07-12', end='2020-07-13')
+    load = resolver.series('DAY_AHEAD', 'MW Load', category='Area', start='2020-07-12', end='2020-07-13',
+                           folder=source_folder)
+    areas = source_data.bus(source_folder)['Area'].astype(str).to_numpy()
+    for area in load.columns:
+        np.testing.assert_allclose(bus[:, areas == area, timeseries_cases.PD].sum(axis=1), load[area].to_numpy())
+    # renewable limits come from their PMax MW series
+    pmax = resolver.series('DAY_AHEAD', 'PMax MW', category='Generator', start='2020-07-12', end='2020-07-13',
+                           folder=source_folder)
+    unit = list(mpc['gen_name'][:, 0]).index('309_WIND_1')
+    np.testing.assert_array_equal(gen[:, unit, timeseries_cases.PMAX], pmax['309_WIND_1'].to_numpy())
+
+
+def test_day_and_snapshot_layouts(tmp_path):
+    days = timeseries_cases.export(str(tmp_path / 'case'), source_folder, start='2020-07-12', end='2020-07-14',
+                                   layout='day')
+    assert [os.path.basename(p) for p in days] == ['case_20200712.npz', 'case_20200713.npz']
+    assert load_npz(days[1])['bus_t'].shape[0] == 24
+    snapshots = timeseries_cases.export(str(tmp_path / 'hour'), source_folder, start='2020-07-12',
+                                        end='2020-07-12 02:00', layout='snapshot', formats=['m', 'npz'])
+    assert [os.path.basename(p) for p in snapshots] == ['hour_20200712_0000.m', 'hour_20200712_0000.npz',
+                                                        'hour_20200712_0100.m', 'hour_20200712_0100.npz']
+    assert load_npz(snapshots[1])['bus'].ndim == 2
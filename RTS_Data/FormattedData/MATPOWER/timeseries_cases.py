@@ -0,0 +1,101 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from script import FORMATS, _case, _struct, write_m, write_mat, write_npz
+from rts_gmlc import resolver, source_data
+
+# column positions in mpc.bus and mpc.gen, as in MATPOWER's idx_bus / idx_gen
+PD, QD = 2, 3
+GEN_STATUS, PMAX, PMIN = 7, 8, 9
+LAYOUTS = ('stack', 'day', 'snapshot')
+
+
+def snapshots(folder=None, simulation='DAY_AHEAD', start=None, end=None):
+    # Returns the snapshot times, the base case, its mpc struct and the (n_snapshots, n_bus, 13) bus
+    # and (n_snapshots, n_gen, 21) gen matrices. Bus loads follow the load of their area, split by
+    # the share of the area's MW Load in bus.csv (reactive load keeps the bus power factor). Units
+    # with a PMax MW / PMin MW time series take their limits from it and are switched on.
+    _generators, buses = source_data.gen(folder), source_data.bus(folder)
+    case = _case(_generators, buses, source_data.branch(folder), source_data.dc_branch(folder))
+    mpc = _struct(case)
+
+    load = resolver.series(simulation, 'MW Load', category='Area', start=start, end=end, folder=folder)
+    area_total = buses.groupby('Area')['MW Load'].transform('sum').to_numpy(dtype=float)
+    areas = load.columns.get_indexer(buses['Area'].astype(str))
+    if (areas < 0).any():
+        raise KeyError('No MW Load time series for areas {}'.format(sorted(set(buses['Area'][areas < 0]))))
+    # (n_snapshots, n_bus) area load over the area's base load
+    scale = load.to_numpy()[:, areas] / area_total
+
+    bus = np.repeat(mpc['bus'][None], len(load), axis=0)
+    bus[:, :, PD] = scale * buses['MW Load'].to_numpy(dtype=float)
+    bus[:, :, QD] = scale * buses['MVAR Load'].to_numpy(dtype=float)
+
+    gen = np.repeat(mpc['gen'][None], len(load), axis=0)
+    for parameter, column in (('PMax MW', PMAX), ('PMin MW', PMIN)):
+        limits = resolver.series(simulation, parameter, category='Generator', start=start, end=end, folder=folder)
+        limits = limits.reindex(load.index)
+        positions = pd.Index(_generators['GEN UID']).get_indexer(limits.columns)
+        known = positions >= 0
+        gen[:, positions[known], column] = limits.to_numpy()[:, known]
+        if parameter == 'PMax MW':
+            gen[:, positions[known], GEN_STATUS] = 1
+    return load.index, case, mpc, bus, gen
+
+
+def _snapshot_case(case, bus, gen):
+    # the base case with the varying columns of one snapshot, for the text writer
+    case = dict(case)
+    case['bus'] = list(case['bus'])
+    case['gen'] = list(case['gen'])
+    for column in (PD, QD):
+        case['bus'][column] = (bus[:, column], None)
+    case['gen'][GEN_STATUS] = (gen[:, GEN_STATUS].astype(int), None)
+    for column in (PMAX, PMIN):
+        case['gen'][column] = (gen[:, column], None)
+    return case
+
+
+def export(output, folder=None, simulation='DAY_AHEAD', start=None, end=None, layout='stack', formats=('npz',)):
+    # layout 'stack' writes output.npz, the base case with 3-D bus_t and gen_t arrays over all
+    # snapshots and their time added, so script.load_npz still returns a valid case. 'day' writes
+    # one such output_YYYYMMDD.npz per day and 'snapshot' one output_YYYYMMDD_HHMM
+    # case per snapshot in every format. Returns the written paths.
+    if layout not in LAYOUTS:
+        raise ValueError('Unknown layout {}, expected one of {}'.format(layout, ', '.join(LAYOUTS)))
+    unknown = [f for f in formats if f not in FORMATS]
+    if unknown:
+        raise ValueError('Unknown formats {}, expected some of {}'.format(unknown, ', '.join(FORMATS)))
+    index, case, mpc, bus, gen = snapshots(folder, simulation, start, end)
+    directory = os.path.dirname(os.path.abspath(output))
+    os.makedirs(directory, exist_ok=True)
+    times = np.asarray(index, dtype='datetime64[s]')
+
+    written = []
+    if layout == 'snapshot':
+        for t, time in enumerate(index):
+            stem = '{}_{}'.format(output, time.strftime('%Y%m%d_%H%M'))
+            snapshot = dict(mpc, bus=bus[t], gen=gen[t])
+            if 'm' in formats:
+                write_m(_snapshot_case(case, bus[t], gen[t]), stem + '.m')
+            if 'mat' in formats:
+                write_mat(snapshot, stem + '.mat')
+            if 'npz' in formats:
+                write_npz(snapshot, stem + '.npz')
+            written.extend(stem + '.' + f for f in formats)
+        return written
+
+    if layout == 'stack':
+        groups = [(output, slice(None))]
+    else:
+        days = times.astype('datetime64[D]')
+        starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+        ends = np.r_[starts[1:], len(days)]
+        groups = [('{}_{}'.format(output, pd.Timestamp(days[s]).strftime('%Y%m%d')), slice(s, e))
+                  for s, e in zip(starts, ends)]
+    for stem, rows in groups:
+        write_npz(dict(mpc, bus_t=bus[rows], gen_t=gen[rows], time=times[rows]), stem + '.npz')
+        written.append(stem + '.npz')
+    return written
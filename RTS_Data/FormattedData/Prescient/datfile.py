@@ -0,0 +1,54 @@
+import functools
+import gzip
+import re
+
+import numpy as np
+
+# write buffer of plain text outputs, and the rows formatted and written at a time
+BUFFER_SIZE = 1 << 20
+CHUNK_ROWS = 1 << 16
+
+# a printf field: flags, width, precision and conversion, e.g. %15s or %12.2f
+_FIELD = re.compile(r'%[-+ #0]*\d*(?:\.\d+)?[sdifgeE]')
+
+
+def open_text(path, compress=False):
+    # path for writing with a large buffer, or path + '.gz' through gzip
+    if compress:
+        return gzip.open(path + '.gz', 'wt', compresslevel=6)
+    return open(path, 'w', buffering=BUFFER_SIZE)
+
+
+def rows(fmt, *columns):
+    # fmt % row for every row of the columns, one column per field of fmt, formatted a column at a
+    # time with NumPy. Gives the same text as formatting every row on its own.
+    fields = _FIELD.findall(fmt)
+    literals = _FIELD.split(fmt)
+    if len(fields) != len(columns):
+        raise ValueError('{!r} has {} fields for {} columns'.format(fmt, len(fields), len(columns)))
+    pieces = [literals[0]]
+    for field, column, literal in zip(fields, columns, literals[1:]):
+        pieces += [np.char.mod(field, np.asarray(column)), literal]
+    return functools.reduce(np.char.add, [p for p in pieces if not isinstance(p, str) or p])
+
+
+def write_lines(stream, lines):
+    if len(lines):
+        stream.write('\n'.join(lines))
+        stream.write('\n')
+
+
+def write_rows(stream, fmt, *columns):
+    # a whole parameter table, formatted and written in chunks so long tables stay bounded in memory
+    n = len(columns[0]) if columns else 0
+    for start in range(0, n, CHUNK_ROWS):
+        write_lines(stream, rows(fmt, *[np.asarray(c)[start:start + CHUNK_ROWS] for c in columns]))
+
+
+def write_interleaved(stream, *tables):
+    # (fmt, columns) tables of the same length, written row by row in turn, e.g. the
+    # CostPiecewisePoints and CostPiecewiseValues lines of every generator
+    n = len(tables[0][1][0]) if tables else 0
+    for start in range(0, n, CHUNK_ROWS):
+        chunk = [rows(fmt, *[np.asarray(c)[start:start + CHUNK_ROWS] for c in columns]) for fmt, columns in tables]
+        write_lines(stream, np.column_stack(chunk).ravel())
@@ -0,0 +1,160 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+curr_dir = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(curr_dir, '..'))
+from rts_gmlc import periods, resample, resolver, source_data
+import datfile
+
+FORECASTS, ACTUALS = "DAY_AHEAD", "REAL_TIME"
+# the renewable units with a Source in sources.txt, CSP is dispatched from its storage instead
+SOURCE_FUELS = ("Hydro", "Wind", "Solar")
+HEADER = "datetime,forecasts,actuals\n"
+# columns of one data file read, resampled and written at a time, this bounds the memory use
+# to BATCH_COLUMNS 5 minute series however many copies of the system the files hold
+BATCH_COLUMNS = 32
+
+
+def file_name(source):
+    # as named in sources.txt
+    return os.path.join("timeseries_data_files", source + "_forecasts_actuals.csv")
+
+
+def source_generators(generators):
+    return generators.loc[generators["Fuel"].isin(SOURCE_FUELS) & (generators["Unit Type"] != "CSP"), "GEN UID"].tolist()
+
+
+def load_sources(buses):
+    # Bus_101_Load_zone1 for bus 101 in area 1
+    return ["Bus_%d_Load_zone%d" % (bus_id, area) for bus_id, area in zip(buses["Bus ID"], buses["Area"])]
+
+
+def _pairs(pointers, parameter, category, objects):
+    # {(forecast data file, actual data file): [object, ...]}. Objects without a REAL_TIME pointer
+    # take their actuals from the forecast file, resampled like the converters do.
+    selected = pointers[(pointers["Parameter"] == parameter) & (pointers["Category"] == category)
+                        & pointers["Object"].isin(objects)]
+    forecast = selected[selected["Simulation"] == FORECASTS].set_index("Object")["Data File"]
+    actual = selected[selected["Simulation"] == ACTUALS].set_index("Object")["Data File"]
+    missing = [obj for obj in objects if obj not in forecast.index]
+    for obj in missing:
+        print("***WARNING - No %s %s time series pointer found for %s" % (FORECASTS, parameter, obj))
+    pairs = {}
+    for obj in objects:
+        if obj in forecast.index:
+            pairs.setdefault((forecast[obj], actual.get(obj, forecast[obj])), []).append(obj)
+    return pairs
+
+
+class _Pair(object):
+    # the forecast and actual stores of one pair of data files over [start, end), read a batch of
+    # columns at a time on the hourly grid of the forecasts
+
+    def __init__(self, forecast_file, actual_file, start, end, folder):
+        self.forecast = resample.open_simulation(forecast_file, FORECASTS, folder)
+        self.actual = resample.open_simulation(actual_file, ACTUALS, folder)
+        self.resolution = periods.simulation_resolution(FORECASTS, folder)
+        self.forecast_rows = self.forecast.rows(start, end)
+        self.actual_rows = self.actual.rows(start, end)
+        self.index = resample.resample_index(self.forecast.index[self.forecast_rows], self.forecast.resolution,
+                                             self.resolution)
+        actual_index = resample.resample_index(self.actual.index[self.actual_rows], self.actual.resolution,
+                                               self.resolution)
+        # hours of the forecasts without actuals are written as NaN
+        self.positions = actual_index.get_indexer(self.index)
+
+    def _read(self, store, rows, columns):
+        positions = [store.columns.index(c) for c in columns]
+        values = store.values[rows][:, positions]
+        return resample.resample(values, store.index[rows], store.resolution, self.resolution)
+
+    def read(self, objects):
+        forecasts = self._read(self.forecast, self.forecast_rows,
+                               [resolver.pointer_column(self.forecast, obj) for obj in objects])
+        actuals = self._read(self.actual, self.actual_rows,
+                             [resolver.pointer_column(self.actual, obj) for obj in objects])
+        actuals = np.vstack([actuals, np.full((1, len(objects)), np.nan)])[self.positions]
+        return forecasts, actuals
+
+
+def _write(path, stamps, forecasts, actuals, compress):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    stream = datfile.open_text(path, compress)
+    stream.write(HEADER)
+    datfile.write_rows(stream, "%s,%f,%f", stamps, forecasts, actuals)
+    stream.close()
+    return path + (".gz" if compress else "")
+
+
+def _stamps(index):
+    return np.asarray(index.strftime("%Y-%m-%d %H:%M:%S"))
+
+
+def write_all(output_dir=".", folder=None, start=None, end=None, copper_sheet=True, compress=False):
+    # Writes the forecasts_actuals file of every source in sources.txt below output_dir, each
+    # holding the DAY_AHEAD series as forecasts and the REAL_TIME series averaged over every hour
+    # as actuals, for [start, end) (default: the whole year). Every data file is read once, a
+    # batch of columns at a time, and fanned out to the files of its units, buses or the copper
+    # sheet. Returns the written paths.
+    pointers = source_data.timeseries_pointers(folder)
+    generators = source_data.gen(folder)
+    buses = source_data.bus(folder)
+    written = []
+
+    for (forecast_file, actual_file), objects in _pairs(pointers, "PMax MW", "Generator",
+                                                        source_generators(generators)).items():
+        pair = _Pair(forecast_file, actual_file, start, end, folder)
+        stamps = _stamps(pair.index)
+        for batch in range(0, len(objects), BATCH_COLUMNS):
+            names = objects[batch:batch + BATCH_COLUMNS]
+            forecasts, actuals = pair.read(names)
+            for j, name in enumerate(names):
+                written.append(_write(os.path.join(output_dir, file_name(name)), stamps,
+                                      forecasts[:, j], actuals[:, j], compress))
+
+    # bus loads are the load of their area split by the bus share of the area's MW Load
+    areas = [str(area) for area in buses["Area"].unique()]
+    pairs = _pairs(pointers, "MW Load", "Area", areas)
+    if len(pairs) != 1:
+        raise ValueError("Expected the area loads in one data file, found {}".format(len(pairs)))
+    (forecast_file, actual_file), areas = next(iter(pairs.items()))
+    pair = _Pair(forecast_file, actual_file, start, end, folder)
+    stamps = _stamps(pair.index)
+    forecasts, actuals = pair.read(areas)
+    if copper_sheet:
+        written.append(_write(os.path.join(output_dir, file_name("Load")), stamps,
+                              forecasts.sum(axis=1), actuals.sum(axis=1), compress))
+        return written
+
+    bus_area = pd.Index(areas).get_indexer(buses["Area"].astype(str))
+    bus_load = buses["MW Load"].to_numpy(dtype=float)
+    share = bus_load / np.bincount(bus_area, weights=bus_load)[bus_area]
+    for name, area, factor in zip(load_sources(buses), bus_area, share):
+        written.append(_write(os.path.join(output_dir, file_name(name)), stamps,
+                              forecasts[:, area] * factor, actuals[:, area] * factor, compress))
+    return written
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Write the Prescient forecasts_actuals file of every source in '
+                                                 'sources.txt.')
+    parser.add_argument('mode', nargs='?', choices=['output-network'], default=None,
+                        help='output-network writes one load file per bus instead of the copper sheet load')
+    parser.add_argument('--output-dir', dest='output_dir', default='.',
+                        help='folder of sources.txt, the files go to its timeseries_data_files subfolder')
+    parser.add_argument('--folder', dest='folder', default='.',
+                        help='source data folder path (default: the current folder, i.e. run from SourceData)')
+    parser.add_argument('--start', dest='start', default=None, help='first day, e.g. 2020-07-01 (default: all)')
+    parser.add_argument('--end', dest='end', default=None, help='end day (exclusive)')
+    parser.add_argument('--gzip', dest='compress', action='store_true', help='write gzip compressed files')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    paths = write_all(args.output_dir, os.path.abspath(args.folder), args.start, args.end,
+                      copper_sheet=args.mode != 'output-network', compress=args.compress)
+    print("%d forecasts_actuals files written in %.2f s" % (len(paths), time.perf_counter() - started))
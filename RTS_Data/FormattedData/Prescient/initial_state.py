@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+
+# committed capacity covers the net load plus this share of it, standing in for the reserve products
+RESERVE_MARGIN = 0.1
+HOUR = pd.Timedelta(hours=1)
+# hours the merit order holds its first hour before the window, so the first day starts from whole day runs
+WARM_UP_HOURS = 24
+
+
+def read_solution(path, value="Unit State"):
+    # A solved commitment (value "Unit State") or dispatch (value "Dispatch") as an hours x units
+    # frame, either in the layout of the PLEXOS solution files (a time column and one column per
+    # unit) or from the thermal_detail.csv of a Prescient run (Date, Hour, Generator columns).
+    frame = pd.read_csv(path)
+    if "Generator" in frame.columns:
+        stamps = pd.to_datetime(frame["Date"]) + pd.to_timedelta(frame["Hour"], unit="h")
+        frame = frame.assign(time=stamps).pivot_table(index="time", columns="Generator", values=value, aggfunc="first")
+        return frame.astype(float).sort_index()
+    frame.index = pd.to_datetime(frame.pop("time"))
+    return frame.astype(float).sort_index()
+
+
+def run_lengths(on):
+    # (n_hours, n_units) commitment -> the signed length of the run every hour ends, +hours on and
+    # -hours off, which is the UnitOnT0State of the hour after it
+    on = np.asarray(on) > 0
+    hours = np.arange(len(on))[:, None]
+    changed = np.ones(on.shape, dtype=bool)
+    changed[1:] = on[1:] != on[:-1]
+    start = np.maximum.accumulate(np.where(changed, hours, 0), axis=0)
+    length = hours - start + 1
+    return np.where(on, length, -length)
+
+
+def states(index, units, on, power):
+    # the unit states after every hour of a commitment over index, see at()
+    return {
+        "index": pd.DatetimeIndex(index),
+        "units": list(units),
+        "state": run_lengths(on),
+        "power": np.where(np.asarray(on) > 0, power, 0.0),
+    }
+
+
+def from_solution(commitment, generation=None, min_power=None, max_power=None):
+    # States of read_solution frames. Committed units generate within min_power and max_power
+    # (Series by unit), at their minimum when there is no dispatch to read.
+    on = commitment.to_numpy() > 0
+    low = min_power.reindex(commitment.columns).to_numpy(dtype=float)
+    high = max_power.reindex(commitment.columns).to_numpy(dtype=float)
+    if generation is None:
+        power = np.broadcast_to(low, on.shape)
+    else:
+        power = np.clip(generation.reindex(index=commitment.index, columns=commitment.columns).to_numpy(), low, high)
+    return states(commitment.index, commitment.columns, on, power)
+
+
+def merit_order(index, units, net_load, capacity, min_power, cost, must_run=None, margin=RESERVE_MARGIN):
+    # Pre-dispatch of the (n_hours,) net load over index: every hour commits units in order of cost,
+    # must run units first, until their capacity covers the net load plus margin, and loads the
+    # committed units in the same order above their minimum output. Every hour is one row of the
+    # same array operations, so a year of hours takes no longer than a few loops over the units.
+    # Minimum up and down times and ramp rates are left to the unit commitment that follows.
+    capacity, min_power, cost = (np.asarray(a, dtype=float) for a in (capacity, min_power, cost))
+    must_run = np.zeros(len(capacity), dtype=bool) if must_run is None else np.asarray(must_run, dtype=bool)
+    order = np.argsort(np.where(must_run, -np.inf, cost), kind="stable")
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+
+    net = np.clip(np.asarray(net_load, dtype=float), 0, None)
+    covered = np.cumsum(capacity[order])
+    needed = np.searchsorted(covered, net * (1 + margin)) + 1
+    needed = np.clip(needed, must_run.sum(), len(order))
+    on = rank[None, :] < needed[:, None]
+
+    # the committed units are a prefix of the merit order, so the headroom below every committed
+    # unit is a cumulative sum over that order
+    headroom = capacity - min_power
+    below = (np.cumsum(headroom[order]) - headroom[order])[rank]
+    remaining = np.clip(net - on @ min_power, 0, None)
+    power = on * (min_power + np.clip(remaining[:, None] - below[None, :], 0, headroom))
+
+    # the hours before the window repeat its first one
+    index = pd.DatetimeIndex(index)
+    warm_up = pd.date_range(end=index[0] - HOUR, periods=WARM_UP_HOURS, freq=HOUR)
+    on = np.vstack([np.repeat(on[:1], WARM_UP_HOURS, axis=0), on])
+    power = np.vstack([np.repeat(power[:1], WARM_UP_HOURS, axis=0), power])
+    return states(warm_up.append(index), units, on, power)
+
+
+def at(states, day):
+    # ({unit: UnitOnT0State}, {unit: PowerGeneratedT0}) at the start of day, from the hour before
+    # it, or None when the states do not cover that hour
+    position = states["index"].get_indexer([pd.Timestamp(day) - HOUR])[0]
+    if position < 0:
+        return None
+    return (dict(zip(states["units"], states["state"][position].tolist())),
+            dict(zip(states["units"], states["power"][position].tolist())))
@@ -0,0 +1,59 @@
+import gzip
+import io
+import os, sys
+from datetime import datetime
+import numpy as np
+import pytest
+
+path_file = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(path_file, '..'))
+import datfile
+import topysp
+
+source_folder = os.path.join(path_file, '..', '..', '..', 'SourceData')
+
+rng = np.random.default_rng(0)
+NAMES = np.array(['101_CT_%d' % i for i in range(100)])
+VALUES = rng.uniform(-1e4, 1e4, 100)
+COUNTS = rng.integers(-200, 200, 100)
+
+
+def _printed(fmt, *columns):
+    return [fmt % row for row in zip(*[np.asarray(c).tolist() for c in columns])]
+
+
+@pytest.mark.parametrize('fmt, columns', [
+    ('%15s %3d %12.2f', (NAMES, COUNTS, VALUES)),
+    ('param %-12s := %f ;', (NAMES, VALUES)),
+    ('%s,%.4f,%d', (NAMES, VALUES, COUNTS)),
+    ('%10.1f', (VALUES,)),
+])
+def test_rows_format_like_every_row_on_its_own(fmt, columns):
+    assert datfile.rows(fmt, *columns).tolist() == _printed(fmt, *columns)
+
+
+def test_rows_need_a_column_per_field():
+    with pytest.raises(ValueError):
+        datfile.rows('%s %f', NAMES)
+
+
+def test_chunked_tables(monkeypatch):
+    monkeypatch.setattr(datfile, 'CHUNK_ROWS', 7)
+    stream = io.StringIO()
+    datfile.write_rows(stream, '%15s %12.2f', NAMES, VALUES)
+    assert stream.getvalue() == ''.join(line + '\n' for line in _printed('%15s %12.2f', NAMES, VALUES))
+    stream = io.StringIO()
+    datfile.write_interleaved(stream, ('a %s', (NAMES,)), ('b %.1f', (VALUES,)))
+    expected = [line for pair in zip(_printed('a %s', NAMES), _printed('b %.1f', VALUES)) for line in pair]
+    assert stream.getvalue() == ''.join(line + '\n' for line in expected)
+
+
+def test_gzip_output_is_the_plain_output(tmp_path):
+    static = topysp.read_static(source_folder)
+    day = datetime(2020, 7, 12)
+    static['initial_states'] = topysp.initial_states(static, day, day)
+    day_data = topysp.read_day(static, day)
+    topysp.write_dat(static, day_data, str(tmp_path / 'rts_gmlc.dat'), copper_sheet=False)
+    topysp.write_dat(static, day_data, str(tmp_path / 'rts_gmlc.dat'), copper_sheet=False, compress=True)
+    with gzip.open(str(tmp_path / 'rts_gmlc.dat.gz'), 'rt') as f:
+        assert f.read() == (tmp_path / 'rts_gmlc.dat').read_text()
@@ -0,0 +1,64 @@
+import gzip
+import os, re, sys
+import numpy as np
+import pandas as pd
+
+path_file = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(path_file, '..'))
+import forecasts_actuals
+from rts_gmlc import resolver, timeseries
+
+source_folder = os.path.join(path_file, '..', '..', '..', 'SourceData')
+START, END = '2020-07-12', '2020-07-14'
+
+
+def _sources(name):
+    # the forecasts_actuals files sources.txt points at
+    with gzip.open(os.path.join(path_file, 'data', name), 'rt') as f:
+        return set(re.findall(r'forecasts_file="([^"]+)"', f.read()))
+
+
+def _read(output, source):
+    return pd.read_csv(os.path.join(output, forecasts_actuals.file_name(source)), index_col='datetime',
+                       parse_dates=True)
+
+
+def test_copper_sheet_files(tmp_path):
+    paths = forecasts_actuals.write_all(str(tmp_path), source_folder, START, END)
+    assert set(os.path.relpath(p, str(tmp_path)) for p in paths) == _sources('sources_copper_sheet.txt.gz')
+
+    # forecasts are the hourly DAY_AHEAD series, actuals the REAL_TIME series averaged over every hour
+    wind = _read(str(tmp_path), '309_WIND_1')
+    assert len(wind) == 48 and wind.index[0] == pd.Timestamp(START)
+    forecast = timeseries.read_window('../timeseries_data_files/WIND/DAY_AHEAD_wind.csv', START, END,
+                                      ['309_WIND_1'], source_folder)
+    actual = timeseries.read_window('../timeseries_data_files/WIND/REAL_TIME_wind.csv', START, END,
+                                    ['309_WIND_1'], source_folder)
+    np.testing.assert_allclose(wind['forecasts'], forecast['309_WIND_1'], atol=1e-6)
+    np.testing.assert_allclose(wind['actuals'], actual['309_WIND_1'].to_numpy().reshape(48, 12).mean(axis=1),
+                               atol=1e-6)
+
+    # units without a REAL_TIME file take their actuals from the forecasts
+    pv = _read(str(tmp_path), '314_PV_1')
+    np.testing.assert_allclose(pv['actuals'], pv['forecasts'])
+
+    load = _read(str(tmp_path), 'Load')
+    areas = resolver.series('DAY_AHEAD', 'MW Load', category='Area', start=START, end=END, folder=source_folder)
+    np.testing.assert_allclose(load['forecasts'], areas.sum(axis=1), atol=1e-6)
+
+
+def test_network_bus_loads(tmp_path):
+    paths = forecasts_actuals.write_all(str(tmp_path), source_folder, START, END, copper_sheet=False)
+    assert set(os.path.relpath(p, str(tmp_path)) for p in paths) == _sources('sources_network.txt.gz')
+    copper = forecasts_actuals.write_all(str(tmp_path / 'copper'), source_folder, START, END)
+    # the bus loads add up to the copper sheet load
+    total = sum(pd.read_csv(p)[['forecasts', 'actuals']].to_numpy() for p in paths if '_Load_zone' in p)
+    expected = pd.read_csv([p for p in copper if p.endswith('Load_forecasts_actuals.csv')][0])
+    np.testing.assert_allclose(total, expected[['forecasts', 'actuals']].to_numpy(), rtol=1e-5)
+
+
+def test_compressed_files(tmp_path):
+    paths = forecasts_actuals.write_all(str(tmp_path), source_folder, START, END, compress=True)
+    assert all(p.endswith('.csv.gz') for p in paths)
+    with gzip.open(paths[0], 'rt') as f:
+        assert f.readline() == forecasts_actuals.HEADER
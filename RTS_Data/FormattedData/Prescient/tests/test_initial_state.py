@@ -0,0 +1,62 @@
+import os, sys
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+path_file = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(path_file, '..'))
+import initial_state
+import topysp
+
+source_folder = os.path.join(path_file, '..', '..', '..', 'SourceData')
+
+
+def test_plexos_commitment_reproduces_on_time_files():
+    # the UnitOnT0State of the on_time files topysp used to read
+    static = topysp.read_static(source_folder)
+    static['initial_states'] = topysp.initial_states(static, datetime(2020, 7, 12), datetime(2020, 7, 15))
+    for day in (12, 15):
+        expected = pd.read_csv(os.path.join(topysp.PLEXOS_SOLUTION_DIR, 'on_time_7.%d.csv' % day)).iloc[0]
+        found = topysp.read_day(static, datetime(2020, 7, day))['unit_on_t0_state_dict']
+        assert found == {unit: int(state) for unit, state in expected.items()}
+
+
+def test_run_lengths_first_hour():
+    np.testing.assert_array_equal(initial_state.run_lengths([[1, 0]]), [[1, -1]])
+
+
+def test_run_lengths_all_on_and_all_off():
+    on = np.zeros((5, 2))
+    on[:, 0] = 1
+    np.testing.assert_array_equal(initial_state.run_lengths(on), [[1, -1], [2, -2], [3, -3], [4, -4], [5, -5]])
+
+
+def test_run_lengths_restart_on_every_change():
+    on = [[1], [1], [0], [1], [0], [0]]
+    np.testing.assert_array_equal(initial_state.run_lengths(on)[:, 0], [1, 2, -1, 1, -1, -2])
+
+
+def test_merit_order_commits_cheapest_units_first():
+    index = pd.date_range('2020-07-01', periods=3, freq='h')
+    capacity, min_power, cost = [100, 50, 50], [10, 20, 5], [30, 10, 20]
+    states = initial_state.merit_order(index, ['a', 'b', 'c'], [0, 120, 200], capacity, min_power, cost,
+                                       must_run=[True, False, False])
+    # the window starts after WARM_UP_HOURS copies of its first hour
+    assert len(states['index']) == initial_state.WARM_UP_HOURS + len(index)
+    assert states['index'][initial_state.WARM_UP_HOURS] == index[0]
+    on = states['state'][initial_state.WARM_UP_HOURS:] > 0
+    # the must run unit, then b: 150 MW covers 120 MW plus the margin, 200 MW takes all units
+    np.testing.assert_array_equal(on, [[True, False, False], [True, True, False], [True, True, True]])
+    power = states['power'][initial_state.WARM_UP_HOURS:]
+    np.testing.assert_allclose(power.sum(axis=1), [10, 120, 200])
+    # the committed units are loaded in merit order
+    np.testing.assert_allclose(power[1], [100, 20, 0])
+    # no hour loads a unit beyond its limits
+    assert (power <= np.array(capacity)).all() and (power[on] >= np.broadcast_to(min_power, on.shape)[on]).all()
+
+
+def test_at_outside_of_states():
+    index = pd.date_range('2020-07-01', periods=24, freq='h')
+    states = initial_state.states(index, ['a'], np.ones((24, 1)), np.full((24, 1), 5.0))
+    assert initial_state.at(states, datetime(2020, 7, 1)) is None
+    assert initial_state.at(states, datetime(2020, 7, 2)) == ({'a': 24}, {'a': 5.0})
@@ -0,0 +1,77 @@
+import gzip
+import os, sys
+from datetime import datetime
+
+path_file = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(path_file, '..'))
+import topysp
+
+source_folder = os.path.join(path_file, '..', '..', '..', 'SourceData')
+DAY = datetime(2020, 7, 12)
+
+
+def _expected(name):
+    # written by the print-per-line topysp.py with the 7/12 PLEXOS on_time file
+    with gzip.open(os.path.join(path_file, 'data', name), 'rt') as f:
+        return f.read()
+
+
+def _day(static):
+    static['initial_states'] = topysp.initial_states(static, DAY, DAY)
+    day_data = topysp.read_day(static, DAY)
+    # committed units started at their minimum output back then, see initial_state for the PLEXOS dispatch
+    generators = static['generator_dict']
+    day_data['power_generated_t0_dict'] = {unit: 0.0 if state < 0 else generators[unit].MinPower
+                                           for unit, state in day_data['unit_on_t0_state_dict'].items()}
+    return day_data
+
+
+def test_copper_sheet_day_matches_the_original_writer(tmp_path):
+    static = topysp.read_static(source_folder)
+    topysp.write_dat(static, _day(static), str(tmp_path / 'rts_gmlc.dat'))
+    topysp.write_sources(static, str(tmp_path / 'sources.txt'))
+    assert (tmp_path / 'rts_gmlc.dat').read_text() == _expected('rts_gmlc_20200712_copper_sheet.dat.gz')
+    assert (tmp_path / 'sources.txt').read_text() == _expected('sources_copper_sheet.txt.gz')
+
+
+def test_date_range_export(tmp_path):
+    serial = topysp.export('2020-07-12', '2020-07-15', str(tmp_path / 'serial'), source_folder, processes=1)
+    pooled = topysp.export('2020-07-12', '2020-07-15', str(tmp_path / 'pooled'), source_folder, processes=2)
+    names = ['rts_gmlc_20200712.dat', 'rts_gmlc_20200713.dat', 'rts_gmlc_20200714.dat']
+    assert [os.path.basename(p) for p in serial] == [os.path.basename(p) for p in pooled] == names
+    for name in names + ['sources.txt']:
+        assert (tmp_path / 'serial' / name).read_text() == (tmp_path / 'pooled' / name).read_text()
+    # a single day keeps the historical file name
+    assert topysp.export('2020-07-12', output_dir=str(tmp_path / 'day'), folder=source_folder) == \
+        [str(tmp_path / 'day' / 'rts_gmlc.dat')]
+
+
+def test_network_day_matches_the_original_writer(tmp_path):
+    static = topysp.read_static(source_folder)
+    topysp.write_dat(static, _day(static), str(tmp_path / 'rts_gmlc.dat'), copper_sheet=False)
+    topysp.write_sources(static, str(tmp_path / 'sources.txt'), copper_sheet=False)
+    assert (tmp_path / 'rts_gmlc.dat').read_text() == _expected('rts_gmlc_20200712_network.dat.gz')
+    assert (tmp_path / 'sources.txt').read_text() == _expected('sources_network.txt.gz')
+
+
+def test_generators_grouped_by_bus():
+    static = topysp.read_static(source_folder)
+    for groups, fuels in ((static['thermal_at_bus'], topysp.THERMAL_FUELS),
+                          (static['nondispatchable_at_bus'], topysp.NONDISPATCHABLE_FUELS)):
+        assert list(groups) == list(static['bus_dict'])
+        units = [(bus, unit) for bus, group in groups.items() for unit in group]
+        expected = [gen_id for gen_id, gen_spec in static['generator_dict'].items() if gen_spec.Fuel in fuels]
+        assert sorted(unit for _, unit in units) == sorted(expected)
+        for bus, unit in units:
+            assert static['bus_id_to_name_dict'][static['generator_dict'][unit].Bus] == bus
+
+
+def test_bus_demand_splits_the_area_load():
+    static = topysp.read_static(source_folder)
+    load = topysp.read_day(static, DAY)['load']
+    demand = load @ static['load_participation'].T
+    assert demand.shape == (48, len(static['bus_dict']))
+    areas = [bus.Area for bus in static['bus_dict'].values()]
+    for column, area in enumerate(static['load_areas']):
+        in_area = [a == int(area) for a in areas]
+        assert abs(demand[:, in_area].sum(axis=1) - load[:, column]).max() < 1e-9
@@ -1,19 +1,34 @@
+import argparse
+import multiprocessing
 import sys
 import os
 from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
 import math
 
 from collections import namedtuple
 
-copper_sheet = True
-
-if len(sys.argv) > 1:
-    if sys.argv[1] == "output-network":
-        print("Generating template with transmission network")
-        copper_sheet=False
-    else:
-        print("Unknown argument=%s specified - ignored" % sys.argv[1])
+curr_dir = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(curr_dir, '..'))
+from rts_gmlc import cost_curves, periods, resolver, source_data
+import datfile
+import forecasts_actuals
+import initial_state
+
+THERMAL_FUELS = ("Oil", "Coal", "NG", "Nuclear")
+NONDISPATCHABLE_FUELS = ("Solar", "Wind", "Hydro")
+THERMAL_TYPES = {"Nuclear": "N", "NG": "G", "Oil": "O", "Coal": "C"}
+NONDISPATCHABLE_TYPES = {"Wind": "W", "Solar": "S", "Hydro": "H"}
+SOURCE_TYPES = {"Hydro": "hydro", "Solar": "solar", "Wind": "wind"}
+
+# the day exported when no dates are given, and the solved PLEXOS commitment (7/5 to 7/18) the
+# days inside it start from
+DEFAULT_DAY = datetime(2020, 7, 12)
+HORIZON_DAYS = 2
+PLEXOS_SOLUTION_DIR = os.path.join(curr_dir, '..', 'PLEXOS', 'PLEXOS_Solution', 'DAY_AHEAD Solution Files', 'noTX')
+PLEXOS_COMMITMENT = os.path.join(PLEXOS_SOLUTION_DIR, 'PLEXOS_DA_solution_commitment.csv')
+PLEXOS_GENERATION = os.path.join(PLEXOS_SOLUTION_DIR, 'PLEXOS_DA_solution_generation.csv')
 
 Generator = namedtuple('Generator',
                        ['ID', # integer
@@ -41,8 +56,7 @@ Generator = namedtuple('Generator',
                         'HeatRateAvg0',
                         'HeatRateIncr1',
                         'HeatRateIncr2',
-                        'HeatRateIncr3'],
-                       verbose=False)
+                        'HeatRateIncr3'])
 
 Bus = namedtuple('Bus',
                  ['ID', # integer
@@ -54,8 +68,7 @@ Bus = namedtuple('Bus',
                   'SubArea',
                   'Zone',
                   'Lat',
-                  'Long'],
-                 verbose=False)
+                  'Long'])
 
 Branch = namedtuple('Branch',
                     ['ID',
@@ -64,497 +77,534 @@ Branch = namedtuple('Branch',
                      'R',
                      'X', # csv file is in PU, multiple by 100 to make consistent with MW
                      'B',
-                     'ContRating'],
-                    verbose=False)
+                     'ContRating'])
 
 TimeSeriesPointer = namedtuple('TimeSeriesPointer',
                                ['Object',
                                 'Simulation',
                                 'Parameter',
-                                'DataFile'],
-                               verbose=False)
-
-DateTimeValue = namedtuple('DateTimeValue',
-                           ['DateTime', 'Value'],
-                           verbose=False)
-
-Load = namedtuple('Load',
-                  ['DateTime',
-                   'Area1',
-                   'Area2',
-                   'Area3'],
-                  verbose=False)
-
-generator_dict = {} # keys are ID
-bus_dict = {} # keys are ID
-branch_dict = {} # keys are ID
-timeseries_pointer_dict = {} # keys are (ID, simulation-type) pairs
-
-generator_df = pd.read_table("gen.csv", header=0, sep=',')
-bus_df = pd.read_table("bus.csv", header=0, sep=',')
-branch_df = pd.read_table("branch.csv", header=0, sep=',')
-timeseries_pointer_df = pd.read_table("timeseries_pointers.csv", header=0, sep=',')
-
-for generator_index in generator_df.index.tolist():
-    this_generator_dict = generator_df.loc[generator_index].to_dict()
-    new_generator = Generator(this_generator_dict["GEN UID"],
-                              int(this_generator_dict["Bus ID"]),
-                              this_generator_dict["Unit Group"],
-                              this_generator_dict["Unit Type"],
-                              this_generator_dict["Fuel"],
-                              float(this_generator_dict["PMin MW"]),
-                              float(this_generator_dict["PMax MW"]),
-                              # per Brendan, PLEXOS takes the ceiling at hourly resolution for up and down times.
-                              int(math.ceil(this_generator_dict["Min Down Time Hr"])),
-                              int(math.ceil(this_generator_dict["Min Up Time Hr"])),
-                              this_generator_dict["Ramp Rate MW/Min"],
-                              int(this_generator_dict["Start Time Cold Hr"]),
-                              int(this_generator_dict["Start Time Warm Hr"]),
-                              int(this_generator_dict["Start Time Hot Hr"]),
-                              float(this_generator_dict["Start Heat Cold MMBTU"]),
-                              float(this_generator_dict["Start Heat Hot MMBTU"]),
-                              float(this_generator_dict["Non Fuel Start Cost $"]),
-                              float(this_generator_dict["Fuel Price $/MMBTU"]),
-                              float(this_generator_dict["Output_pct_0"]),
-                              float(this_generator_dict["Output_pct_1"]),
-                              float(this_generator_dict["Output_pct_2"]),
-                              float(this_generator_dict["Output_pct_3"]),
-                              float(this_generator_dict["HR_avg_0"]),
-                              float(this_generator_dict["HR_incr_1"]),
-                              float(this_generator_dict["HR_incr_2"]),
-                              float(this_generator_dict["HR_incr_3"]))
-
-    generator_dict[new_generator.ID] = new_generator
-
-bus_id_to_name_dict = {}
-
-for bus_index in bus_df.index.tolist():
-    this_bus_dict = bus_df.loc[bus_index].to_dict()
-    new_bus = Bus(int(this_bus_dict["Bus ID"]),
-                  this_bus_dict["Bus Name"],
-                  this_bus_dict["BaseKV"],
-                  this_bus_dict["Bus Type"],
-                  float(this_bus_dict["MW Load"]),
-                  int(this_bus_dict["Area"]),
-                  int(this_bus_dict["Sub Area"]),
-                  this_bus_dict["Zone"],
-                  this_bus_dict["lat"],
-                  this_bus_dict["lng"])
-    bus_dict[new_bus.Name] = new_bus
-    bus_id_to_name_dict[new_bus.ID] = new_bus.Name
-
-# compute aggregate load per area, and then compute
-# load participation factors from each bus from that data.
-region_total_load = {}
-for this_region in range(1,4):
-    this_region_total_load = 0.0
-    for bus_name, bus_spec in bus_dict.items():
-        if bus_spec.Area == this_region:
-            this_region_total_load += bus_spec.MWLoad
-    region_total_load[this_region] = this_region_total_load
-
-bus_load_participation_factor_dict = {}
-
-for bus_name, bus_spec in bus_dict.items():
-    bus_load_participation_factor_dict[bus_name] = bus_spec.MWLoad / region_total_load[bus_spec.Area]
-
-for branch_index in branch_df.index.tolist():
-    this_branch_dict = branch_df.loc[branch_index].to_dict()
-    new_branch = Branch(this_branch_dict["UID"],
-                        this_branch_dict["From Bus"],
-                        this_branch_dict["To Bus"],
-                        float(this_branch_dict["R"]),
-                        float(this_branch_dict["X"]) / 100.0, # nix per unit
-                        float(this_branch_dict["B"]),
-                        float(this_branch_dict["Cont Rating"]))
-    branch_dict[new_branch.ID] = new_branch
-
-for timeseries_pointer_index in timeseries_pointer_df.index.tolist():
-    this_timeseries_pointer_dict = timeseries_pointer_df.loc[timeseries_pointer_index].to_dict()
-    new_timeseries_pointer = TimeSeriesPointer(this_timeseries_pointer_dict["Object"],
-                                               this_timeseries_pointer_dict["Simulation"],
-                                               this_timeseries_pointer_dict["Parameter"],
-                                               this_timeseries_pointer_dict["Data File"])
-
-    timeseries_pointer_dict[(new_timeseries_pointer.Object, new_timeseries_pointer.Simulation)] = new_timeseries_pointer
-
-target_year = 2020
-target_month = 7
-target_day = 12
-
-target_datetime = datetime(target_year, target_month, target_day)
-target_plus_one_datetime = target_datetime + timedelta(days=2)
-
-filtered_timeseries = {} # maps renewables generator ID to list of DateTimeValue tuples
-
-for gen_name, gen_spec in generator_dict.items():
-    if gen_spec.Fuel == "Solar" or gen_spec.Fuel == "Wind" or gen_spec.Fuel == "Hydro":
-        if (gen_spec.ID, "DAY_AHEAD") not in timeseries_pointer_dict:
-            print("***WARNING - No timeseries pointer entry found for generator=%s" % gen_spec.ID)
-        else:
-            print("Time series for generator=%s will be loaded from file=%s" % (gen_spec.ID, timeseries_pointer_dict[(gen_spec.ID,"DAY_AHEAD")].DataFile))
-            renewables_timeseries_df = pd.read_table(timeseries_pointer_dict[(gen_spec.ID,"DAY_AHEAD")].DataFile,
-                                                     header=0,
-                                                     sep=',',
-                                                     parse_dates=[[0, 1, 2, 3]],
-                                                     date_parser=lambda *columns: datetime(*map(int,columns[0:3]), int(columns[3])-1))
-            this_source_timeseries_df = renewables_timeseries_df.loc[:,["Year_Month_Day_Period", gen_spec.ID]]
-            this_source_timeseries_df = this_source_timeseries_df.rename(columns = {"Year_Month_Day_Period" : "DateTime"})
-
-            start_mask = this_source_timeseries_df["DateTime"] >= target_datetime
-            end_mask = this_source_timeseries_df["DateTime"] < target_plus_one_datetime
-            this_source_masked_timeseries_df = this_source_timeseries_df[start_mask & end_mask]
-
-            renewables_timeseries_dict = this_source_masked_timeseries_df.to_dict(orient='split')
-            renewables_timeseries = []
-            for this_row in renewables_timeseries_dict["data"]:
-                renewables_timeseries.append(DateTimeValue(this_row[0],
-                                                           float(this_row[1])))
-            filtered_timeseries[gen_spec.ID] = renewables_timeseries
-
-load_timeseries_spec = timeseries_pointer_dict[("Load","DAY_AHEAD")]
-load_timeseries_df = pd.read_table(load_timeseries_spec.DataFile,
-                                   header=0,
-                                   sep=',',
-                                   parse_dates=[[0, 1, 2, 3]],
-                                   date_parser=lambda *columns: datetime(*map(int,columns[0:3]), int(columns[3])-1))
-load_timeseries_df = load_timeseries_df.rename(columns = {"Year_Month_Day_Period" : "DateTime"})
-start_mask = load_timeseries_df["DateTime"] >= target_datetime
-end_mask = load_timeseries_df["DateTime"] < target_plus_one_datetime
-masked_load_timeseries_df = load_timeseries_df[start_mask & end_mask]
-load_dict = masked_load_timeseries_df.to_dict(orient='split')
-load_timeseries = []
-for load_row in load_dict["data"]:
-    load_timeseries.append(Load(load_row[0],
-                                float(load_row[1]),
-                                float(load_row[2]),
-                                float(load_row[3])))
-
-unit_on_time_df = pd.read_table("../FormattedData/PLEXOS/PLEXOS_Solution/DAY_AHEAD Solution Files/noTX/on_time_7.12.csv",
-                                header=0,
-                                sep=",")
-unit_on_time_df_as_dict = unit_on_time_df.to_dict(orient="split")
-unit_on_t0_state_dict = {}
-for i in range(0,len(unit_on_time_df_as_dict["columns"])):
-    gen_id = unit_on_time_df_as_dict["columns"][i]
-    unit_on_t0_state_dict[gen_id] = int(unit_on_time_df_as_dict["data"][0][i])
-
-print("Writing Prescient template file")
-
-minutes_per_time_period = 60
-
-dat_file = open("rts_gmlc.dat","w")
-
-print("param NumTimePeriods := 48 ;", file=dat_file)
-print("", file=dat_file)
-print("param TimePeriodLength := 1 ;", file=dat_file)
-print("", file=dat_file)
-print("set StageSet := Stage_1 Stage_2 ;", file=dat_file)
-print("", file=dat_file)
-print("set CommitmentTimeInStage[Stage_1] := 1 2 3 4 5 6 7 8 9 10 11 12 13 14 15 16 17 18 19 20 21 22 23 24 25 26 27 28 29 30 31 32 33 34 35 36 37 38 39 40 41 42 43 44 45 46 47 48 ;", file=dat_file)
-print("", file=dat_file)
-print("set CommitmentTimeInStage[Stage_2] := ;", file=dat_file)
-print("", file=dat_file)
-print("set GenerationTimeInStage[Stage_1] := ;", file=dat_file)
-print("", file=dat_file)
-print("set GenerationTimeInStage[Stage_2] := 1 2 3 4 5 6 7 8 9 10 11 12 13 14 15 16 17 18 19 20 21 22 23 24 25 26 27 28 29 30 31 32 33 34 35 36 37 38 39 40 41 42 43 44 45 46 47 48 ;", file=dat_file)
-print("", file=dat_file)
-
-print("set Buses := ", file=dat_file)
-if copper_sheet:
-    print("CopperSheet", file=dat_file)
-else:
-    for bus_id in bus_dict.keys():
-        print("%s" % bus_id, file=dat_file)
-print(";", file=dat_file)
-
-print("", file=dat_file)
-
-print("set TransmissionLines := ", file=dat_file)
-if copper_sheet:
-    pass
-else:
-    for branch_id in branch_dict.keys():
-        print("%s" % branch_id, file=dat_file)
-print(";", file=dat_file)
-
-print("", file=dat_file)
-
-print("param: BusFrom BusTo ThermalLimit Impedence :=", file=dat_file)
-if copper_sheet:
-    pass
-else:
-    for branch_id, branch_spec in branch_dict.items():
-        print("%15s %15s %15s   %10.8f      %10.8f" % (branch_spec.ID, bus_id_to_name_dict[branch_spec.FromBus], bus_id_to_name_dict[branch_spec.ToBus], branch_spec.ContRating, branch_spec.X), file=dat_file)
-
-print(";", file=dat_file)
-
-print("", file=dat_file)
-
-print("set ThermalGenerators := ", file=dat_file)
-for gen_id, gen_spec in generator_dict.items():
-    if gen_spec.Fuel == "Oil" or gen_spec.Fuel == "Coal" or gen_spec.Fuel == "NG" or gen_spec.Fuel == "Nuclear":
-        print("%s" % gen_id, file=dat_file)
-print(";", file=dat_file)
-
-print("", file=dat_file)
-
-if copper_sheet:
-    print("set ThermalGeneratorsAtBus[CopperSheet] := ", file=dat_file)
-    for gen_id, gen_spec in generator_dict.items():
-        if gen_spec.Fuel == "Oil" or gen_spec.Fuel == "Coal" or gen_spec.Fuel == "NG" or gen_spec.Fuel == "Nuclear":
-            print("%s" % gen_id, file=dat_file)
-    print(";", file=dat_file)
-    print("", file=dat_file)
-else:
-    for bus_name in bus_dict.keys():
-        print("set ThermalGeneratorsAtBus[%s] := " % bus_name, file=dat_file)
-        for gen_id, gen_spec in generator_dict.items():
-            if bus_dict[bus_name].ID == gen_spec.Bus:
-                if gen_spec.Fuel == "Oil" or gen_spec.Fuel == "Coal" or gen_spec.Fuel == "NG" or gen_spec.Fuel == "Nuclear":
-                    print("%s" % gen_id, file=dat_file)
-        print(";", file=dat_file)
-        print("", file=dat_file)
-
-print("set NondispatchableGenerators := ", file=dat_file)
-for gen_id, gen_spec in generator_dict.items():
-    if gen_spec.Fuel == "Solar" or gen_spec.Fuel == "Wind" or gen_spec.Fuel == "Hydro":
-        print("%s" % gen_id, file=dat_file)
-print(";", file=dat_file)
-
-print("", file=dat_file)
-
-if copper_sheet:
-    print("set NondispatchableGeneratorsAtBus[CopperSheet] := ", file=dat_file)
-    for gen_id, gen_spec in generator_dict.items():
+                                'DataFile'])
+
+# parsed static data of a pool worker, shared by all the days it writes
+_static = {}
+
+
+def read_static(folder=None, simulation="DAY_AHEAD"):
+    # Parses gen, bus, branch and the time series pointers once. Every day of an export reuses the
+    # result, only the time series windows and the initial states are read per day.
+    generator_dict = {} # keys are ID
+    bus_dict = {} # keys are ID
+    branch_dict = {} # keys are ID
+    timeseries_pointer_dict = {} # keys are (ID, simulation-type) pairs
+
+    generator_df = source_data.gen(folder)
+    bus_df = source_data.bus(folder)
+    branch_df = source_data.branch(folder)
+    timeseries_pointer_df = source_data.timeseries_pointers(folder)
+
+    for this_generator_dict in generator_df.to_dict("records"):
+        new_generator = Generator(this_generator_dict["GEN UID"],
+                                  int(this_generator_dict["Bus ID"]),
+                                  this_generator_dict["Unit Group"],
+                                  this_generator_dict["Unit Type"],
+                                  this_generator_dict["Fuel"],
+                                  float(this_generator_dict["PMin MW"]),
+                                  float(this_generator_dict["PMax MW"]),
+                                  # per Brendan, PLEXOS takes the ceiling at hourly resolution for up and down times.
+                                  int(math.ceil(this_generator_dict["Min Down Time Hr"])),
+                                  int(math.ceil(this_generator_dict["Min Up Time Hr"])),
+                                  this_generator_dict["Ramp Rate MW/Min"],
+                                  int(this_generator_dict["Start Time Cold Hr"]),
+                                  int(this_generator_dict["Start Time Warm Hr"]),
+                                  int(this_generator_dict["Start Time Hot Hr"]),
+                                  float(this_generator_dict["Start Heat Cold MBTU"]),
+                                  float(this_generator_dict["Start Heat Warm MBTU"]),
+                                  float(this_generator_dict["Start Heat Hot MBTU"]),
+                                  float(this_generator_dict["Non Fuel Start Cost $"]),
+                                  float(this_generator_dict["Fuel Price $/MMBTU"]),
+                                  float(this_generator_dict["Output_pct_0"]),
+                                  float(this_generator_dict["Output_pct_1"]),
+                                  float(this_generator_dict["Output_pct_2"]),
+                                  float(this_generator_dict["Output_pct_3"]),
+                                  float(this_generator_dict["HR_avg_0"]),
+                                  float(this_generator_dict["HR_incr_1"]),
+                                  float(this_generator_dict["HR_incr_2"]),
+                                  float(this_generator_dict["HR_incr_3"]))
+
+        generator_dict[new_generator.ID] = new_generator
+
+    # Per Brendan, round the power points to the nearest 100kW
+    # IMPT: These quantities are MW, the values are $/h
+    output_pct, heat_rate_avg_0, heat_rate_incr = cost_curves.heat_rates(generator_df)
+    cost_points = np.round(output_pct * generator_df["PMax MW"].to_numpy(dtype=float)[:, None], 1)
+    cost_values = cost_curves.fuel_cost(cost_curves.io_curves(cost_points, heat_rate_avg_0, heat_rate_incr)[1],
+                                        generator_df["Fuel Price $/MMBTU"])
+    cost_piecewise_points = dict(zip(generator_df["GEN UID"], cost_points.tolist()))
+    cost_piecewise_values = dict(zip(generator_df["GEN UID"], cost_values.tolist()))
+
+    bus_id_to_name_dict = {}
+
+    for this_bus_dict in bus_df.to_dict("records"):
+        new_bus = Bus(int(this_bus_dict["Bus ID"]),
+                      this_bus_dict["Bus Name"],
+                      this_bus_dict["BaseKV"],
+                      this_bus_dict["Bus Type"],
+                      float(this_bus_dict["MW Load"]),
+                      int(this_bus_dict["Area"]),
+                      int(this_bus_dict["Sub Area"]),
+                      this_bus_dict["Zone"],
+                      this_bus_dict["lat"],
+                      this_bus_dict["lng"])
+        bus_dict[new_bus.Name] = new_bus
+        bus_id_to_name_dict[new_bus.ID] = new_bus.Name
+
+    # compute aggregate load per area, and then compute load participation factors from each bus
+    # from that data: (n_bus, n_area) with the bus share of its area's load in the column of the area
+    areas, bus_area = np.unique(bus_df["Area"].to_numpy(), return_inverse=True)
+    bus_load = bus_df["MW Load"].to_numpy(dtype=float)
+    region_total_load = np.bincount(bus_area, weights=bus_load, minlength=len(areas))
+    load_participation = np.zeros((len(bus_df), len(areas)))
+    load_participation[np.arange(len(bus_df)), bus_area] = bus_load / region_total_load[bus_area]
+
+    # bus -> generators of each class, in gen.csv order
+    fuel = generator_df["Fuel"]
+    thermal_at_bus = _group_by_bus(generator_df.loc[fuel.isin(THERMAL_FUELS).to_numpy()], bus_df)
+    nondispatchable_at_bus = _group_by_bus(generator_df.loc[fuel.isin(NONDISPATCHABLE_FUELS).to_numpy()], bus_df)
+
+    for this_branch_dict in branch_df.to_dict("records"):
+        new_branch = Branch(this_branch_dict["UID"],
+                            this_branch_dict["From Bus"],
+                            this_branch_dict["To Bus"],
+                            float(this_branch_dict["R"]),
+                            float(this_branch_dict["X"]) / 100.0, # nix per unit
+                            float(this_branch_dict["B"]),
+                            float(this_branch_dict["Cont Rating"]))
+        branch_dict[new_branch.ID] = new_branch
+
+    for this_timeseries_pointer_dict in timeseries_pointer_df.to_dict("records"):
+        new_timeseries_pointer = TimeSeriesPointer(this_timeseries_pointer_dict["Object"],
+                                                   this_timeseries_pointer_dict["Simulation"],
+                                                   this_timeseries_pointer_dict["Parameter"],
+                                                   this_timeseries_pointer_dict["Data File"])
+
+        timeseries_pointer_dict[(new_timeseries_pointer.Object, new_timeseries_pointer.Simulation)] = new_timeseries_pointer
+
+    renewables_ids = []
+    for gen_name, gen_spec in generator_dict.items():
         if gen_spec.Fuel == "Solar" or gen_spec.Fuel == "Wind" or gen_spec.Fuel == "Hydro":
-            print("%s" % gen_id, file=dat_file)
-    print(";", file=dat_file)
-    print("", file=dat_file)
-else:
-    for bus_name in bus_dict.keys():
-        print("set NondispatchableGeneratorsAtBus[%s] := " % bus_name, file=dat_file)
-        for gen_id, gen_spec in generator_dict.items():
-            if bus_dict[bus_name].ID == gen_spec.Bus:
-                if gen_spec.Fuel == "Solar" or gen_spec.Fuel == "Wind" or gen_spec.Fuel == "Hydro":
-                    print("%s" % gen_id, file=dat_file)
-        print(";", file=dat_file)
-        print("", file=dat_file)
-
-print("param MustRun := ", file=dat_file)
-for gen_id, gen_spec in generator_dict.items():
-    if gen_spec.Fuel == "Nuclear":
-        print("%s 1" % gen_id, file=dat_file)
-print(";", file=dat_file)
-
-print("", file=dat_file)
-
-print("param ThermalGeneratorType := ", file=dat_file)
-for gen_id, gen_spec in generator_dict.items():
-    if gen_spec.Fuel == "Nuclear":
-        print("%s N" % gen_id, file=dat_file)
-    elif gen_spec.Fuel == "NG":
-        print("%s G" % gen_id, file=dat_file)
-    elif gen_spec.Fuel == "Oil":
-        print("%s O" % gen_id, file=dat_file)
-    elif gen_spec.Fuel == "Coal":
-        print("%s C" % gen_id, file=dat_file)
-    else:
-        pass
-print(";", file=dat_file)
-
-print("", file=dat_file)
-
-print("param NondispatchableGeneratorType := ", file=dat_file)
-for gen_id, gen_spec in generator_dict.items():
-    if gen_spec.Fuel == "Wind":
-        print("%s W" % gen_id, file=dat_file)
-    elif gen_spec.Fuel == "Solar":
-        print("%s S" % gen_id, file=dat_file)
-    elif gen_spec.Fuel == "Hydro":
-        print("%s H" % gen_id, file=dat_file)
+            if (gen_spec.ID, simulation) not in timeseries_pointer_dict:
+                print("***WARNING - No timeseries pointer entry found for generator=%s" % gen_spec.ID)
+            else:
+                print("Time series for generator=%s will be loaded from file=%s" % (gen_spec.ID, timeseries_pointer_dict[(gen_spec.ID,simulation)].DataFile))
+                renewables_ids.append(gen_spec.ID)
+
+    return {
+        "folder": folder,
+        "simulation": simulation,
+        "generator_dict": generator_dict,
+        "bus_dict": bus_dict,
+        "branch_dict": branch_dict,
+        "bus_id_to_name_dict": bus_id_to_name_dict,
+        "load_areas": [str(area) for area in areas],
+        "load_participation": load_participation,
+        "thermal_at_bus": thermal_at_bus,
+        "nondispatchable_at_bus": nondispatchable_at_bus,
+        "cost_piecewise_points": cost_piecewise_points,
+        "cost_piecewise_values": cost_piecewise_values,
+        "renewables_ids": renewables_ids,
+    }
+
+
+def _group_by_bus(generators, bus_df):
+    # {bus name: [GEN UID, ...]} for every bus, empty lists for buses without such units
+    names = dict(zip(bus_df["Bus ID"], bus_df["Bus Name"]))
+    groups = {name: [] for name in bus_df["Bus Name"]}
+    for bus_id, uids in generators.groupby("Bus ID", sort=False)["GEN UID"]:
+        groups[names[bus_id]] = uids.tolist()
+    return groups
+
+
+def initial_states(static, first, last, commitment=PLEXOS_COMMITMENT, generation=PLEXOS_GENERATION):
+    # The unit states of initial_state for the starts of the days first to last: a merit order
+    # pre-dispatch of the DAY_AHEAD load net of the renewables for every unit and day, then the
+    # solved commitment (and dispatch) of a PLEXOS or earlier Prescient run for the units and
+    # days it covers. read_day takes them in this order, the later ones win.
+    folder = static["folder"]
+    thermal = [gen_spec for gen_spec in static["generator_dict"].values() if gen_spec.Fuel in THERMAL_FUELS]
+    ids = [gen_spec.ID for gen_spec in thermal]
+    min_power = pd.Series([gen_spec.MinPower for gen_spec in thermal], index=ids)
+    max_power = pd.Series([gen_spec.MaxPower for gen_spec in thermal], index=ids)
+    # full load cost per MWh orders the units
+    cost = [static["cost_piecewise_values"][gen_id][-1] / static["cost_piecewise_points"][gen_id][-1] for gen_id in ids]
+
+    start, end = first - timedelta(days=1), last + timedelta(days=1)
+    load = resolver.series("DAY_AHEAD", "MW Load", category="Area", start=start, end=end, folder=folder).sum(axis=1)
+    renewables = resolver.series("DAY_AHEAD", "PMax MW", objects=static["renewables_ids"],
+                                 start=start, end=end, folder=folder).reindex(load.index).sum(axis=1)
+    states = [initial_state.merit_order(load.index, ids, (load - renewables).to_numpy(), max_power, min_power, cost,
+                                        must_run=[gen_spec.Fuel == "Nuclear" for gen_spec in thermal])]
+    if commitment is not None:
+        dispatch = None if generation is None else initial_state.read_solution(generation, "Dispatch")
+        states.append(initial_state.from_solution(initial_state.read_solution(commitment), dispatch,
+                                                  min_power, max_power))
+    return states
+
+
+def read_day(static, day):
+    # the renewable and load series of the day and the following one, and the unit states at its start
+    folder, simulation = static["folder"], static["simulation"]
+    target_datetime = day
+    target_plus_one_datetime = target_datetime + timedelta(days=HORIZON_DAYS)
+
+    # every renewable data file is opened once and only the rows of the target window are read
+    renewables_ids = static["renewables_ids"]
+    # REAL_TIME series without a 5-minute file of their own are served from the hourly one
+    renewables_df = resolver.series(simulation, "PMax MW", objects=renewables_ids,
+                                    start=target_datetime, end=target_plus_one_datetime, folder=folder)
+
+    # regional load pointers are keyed by area number and all point at the same file
+    load_timeseries_df = resolver.series(simulation, "MW Load", category="Area",
+                                         start=target_datetime, end=target_plus_one_datetime, folder=folder)
+    # (n_periods, n_area) in the area order of the participation matrix
+    load = load_timeseries_df[static["load_areas"]].to_numpy(dtype=float)
+
+    # the unit states at the end of the hour before the day, see initial_states
+    unit_on_t0_state_dict, power_generated_t0_dict = {}, {}
+    for states in static.get("initial_states", []):
+        found = initial_state.at(states, day)
+        if found is not None:
+            unit_on_t0_state_dict.update(found[0])
+            power_generated_t0_dict.update(found[1])
+    if not unit_on_t0_state_dict:
+        print("***WARNING - No unit initial states found for %s" % day.strftime("%Y-%m-%d"))
+
+    return {
+        "renewables": renewables_df,
+        "load": load,
+        "unit_on_t0_state_dict": unit_on_t0_state_dict,
+        "power_generated_t0_dict": power_generated_t0_dict,
+    }
+
+
+def write_dat(static, day_data, path, copper_sheet=True, compress=False):
+    # Every parameter table is formatted from arrays in one go and written in large chunks, see
+    # datfile. compress writes path + '.gz' instead.
+    generator_dict = static["generator_dict"]
+    bus_dict = static["bus_dict"]
+    branch_dict = static["branch_dict"]
+    bus_id_to_name_dict = static["bus_id_to_name_dict"]
+    thermal_at_bus = static["thermal_at_bus"]
+    nondispatchable_at_bus = static["nondispatchable_at_bus"]
+    cost_piecewise_points = static["cost_piecewise_points"]
+    cost_piecewise_values = static["cost_piecewise_values"]
+    renewables = day_data["renewables"]
+    load = day_data["load"]
+    unit_on_t0_state_dict = day_data["unit_on_t0_state_dict"]
+    power_generated_t0_dict = day_data["power_generated_t0_dict"]
+
+    seconds_per_time_period = periods.simulation_resolution(static["simulation"], static["folder"])
+    minutes_per_time_period = seconds_per_time_period // 60
+    num_time_periods = len(load)
+    time_periods = " ".join(str(i) for i in range(1, num_time_periods+1))
+    bus_names = list(bus_dict.keys())
+    thermal = [gen_spec for gen_spec in generator_dict.values() if gen_spec.Fuel in THERMAL_FUELS]
+    thermal_ids = [gen_spec.ID for gen_spec in thermal]
+    nondispatchable = [gen_spec for gen_spec in generator_dict.values() if gen_spec.Fuel in NONDISPATCHABLE_FUELS]
+    nondispatchable_ids = [gen_spec.ID for gen_spec in nondispatchable]
+
+    dat_file = datfile.open_text(path, compress)
+
+    def l(text=""):
+        dat_file.write(text + "\n")
+
+    def members(header, ids):
+        l(header)
+        datfile.write_lines(dat_file, ids)
+        l(";")
+
+    l("param NumTimePeriods := %d ;" % num_time_periods)
+    l()
+    l("param TimePeriodLength := %g ;" % (seconds_per_time_period / 3600.0))
+    l()
+    l("set StageSet := Stage_1 Stage_2 ;")
+    l()
+    l("set CommitmentTimeInStage[Stage_1] := %s ;" % time_periods)
+    l()
+    l("set CommitmentTimeInStage[Stage_2] := ;")
+    l()
+    l("set GenerationTimeInStage[Stage_1] := ;")
+    l()
+    l("set GenerationTimeInStage[Stage_2] := %s ;" % time_periods)
+    l()
+
+    members("set Buses := ", ["CopperSheet"] if copper_sheet else bus_names)
+    l()
+    members("set TransmissionLines := ", [] if copper_sheet else list(branch_dict.keys()))
+    l()
+
+    l("param: BusFrom BusTo ThermalLimit Impedence :=")
+    if not copper_sheet:
+        branches = list(branch_dict.values())
+        datfile.write_rows(dat_file, "%15s %15s %15s   %10.8f      %10.8f",
+                           [branch_spec.ID for branch_spec in branches],
+                           [bus_id_to_name_dict[branch_spec.FromBus] for branch_spec in branches],
+                           [bus_id_to_name_dict[branch_spec.ToBus] for branch_spec in branches],
+                           [branch_spec.ContRating for branch_spec in branches],
+                           [branch_spec.X for branch_spec in branches])
+    l(";")
+    l()
+
+    members("set ThermalGenerators := ", thermal_ids)
+    l()
+    if copper_sheet:
+        members("set ThermalGeneratorsAtBus[CopperSheet] := ", thermal_ids)
+        l()
     else:
-        pass
-print(";", file=dat_file)
-
-print("", file=dat_file)
-
-print("param: MinimumPowerOutput MaximumPowerOutput MinimumUpTime MinimumDownTime NominalRampUpLimit NominalRampDownLimit StartupRampLimit ShutdownRampLimit := ", file=dat_file)
-for gen_id, gen_spec in generator_dict.items():
-    if gen_spec.Fuel == "Oil" or gen_spec.Fuel == "Coal" or gen_spec.Fuel == "NG" or gen_spec.Fuel == "Nuclear":
-        print("%15s %10.2f %10.2f %2d %2d %10.2f %10.2f %10.2f %10.2f" % (gen_id,
-                                                                          gen_spec.MinPower,
-                                                                          gen_spec.MaxPower,
-                                                                          gen_spec.MinUpTime,
-                                                                          gen_spec.MinDownTime,
-                                                                          gen_spec.RampRate * float(minutes_per_time_period),
-                                                                          gen_spec.RampRate * float(minutes_per_time_period),
-                                                                          gen_spec.MinPower,
-                                                                          gen_spec.MinPower),
-              file=dat_file)
-print(";", file=dat_file)
-
-print("", file=dat_file)
-
-for gen_id, gen_spec in generator_dict.items():
-    if gen_spec.Fuel == "Oil" or gen_spec.Fuel == "Coal" or gen_spec.Fuel == "NG" or gen_spec.Fuel == "Nuclear":
-        # per Brenan: the following replicates that in PLEXOS runs of RTS-GMLC
-        print("set StartupLags[%s] := %d ;" % (gen_id, gen_spec.MinDownTime), file=dat_file)
-        print("set StartupCosts[%s] := %12.2f ;" % (gen_id, gen_spec.StartCostCold * gen_spec.FuelPrice + gen_spec.NonFuelStartCost), file=dat_file)
-print("", file=dat_file)
-
-print("param ShutdownFixedCost := ", file=dat_file)
-for gen_id, gen_spec in generator_dict.items():
-    if gen_spec.Fuel == "Oil" or gen_spec.Fuel == "Coal" or gen_spec.Fuel == "NG" or gen_spec.Fuel == "Nuclear":
-        # per Brenan: the following replicates that in PLEXOS runs of RTS-GMLC
-        print("%s %12.2f" % (gen_id, gen_spec.StartCostCold * gen_spec.FuelPrice), file=dat_file)
-print(";", file=dat_file)
-
-print("", file=dat_file)
-
-for gen_id, gen_spec in generator_dict.items():
-    if gen_spec.Fuel == "Oil" or gen_spec.Fuel == "Coal" or gen_spec.Fuel == "NG" or gen_spec.Fuel == "Nuclear":
-        # Per Brendan, round the power points to the nearest 100kW
-        # IMPT: These quantities are MW
-        x0 = round(gen_spec.OutputPct0 * gen_spec.MaxPower,1)
-        x1 = round(gen_spec.OutputPct1 * gen_spec.MaxPower,1)
-        x2 = round(gen_spec.OutputPct2 * gen_spec.MaxPower,1)
-        x3 = round(gen_spec.OutputPct3 * gen_spec.MaxPower,1)
-        print("set CostPiecewisePoints[%s] := %12.1f %12.1f %12.1f %12.1f ;" % (gen_id, x0, x1, x2, x3),
-              file=dat_file)
-        # NOTES:
-        # 1) Fuel price is in $/MMBTU
-        # 2) Heat Rate quantities are in BTU/KWH
-        # 3) 1+2 => need to convert both from BTU->MMBTU and from KWH->MWH
-        y0 = gen_spec.FuelPrice * ((gen_spec.HeatRateAvg0 * 1000.0 / 1000000.0) * x0)
-        y1 = gen_spec.FuelPrice * (((x1-x0) * (gen_spec.HeatRateIncr1 * 1000.0 / 1000000.0))) + y0
-        y2 = gen_spec.FuelPrice * (((x2-x1) * (gen_spec.HeatRateIncr2 * 1000.0 / 1000000.0))) + y1
-        y3 = gen_spec.FuelPrice * (((x3-x2) * (gen_spec.HeatRateIncr3 * 1000.0 / 1000000.0))) + y2
-        print("set CostPiecewiseValues[%s] := %12.2f %12.2f %12.2f %12.2f ;" % (gen_id, y0, y1, y2, y3),
-              file=dat_file)
-
-print("", file=dat_file)
-
-print("param: UnitOnT0State PowerGeneratedT0 :=", file=dat_file)
-for gen_id, gen_spec in generator_dict.items():
-    if gen_spec.Fuel == "Sync_Cond" or gen_spec.Fuel == "Hydro" or gen_spec.Fuel == "Wind" or gen_spec.Fuel == "Solar":
-        continue
-    if gen_id not in unit_on_t0_state_dict:
-        print("***WARNING - No T0 initial condition found for generator=%s" % gen_id)
-        continue
-    if unit_on_t0_state_dict[gen_id] < 0:
-        power_generated_t0 = 0.0
+        for bus_name, gen_ids in thermal_at_bus.items():
+            members("set ThermalGeneratorsAtBus[%s] := " % bus_name, gen_ids)
+            l()
+
+    members("set NondispatchableGenerators := ", nondispatchable_ids)
+    l()
+    if copper_sheet:
+        members("set NondispatchableGeneratorsAtBus[CopperSheet] := ", nondispatchable_ids)
+        l()
     else:
-        power_generated_t0 = gen_spec.MinPower
-    print("%15s %3d %12.2f" % (gen_id, unit_on_t0_state_dict[gen_id], power_generated_t0),
-          file=dat_file)
-print(";", file=dat_file)
-
-print("", file=dat_file)
-
-print("param Demand := ", file=dat_file)
-if copper_sheet:
-    for i in range(1,len(load_timeseries)+1):
-        this_load_spec = load_timeseries[i-1]
-        print("%15s %2d %12.2f" % ("CopperSheet",
-                                   i,
-                                   this_load_spec.Area1 + this_load_spec.Area2 + this_load_spec.Area3),
-              file=dat_file)
-else:
-    for i in range(1,len(load_timeseries)+1):
-        this_load_spec = load_timeseries[i-1]
-        for bus_name, bus_spec in bus_dict.items():
-            this_bus_load = 0.0
-            if bus_spec.Area == 1:
-                this_bus_load = this_load_spec.Area1
-            elif bus_spec.Area == 2:
-                this_bus_load = this_load_spec.Area2
-            else:
-                this_bus_load = this_load_spec.Area3
-            this_bus_load *= bus_load_participation_factor_dict[bus_name]
-
-            print("%15s %2d %12.2f" % (bus_name,
-                                       i,
-                                       this_bus_load),
-              file=dat_file)
-print(";", file=dat_file)
-
-print("", file=dat_file)
-
-print("param: MinNondispatchablePower MaxNondispatchablePower := ", file=dat_file)
-for gen_name, gen_spec in generator_dict.items():
-    if gen_spec.Fuel == "Solar" or gen_spec.Fuel == "Wind" or gen_spec.Fuel == "Hydro":
-        if gen_name not in filtered_timeseries:
-            print("***WARNING - No time series found for renewable generator=%s" % gen_name)
+        for bus_name, gen_ids in nondispatchable_at_bus.items():
+            members("set NondispatchableGeneratorsAtBus[%s] := " % bus_name, gen_ids)
+            l()
+
+    members("param MustRun := ", ["%s 1" % gen_spec.ID for gen_spec in thermal if gen_spec.Fuel == "Nuclear"])
+    l()
+    members("param ThermalGeneratorType := ", ["%s %s" % (gen_spec.ID, THERMAL_TYPES[gen_spec.Fuel]) for gen_spec in thermal])
+    l()
+    members("param NondispatchableGeneratorType := ",
+            ["%s %s" % (gen_spec.ID, NONDISPATCHABLE_TYPES[gen_spec.Fuel]) for gen_spec in nondispatchable])
+    l()
+
+    min_power = np.array([gen_spec.MinPower for gen_spec in thermal])
+    ramp = np.array([gen_spec.RampRate for gen_spec in thermal], dtype=float) * float(minutes_per_time_period)
+    l("param: MinimumPowerOutput MaximumPowerOutput MinimumUpTime MinimumDownTime NominalRampUpLimit NominalRampDownLimit StartupRampLimit ShutdownRampLimit := ")
+    datfile.write_rows(dat_file, "%15s %10.2f %10.2f %2d %2d %10.2f %10.2f %10.2f %10.2f",
+                       thermal_ids, min_power, [gen_spec.MaxPower for gen_spec in thermal],
+                       [gen_spec.MinUpTime for gen_spec in thermal], [gen_spec.MinDownTime for gen_spec in thermal],
+                       ramp, ramp, min_power, min_power)
+    l(";")
+    l()
+
+    # per Brenan: the following replicates that in PLEXOS runs of RTS-GMLC
+    start_fuel_cost = np.array([gen_spec.StartCostCold * gen_spec.FuelPrice for gen_spec in thermal])
+    datfile.write_interleaved(dat_file,
+                              ("set StartupLags[%s] := %d ;", (thermal_ids, [gen_spec.MinDownTime for gen_spec in thermal])),
+                              ("set StartupCosts[%s] := %12.2f ;",
+                               (thermal_ids, [gen_spec.StartCostCold * gen_spec.FuelPrice + gen_spec.NonFuelStartCost
+                                              for gen_spec in thermal])))
+    l()
+
+    l("param ShutdownFixedCost := ")
+    datfile.write_rows(dat_file, "%s %12.2f", thermal_ids, start_fuel_cost)
+    l(";")
+    l()
+
+    points = np.array([cost_piecewise_points[gen_id] for gen_id in thermal_ids]).reshape(-1, 4)
+    values = np.array([cost_piecewise_values[gen_id] for gen_id in thermal_ids]).reshape(-1, 4)
+    datfile.write_interleaved(dat_file,
+                              ("set CostPiecewisePoints[%s] := %12.1f %12.1f %12.1f %12.1f ;", (thermal_ids,) + tuple(points.T)),
+                              ("set CostPiecewiseValues[%s] := %12.2f %12.2f %12.2f %12.2f ;", (thermal_ids,) + tuple(values.T)))
+    l()
+
+    l("param: UnitOnT0State PowerGeneratedT0 :=")
+    t0_ids, t0_states, t0_power = [], [], []
+    for gen_id, gen_spec in generator_dict.items():
+        if gen_spec.Fuel == "Sync_Cond" or gen_spec.Fuel == "Hydro" or gen_spec.Fuel == "Wind" or gen_spec.Fuel == "Solar":
             continue
-        this_timeseries = filtered_timeseries[gen_name]
-        for i in range(1, len(this_timeseries)+1):
-            data_point = this_timeseries[i-1]
-            # both hydro and rooftop PV are must-take
-            if gen_spec.UnitType == "HYDRO" or gen_spec.UnitType == "RTPV":
-                min_value = data_point.Value
-            else:
-                min_value = 0.0
-            print("%15s %2d %12.2f %12.2f" % (gen_name, i, min_value, data_point.Value),
-                  file=dat_file)
-
-print(";", file=dat_file)
-
-print("", file=dat_file)
-
-dat_file.close()
-
-print("Prescient template written to rts_gmlc.dat")
-
-print("")
-
-print("Writing Prescient sources file")
-
-sources_file = open("sources.txt","w")
-for gen_id, gen_spec in generator_dict.items():
-    if gen_spec.Fuel != "Hydro" and gen_spec.Fuel != "Wind" and gen_spec.Fuel != "Solar":
-        continue
-    if gen_spec.UnitType == "CSP":
-        continue
-    source_string = None
-    if gen_spec.Fuel == "Hydro":
-        source_string = "hydro"
-    elif gen_spec.Fuel == "Solar":
-        source_string = "solar"
+        if gen_id not in unit_on_t0_state_dict:
+            print("***WARNING - No T0 initial condition found for generator=%s" % gen_id)
+            continue
+        t0_ids.append(gen_id)
+        t0_states.append(unit_on_t0_state_dict[gen_id])
+        t0_power.append(power_generated_t0_dict[gen_id])
+    datfile.write_rows(dat_file, "%15s %3d %12.2f", t0_ids, t0_states, t0_power)
+    l(";")
+    l()
+
+    l("param Demand := ")
+    periods_column = np.arange(1, num_time_periods + 1)
+    if copper_sheet:
+        datfile.write_rows(dat_file, "%15s %2d %12.2f", np.full(num_time_periods, "CopperSheet"), periods_column,
+                           load.sum(axis=1))
     else:
-        source_string = "wind"
-    forecasts_actuals_filename = "timeseries_data_files" + os.sep + gen_id + "_forecasts_actuals.csv"
-    fraction_nondispatchable = 0.0
-    if gen_spec.UnitType == "HYDRO" or gen_spec.UnitType == "RTPV":
-        fraction_nondispatchable = 1.0
-
-    print("Source(%s," % gen_id, file=sources_file)
-    print("source_type=\"%s\"," % source_string, file=sources_file)
-    print("forecasts_file=\"%s\"," % forecasts_actuals_filename, file=sources_file)
-    print("actuals_file=\"%s\"," % forecasts_actuals_filename, file=sources_file)
-    print("is_deterministic=\"%s\"," % "True", file=sources_file)
-    print("frac_nondispatch=\"%f\"" % fraction_nondispatchable, file=sources_file)
-    print(");", file=sources_file)
-    print("", file=sources_file)
-
-if copper_sheet:
-    print("Source(CopperSheet,", file=sources_file)
-    print("source_type=\"load\",", file=sources_file)
-    print("forecasts_file=\"timeseries_data_files/Load_forecasts_actuals.csv\",", file=sources_file)
-    print("actuals_file=\"timeseries_data_files/Load_forecasts_actuals.csv\"", file=sources_file)
-    print(");", file=sources_file)
-else:
-    for bus_name, bus_spec in bus_dict.items():
-        bus_id = bus_spec.ID
-        bus_load_filename_prefix = "Bus_%d_Load_zone%d" % (bus_id, bus_spec.Area)
-        print("", file=sources_file)
-        print("Source(%s," % bus_name, file=sources_file)
-        print("source_type=\"load\",", file=sources_file)
-        print("forecasts_file=\"timeseries_data_files/%s_forecasts_actuals.csv\"," % bus_load_filename_prefix, file=sources_file)
-        print("actuals_file=\"timeseries_data_files/%s_forecasts_actuals.csv\"" % bus_load_filename_prefix, file=sources_file)
-        print(");", file=sources_file)
-
-sources_file.close()
-
-print("Prescient sources file written to sources.txt")
-
+        # (n_periods, n_bus): every bus takes its share of its area's load
+        demand = load @ static["load_participation"].T
+        datfile.write_rows(dat_file, "%15s %2d %12.2f", np.tile(np.array(bus_names, dtype=object), num_time_periods),
+                           np.repeat(periods_column, len(bus_names)), demand.ravel())
+    l(";")
+    l()
+
+    l("param: MinNondispatchablePower MaxNondispatchablePower := ")
+    for gen_id in nondispatchable_ids:
+        if gen_id not in renewables:
+            print("***WARNING - No time series found for renewable generator=%s" % gen_id)
+    with_series = [gen_spec for gen_spec in nondispatchable if gen_spec.ID in renewables]
+    # (n_gen, n_periods) available power, both hydro and rooftop PV are must-take
+    available = renewables[[gen_spec.ID for gen_spec in with_series]].to_numpy(dtype=float).T
+    must_take = np.array([gen_spec.UnitType in ("HYDRO", "RTPV") for gen_spec in with_series], dtype=bool)
+    minimum = np.where(must_take[:, None], available, 0.0)
+    n_periods = available.shape[1]
+    datfile.write_rows(dat_file, "%15s %2d %12.2f %12.2f",
+                       np.repeat(np.array([gen_spec.ID for gen_spec in with_series], dtype=object), n_periods),
+                       np.tile(np.arange(1, n_periods + 1), len(with_series)), minimum.ravel(), available.ravel())
+    l(";")
+    l()
+
+    dat_file.close()
+
+
+def write_sources(static, path, copper_sheet=True, compress=False):
+    generator_dict = static["generator_dict"]
+    bus_dict = static["bus_dict"]
+
+    sources = [gen_spec for gen_spec in generator_dict.values()
+               if gen_spec.Fuel in ("Hydro", "Wind", "Solar") and gen_spec.UnitType != "CSP"]
+    forecasts_actuals_filenames = ["timeseries_data_files" + os.sep + gen_spec.ID + "_forecasts_actuals.csv"
+                                   for gen_spec in sources]
+    sources_file = datfile.open_text(path, compress)
+    datfile.write_rows(sources_file,
+                       "Source(%s,\nsource_type=\"%s\",\nforecasts_file=\"%s\",\nactuals_file=\"%s\",\n"
+                       "is_deterministic=\"%s\",\nfrac_nondispatch=\"%f\"\n);\n",
+                       [gen_spec.ID for gen_spec in sources],
+                       [SOURCE_TYPES[gen_spec.Fuel] for gen_spec in sources],
+                       forecasts_actuals_filenames, forecasts_actuals_filenames,
+                       np.full(len(sources), "True"),
+                       [1.0 if gen_spec.UnitType in ("HYDRO", "RTPV") else 0.0 for gen_spec in sources])
+
+    if copper_sheet:
+        sources_file.write("Source(CopperSheet,\n"
+                           "source_type=\"load\",\n"
+                           "forecasts_file=\"timeseries_data_files/Load_forecasts_actuals.csv\",\n"
+                           "actuals_file=\"timeseries_data_files/Load_forecasts_actuals.csv\"\n"
+                           ");\n")
+    else:
+        buses = list(bus_dict.values())
+        prefixes = ["Bus_%d_Load_zone%d" % (bus_spec.ID, bus_spec.Area) for bus_spec in buses]
+        datfile.write_rows(sources_file,
+                           "\nSource(%s,\nsource_type=\"load\",\n"
+                           "forecasts_file=\"timeseries_data_files/%s_forecasts_actuals.csv\",\n"
+                           "actuals_file=\"timeseries_data_files/%s_forecasts_actuals.csv\"\n);",
+                           [bus_spec.Name for bus_spec in buses], prefixes, prefixes)
+
+    sources_file.close()
+
+
+def dat_path(output_dir, day=None):
+    # a single day keeps the historical rts_gmlc.dat, days of a range are told apart by their date
+    if day is None:
+        return os.path.join(output_dir, "rts_gmlc.dat")
+    return os.path.join(output_dir, "rts_gmlc_%s.dat" % day.strftime("%Y%m%d"))
+
+
+def _init(static):
+    _static.update(static)
+
+
+def _write_day(job):
+    day, path, copper_sheet, compress = job
+    write_dat(_static, read_day(_static, day), path, copper_sheet, compress)
+    return path + (".gz" if compress else "")
+
+
+def export(start=None, end=None, output_dir=".", folder=None, simulation="DAY_AHEAD", copper_sheet=True,
+           processes=None, compress=False, series=False, commitment=PLEXOS_COMMITMENT,
+           generation=PLEXOS_GENERATION):
+    # Writes sources.txt and one Prescient template per day of [start, end), rts_gmlc_YYYYMMDD.dat,
+    # or rts_gmlc.dat for start (2020-07-12 by default) alone. The static data is parsed once and
+    # handed to the pool, the workers only read the time series of their days. compress gzips
+    # every file (rts_gmlc.dat.gz, sources.txt.gz). series also writes the forecasts_actuals files
+    # of the sources for the exported days and the horizon after the last one. Every day starts from
+    # the unit states of initial_states, from the commitment and generation files where they cover
+    # the hour before the day and from the merit order pre-dispatch otherwise (or always, without a
+    # commitment).
+    if simulation not in periods.SIMULATIONS:
+        raise ValueError("Unknown simulation=%s specified - expected one of %s" % (simulation, ", ".join(periods.SIMULATIONS)))
+    folder = folder or source_data.SOURCE_DATA_DIR
+    static = read_static(folder, simulation)
+    os.makedirs(output_dir, exist_ok=True)
+
+    print("Writing Prescient template file")
+    first = pd.Timestamp(start or DEFAULT_DAY).to_pydatetime()
+    if end is None:
+        jobs = [(first, dat_path(output_dir), copper_sheet, compress)]
+    else:
+        days = pd.date_range(first, pd.Timestamp(end), freq="D", inclusive="left")
+        jobs = [(day.to_pydatetime(), dat_path(output_dir, day), copper_sheet, compress) for day in days]
+    if jobs:
+        static["initial_states"] = initial_states(static, jobs[0][0], jobs[-1][0], commitment, generation)
+
+    written = []
+    if len(jobs) == 1 or processes == 1:
+        for day, path, copper, gz in jobs:
+            write_dat(static, read_day(static, day), path, copper, gz)
+            written.append(path + (".gz" if gz else ""))
+    else:
+        pool = multiprocessing.Pool(processes, initializer=_init, initargs=(static,))
+        try:
+            written = list(pool.imap(_write_day, jobs))
+        finally:
+            pool.close()
+            pool.join()
+    for path in written:
+        print("Prescient template written to %s" % os.path.basename(path))
+
+    print("")
+
+    print("Writing Prescient sources file")
+    write_sources(static, os.path.join(output_dir, "sources.txt"), copper_sheet, compress)
+    print("Prescient sources file written to sources.txt")
+
+    if series:
+        print("")
+        print("Writing Prescient forecasts_actuals files")
+        last = jobs[-1][0] + timedelta(days=HORIZON_DAYS)
+        paths = forecasts_actuals.write_all(output_dir, folder, first, last, copper_sheet, compress)
+        print("%d forecasts_actuals files written to %s" % (len(paths), os.path.join(output_dir, "timeseries_data_files")))
+    return written
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Create the RTS-GMLC Prescient template and sources files.')
+    parser.add_argument('mode', nargs='?', choices=['output-network'], default=None,
+                        help='output-network writes the transmission network instead of a copper sheet')
+    parser.add_argument('--simulation', dest='simulation', default='DAY_AHEAD', choices=periods.SIMULATIONS,
+                        help='time series resolution, hourly DAY_AHEAD or 5 minute REAL_TIME')
+    parser.add_argument('--output-dir', dest='output_dir', default='.', help='folder for the written files')
+    parser.add_argument('--folder', dest='folder', default='.',
+                        help='source data folder path (default: the current folder, i.e. run from SourceData)')
+    parser.add_argument('--start', dest='start', default=None, help='first day, e.g. 2020-01-01 (default: 2020-07-12)')
+    parser.add_argument('--end', dest='end', default=None,
+                        help='end day (exclusive), writes one rts_gmlc_YYYYMMDD.dat per day from start')
+    parser.add_argument('--forecasts-actuals', dest='series', action='store_true',
+                        help='also write the timeseries_data_files/*_forecasts_actuals.csv named in sources.txt')
+    parser.add_argument('--commitment', dest='commitment', default=PLEXOS_COMMITMENT,
+                        help='solved commitment the days start from, PLEXOS solution layout or the thermal_detail.csv '
+                             'of a Prescient run (default: the PLEXOS DA solution of 7/5 to 7/18)')
+    parser.add_argument('--generation', dest='generation', default=None,
+                        help='solved dispatch for PowerGeneratedT0, same layouts (default: the PLEXOS DA generation '
+                             'with the PLEXOS commitment, Dispatch of a thermal_detail.csv commitment)')
+    parser.add_argument('--merit-order', dest='merit_order', action='store_true',
+                        help='start every day from the merit order pre-dispatch, ignoring any commitment')
+    parser.add_argument('--gzip', dest='compress', action='store_true', help='write gzip compressed files')
+    parser.add_argument('--processes', dest='processes', type=int, default=None,
+                        help='worker processes for a range of days (default: one per CPU)')
+    args = parser.parse_args()
+
+    if args.mode == 'output-network':
+        print("Generating template with transmission network")
+    if args.simulation != 'DAY_AHEAD':
+        print("Generating template for simulation=%s" % args.simulation)
+    commitment = None if args.merit_order else args.commitment
+    generation = args.generation
+    if generation is None and commitment is not None:
+        generation = PLEXOS_GENERATION if commitment == PLEXOS_COMMITMENT else commitment
+    export(args.start, args.end, args.output_dir, os.path.abspath(args.folder), args.simulation,
+           copper_sheet=args.mode != 'output-network', processes=args.processes, compress=args.compress,
+           series=args.series, commitment=commitment, generation=generation)
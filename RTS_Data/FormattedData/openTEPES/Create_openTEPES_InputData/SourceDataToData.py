@@ -1,28 +1,33 @@
 # Libraries
 import itertools
+import os
+import sys
 import time
 import pandas as pd
 
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', '..'))
+from rts_gmlc import periods, resample, source_data
 
-def GettingDataTo_oTData(_path_data, _path_file, CaseName):
+
+def GettingDataTo_oTData(_path_data, _path_file, CaseName, Simulation='DAY_AHEAD'):
     print('Transforming data to get the oT_Data files ****')
 
     StartTimeFunction = time.time()
     StartTime         = time.time()
 
     # reading data from the folder SourceData
-    df_branch        = pd.read_csv(_path_data + '/SourceData/branch.csv' )
-    df_bus           = pd.read_csv(_path_data + '/SourceData/bus.csv'    )
-    df_gen           = pd.read_csv(_path_data + '/SourceData/gen.csv'    )
-    df_storage       = pd.read_csv(_path_data + '/SourceData/storage.csv')
-
-    # reading data from the folder timeseries_data_file
-    df_load          = pd.read_csv(_path_data + '/timeseries_data_files/Load/DAY_AHEAD_regional_Load.csv')
-    df_hydro         = pd.read_csv(_path_data + '/timeseries_data_files/Hydro/DAY_AHEAD_hydro.csv'       )
-    df_csp           = pd.read_csv(_path_data + '/timeseries_data_files/CSP/DAY_AHEAD_Natural_Inflow.csv')
-    df_pv            = pd.read_csv(_path_data + '/timeseries_data_files/PV/DAY_AHEAD_pv.csv'             )
-    df_rtpv          = pd.read_csv(_path_data + '/timeseries_data_files/RTPV/DAY_AHEAD_rtpv.csv'         )
-    df_wind          = pd.read_csv(_path_data + '/timeseries_data_files/WIND/DAY_AHEAD_wind.csv'         )
+    df_branch        = source_data.branch (_path_data + '/SourceData')
+    df_bus           = source_data.bus    (_path_data + '/SourceData')
+    df_gen           = source_data.gen    (_path_data + '/SourceData')
+    df_storage       = source_data.storage(_path_data + '/SourceData')
+
+    # reading data from the folder timeseries_data_file (REAL_TIME series without a file of their own are resampled)
+    df_load          = resample.read_simulation(_path_data + '/timeseries_data_files/Load/DAY_AHEAD_regional_Load.csv', Simulation, date_columns=True)
+    df_hydro         = resample.read_simulation(_path_data + '/timeseries_data_files/Hydro/DAY_AHEAD_hydro.csv',        Simulation, date_columns=True)
+    df_csp           = resample.read_simulation(_path_data + '/timeseries_data_files/CSP/DAY_AHEAD_Natural_Inflow.csv', Simulation, date_columns=True)
+    df_pv            = resample.read_simulation(_path_data + '/timeseries_data_files/PV/DAY_AHEAD_pv.csv',              Simulation, date_columns=True)
+    df_rtpv          = resample.read_simulation(_path_data + '/timeseries_data_files/RTPV/DAY_AHEAD_rtpv.csv',          Simulation, date_columns=True)
+    df_wind          = resample.read_simulation(_path_data + '/timeseries_data_files/WIND/DAY_AHEAD_wind.csv',          Simulation, date_columns=True)
 
     # reading data from the dictionaries
     df_Area          = pd.read_csv(_path_file+'/RTS-GMLC/oT_Dict_Area_'      +CaseName+'.csv')
@@ -58,7 +63,7 @@ def GettingDataTo_oTData(_path_data, _path_file, CaseName):
     ndzn = set(ndzn)
     znar = set(znar)
 
-    pNode2Area = pd.DataFrame(0, dtype=int, index=pd.MultiIndex.from_tuples(itertools.product(nd, ar), names=('Node', 'Area')), columns=['Y/N'])
+    pNode2Area = pd.DataFrame(0, dtype=int, index=pd.MultiIndex.from_tuples(itertools.product(sorted(nd), sorted(ar)), names=('Node', 'Area')), columns=['Y/N'])
     for i,j in ndzn:
         for k in ar:
             if (j,k) in znar:
@@ -72,18 +77,15 @@ def GettingDataTo_oTData(_path_data, _path_file, CaseName):
 
     #%% Defining the nominal values of the demand per areas
     pNomDemand_org = df_bus[['Bus ID','Area','MW Load']]
-    pNomDemArea    = pd.DataFrame(0, dtype=int, index=ar, columns=['MW'])
+    pNomDemArea    = pd.DataFrame(0, dtype=int, index=sorted(ar), columns=['MW'])
     for i in ar:
         pNomDemArea['MW'][i] = pNomDemand_org.loc[pNomDemand_org['Area'] == int(i[-1:]), 'MW Load'].sum()
 
     pNomDemand_org = pNomDemand_org.set_index(['Bus ID'])
 
     # Defining load levels
-    df_load['Month'    ] = df_load.Month.map("{:02}".format)
-    df_load['Day'      ] = df_load.Day.map("{:02}".format)
-    df_load['Period'   ] = df_load.Period.map("{:02}".format)
-    LoadLevels           = [str(df_load['Month'][i])+str(df_load['Day'][i])+str(df_load['Period'][i]) for i in df_load.index]
-    df_load['LoadLevel'] = pd.DataFrame({'LoadLevel': LoadLevels})
+    LoadLevels           = periods.load_levels(df_load).tolist()
+    df_load['LoadLevel'] = LoadLevels
 
     # Getting load factors per area
     pDemandPerArea       = df_load.iloc[: ,4 :]
@@ -115,7 +117,8 @@ def GettingDataTo_oTData(_path_data, _path_file, CaseName):
 
     ##%% Generating the Duration file
     pDuration = pd.DataFrame(0, dtype=int, index=LoadLevels, columns=['Duration','Stage'])
-    pDuration['Duration'] = 1
+    PeriodHours = periods.simulation_resolution(Simulation, _path_data + '/SourceData') / 3600
+    pDuration['Duration'] = int(PeriodHours) if PeriodHours.is_integer() else PeriodHours
     pDuration['Stage'   ] = df_Stage.loc[0,'Stage']
 
     pDuration = pDuration.reset_index()
@@ -1,20 +1,25 @@
 # Libraries
+import os
+import sys
 import time
 import pandas as pd
 
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', '..'))
+from rts_gmlc import periods, resample, source_data
 
-def GettingDataTo_oTDict(_path_data, _path_file, CaseName):
+
+def GettingDataTo_oTDict(_path_data, _path_file, CaseName, Simulation='DAY_AHEAD'):
     print('Transforming data to get the oT_Dict files ****')
 
     StartTime = time.time()
 
     # reading data from the folder SourceData
-    df_bus    = pd.read_csv(_path_data+'/SourceData/bus.csv'   )
-    df_branch = pd.read_csv(_path_data+'/SourceData/branch.csv')
-    df_gen    = pd.read_csv(_path_data+'/SourceData/gen.csv'   )
+    df_bus    = source_data.bus   (_path_data+'/SourceData')
+    df_branch = source_data.branch(_path_data+'/SourceData')
+    df_gen    = source_data.gen   (_path_data+'/SourceData')
 
     # reading data from the folder timeseries_data_file
-    df_TS_CSP = pd.read_csv(_path_data + '/timeseries_data_files/CSP/DAY_AHEAD_Natural_Inflow.csv')
+    df_TS_CSP = resample.read_simulation(_path_data + '/timeseries_data_files/CSP/DAY_AHEAD_Natural_Inflow.csv', Simulation, date_columns=True)
 
 
     # Extracting regions
@@ -67,10 +72,7 @@ def GettingDataTo_oTDict(_path_data, _path_file, CaseName):
     pLineType.to_frame(name='LineType').to_csv(_path_file + '/RTS-GMLC/oT_Dict_Line_' + CaseName + '.csv', sep=',', index=False)
 
     # Defining load levels
-    df_TS_CSP['Month' ] = df_TS_CSP.Month.map("{:02}".format)
-    df_TS_CSP['Day'   ] = df_TS_CSP.Day.map("{:02}".format)
-    df_TS_CSP['Period'] = df_TS_CSP.Period.map("{:02}".format)
-    LoadLevels   = [str(df_TS_CSP['Month'][i])+str(df_TS_CSP['Day'][i])+str(df_TS_CSP['Period'][i]) for i in df_TS_CSP.index]
+    LoadLevels   = periods.load_levels(df_TS_CSP)
     pLoadLevels  = pd.DataFrame({'LoadLevel': LoadLevels})
     pLoadLevels.to_csv(_path_file + '/RTS-GMLC/oT_Dict_LoadLevel_' + CaseName + '.csv', sep=',', index=False)
 
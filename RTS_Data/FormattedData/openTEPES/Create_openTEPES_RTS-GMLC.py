@@ -1,19 +1,44 @@
 # Libraries
+import argparse
+import glob
 import os
+import sys
 import pandas as pd
 
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), '..'))
 import Create_openTEPES_InputData as ID
+from rts_gmlc import build_cache, resample, source_data
 
 CaseName = 'RTS-GMLC'
 
+parser = argparse.ArgumentParser(description='Create the RTS-GMLC case in openTEPES format.')
+parser.add_argument('--simulation', dest='simulation', default='DAY_AHEAD', choices=['DAY_AHEAD', 'REAL_TIME'],
+                    help='simulation whose time series (and load level duration) are used')
+parser.add_argument('--no-cache', dest='use_cache', action='store_false',
+                    help='always rebuild instead of restoring unchanged output from the build cache')
+args = parser.parse_args()
+
 # Setting up the path
 _path_data = os.path.abspath(os.path.join(os.path.dirname( __file__ ), '..', '..'))
 _path_file = os.path.dirname(__file__)
 
 print('*** Creating the case RTS-GLC in openTEPES format ****')
 
-ID.GettingDataTo_oTDict(_path_data, _path_file, CaseName)
 
-ID.GettingDataTo_oTData(_path_data, _path_file, CaseName)
+def create():
+    ID.GettingDataTo_oTDict(_path_data, _path_file, CaseName, args.simulation)
+
+    ID.GettingDataTo_oTData(_path_data, _path_file, CaseName, args.simulation)
+
+
+# the case is only rebuilt when the SourceData tables, time series or converter code changed
+_inputs  = [source_data.table_path(t, _path_data + '/SourceData') for t in ('bus', 'branch', 'gen', 'storage')]
+_inputs += [resample.simulation_data_file(_path_data + '/timeseries_data_files/' + f, args.simulation)
+            for f in ('Load/DAY_AHEAD_regional_Load.csv', 'Hydro/DAY_AHEAD_hydro.csv', 'CSP/DAY_AHEAD_Natural_Inflow.csv',
+                      'PV/DAY_AHEAD_pv.csv', 'RTPV/DAY_AHEAD_rtpv.csv', 'WIND/DAY_AHEAD_wind.csv')]
+build_cache.build('openTEPES', create, inputs=_inputs, output_dir=os.path.join(_path_file, 'RTS-GMLC'),
+                  patterns=['oT_*_' + CaseName + '.csv'], options={'CaseName': CaseName, 'simulation': args.simulation},
+                  code=glob.glob(os.path.join(_path_file, 'Create_openTEPES_InputData', '*.py')),
+                  use_cache=args.use_cache)
 
 print('*** End                                           ****')
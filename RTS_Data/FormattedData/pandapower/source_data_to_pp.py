@@ -1,21 +1,25 @@
 import os
+import sys
 
 import matplotlib.pyplot as mpl
 import numpy as np
 import pandas as pd
 
 import pandapower as pp
-import pandapower.converter as cv
+from pandapower.converter.pypower import from_ppc
+from pandapower.toolbox import reindex_buses
 import pandapower.plotting as plt
 
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), '..'))
+from rts_gmlc import source_data
+
 DIGITS = 5
 miles_to_km = 1.60934
 baseMVA = 100.
 
 
-def _read_csv(table):
-    start_path = os.path.join("..", "..", "SourceData")
-    return pd.read_csv(os.path.join(start_path, table + ".csv"))
+def _read_csv(table, folder=None):
+    return source_data.read_table(table, folder)
 
 
 def plot_net(net, ax=None):
@@ -53,8 +57,8 @@ def plot_net(net, ax=None):
     mpl.close()
 
 
-def create_buses():
-    busdata = _read_csv("bus")
+def create_buses(folder=None):
+    busdata = _read_csv("bus", folder)
     buses = np.zeros((len(busdata), 15), dtype=float)
     for ind, (i, b) in enumerate(busdata.iterrows()):
         buses[ind, 0] = b['Bus ID']
@@ -81,8 +85,8 @@ def create_buses():
     return buses
 
 
-def create_branches():
-    branchdata = _read_csv("branch")
+def create_branches(folder=None):
+    branchdata = _read_csv("branch", folder)
     branches = np.zeros((len(branchdata), 14), dtype=float)
     for ind, (i, b) in enumerate(branchdata.iterrows()):
         branches[ind, 0] = int(b['From Bus'])
@@ -102,8 +106,8 @@ def create_branches():
     return branches
 
 
-def create_gens():
-    gendata = _read_csv("gen")
+def create_gens(folder=None):
+    gendata = _read_csv("gen", folder)
     gens = np.zeros((len(gendata), 21), dtype=float)
     for ind, (i, g) in enumerate(gendata.iterrows()):
         gens[ind, 0] = g['Bus ID']
@@ -135,13 +139,13 @@ def create_gens():
     return gens
 
 
-def create_ppc():
+def create_ppc(folder=None):
     ppc = dict()
     ppc["baseMVA"] = baseMVA
     # ppc["areas"] =
-    ppc["bus"] = create_buses()
-    ppc["branch"] = create_branches()
-    ppc["gen"] = create_gens()
+    ppc["bus"] = create_buses(folder)
+    ppc["branch"] = create_branches(folder)
+    ppc["gen"] = create_gens(folder)
 
     return ppc
 
@@ -153,7 +157,7 @@ def _update_line_data(net, branch_data, element="line"):
 
     for i in branch_data.index:
         a = branch_data.loc[i, ["From Bus", "To Bus"]].values.astype(int)
-        bus_ind = np.where(np.in1d(b, a))[0]
+        bus_ind = np.where(np.isin(b, a))[0]
         element_rows = (net[element].loc[:, [from_var, to_var]] == bus_ind).values
         element_index = element_rows[:, 0] & element_rows[:, 1]
         net[element].loc[element_index, "name"] = branch_data.at[i, "UID"]
@@ -176,8 +180,8 @@ def create_trafo_c35(net, branch_data):
                                           shift_degree=0., tap_step_percent=1.5, tap_pos=0, tap_phase_shifter=False)
 
 
-def add_additional_information(net):
-    bus_data = _read_csv("bus")
+def add_additional_information(net, folder=None):
+    bus_data = _read_csv("bus", folder)
     # store bus id
     net["bus"].loc[:, "id"] = net["bus"].loc[:, "name"].values
     # check if indices are identical
@@ -190,7 +194,7 @@ def add_additional_information(net):
     net["bus_geodata"].loc[:, ["x", "y"]] = bus_data.loc[:, ["lat", "lng"]].values
 
     # correct line names and lengths
-    branch_data = _read_csv("branch")
+    branch_data = _read_csv("branch", folder)
     _update_line_data(net, branch_data, element="line")
 
     # 104 is a transformer, not a line
@@ -212,25 +216,31 @@ def add_additional_information(net):
     return net
 
 
-def create_pp_from_ppc():
+def create_pp_from_ppc(folder=None, path="pandapower_net.json", plot=True):
     # create ppc
-    ppc = create_ppc()
+    ppc = create_ppc(folder)
     # convert it to a pandapower net
-    net = cv.from_ppc(ppc, validate_conversion=False)
+    net = from_ppc(ppc, validate_conversion=False)
+    if net["bus"]["name"].isnull().all():
+        # pandapower >= 3 indexes buses by their ppc number and leaves the
+        # names empty; restore the positional layout the corrections expect
+        net["bus"]["name"] = net["bus"].index.values.astype(object)
+        reindex_buses(net, dict(zip(net["bus"].index, range(len(net["bus"])))))
     # run a power flow
     pp.runpp(net)
     vm_pu_before = net.res_bus.vm_pu.values
     # manual corrections and additional information such as line length in km and names
-    net = add_additional_information(net)
+    net = add_additional_information(net, folder)
     # run power flow again and validate results
     pp.runpp(net)
     vm_pu_after = net.res_bus.vm_pu.values
     # power flow results should not change
     assert np.allclose(vm_pu_after, vm_pu_before)
     # save it
-    pp.to_json(net, "pandapower_net.json")
+    pp.to_json(net, path)
     # plot it :)
-    plot_net(net)
+    if plot:
+        plot_net(net)
 
 
 if __name__ == "__main__":
@@ -1,5 +1,8 @@
 # %%
+import argparse
+import hashlib
 import os
+import sys
 
 import matplotlib.pyplot as plt
 import numpy as np
@@ -8,21 +11,27 @@ import datetime as dt
 
 import pypsa
 
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), '..'))
+from rts_gmlc import build_cache, cost_curves, periods, resolver, source_data
+
 DIGITS = 5
 miles_to_km = 1.60934
 baseMVA = 100.
 
 # NOTE: our objective is to use pypsa's import_from_csv_folder method
-def _read_csv(table, clean_cols=True):
-    start_path = os.path.join(os.path.dirname(__file__), '..', "..", "SourceData")
-    df =  pd.read_csv(os.path.join(start_path, table))
+def _read_csv(table, clean_cols=True, folder=None):
+    name = os.path.splitext(table)[0]
+    if name in source_data.TABLES:
+        df = source_data.read_table(name, folder)
+    else:
+        df =  pd.read_csv(os.path.join(folder or source_data.SOURCE_DATA_DIR, table))
     if not clean_cols:
         return df
     df.columns = df.columns.str.lower().str.replace(' ', '')
     return df
 
 # %%
-def create_buses():
+def create_buses(folder=None):
     # Bus data
     column_map_bus = {
         'busname':'name',
@@ -43,7 +52,7 @@ def create_buses():
         'name':'str',
         'busid':'str'
     }
-    busdata = _read_csv('bus.csv')
+    busdata = _read_csv('bus.csv', folder=folder)
     busdata = (busdata
                .drop(columns=[col for col in busdata.columns if col not in column_map_bus.keys()])
                .rename(columns=column_map_bus)
@@ -54,11 +63,9 @@ def create_buses():
     # make names numeric
     return busdata
 
-bd = create_buses()
-bd
 
 # %%
-def create_branches():
+def create_branches(busdata=None, folder=None):
     # Branch data
     column_map_branch = {
         'uid':'name',
@@ -89,14 +96,15 @@ def create_branches():
         'busid0':'str',
         'busid1':'str'
     }
-    branchdata = _read_csv('branch.csv')
+    branchdata = _read_csv('branch.csv', folder=folder)
     branchdata = (branchdata
                   .drop(columns=[col for col in branchdata.columns if col not in column_map_branch.keys()])
                   .rename(columns=column_map_branch)
                   .astype(column_dtype_branch)
                   )
     # merge on bus v_noms
-    busdata = create_buses()
+    if busdata is None:
+        busdata = create_buses(folder)
     branchdata = pd.merge(left=branchdata, 
                           right=busdata.reset_index()[['name','busid', 'v_nom']]
                                  .rename(columns={'busid':'busid0', 'v_nom':'v_nom0', 'name':'bus0'}), 
@@ -121,58 +129,43 @@ def create_branches():
     transdata = branchdata.loc[mask_trans]
     return linedata, transdata
 
-ld, td = create_branches()
-ld
-
 
 # %%
 dt.datetime(12, 5, 7, 12).time()
 
 # %%
-def create_series(pointers:pd.DataFrame, parameter_map:dict, scale=True ):
+def create_series(pointers:pd.DataFrame, parameter_map:dict, scale=True, folder=None):
     # helper to pull and merge all datasets into appropriate dataframes (separate by parameter)
-    date_cols = ['Year', 'Month', 'Day', 'Period']
+    # NOTE: the resolver reads each data file once and applies the scaling factors in one step
+    source_pointers = pointers.rename(columns={'simulation':'Simulation', 'category':'Category', 'object':'Object',
+                                               'parameter':'Parameter', 'scalingfactor':'Scaling Factor',
+                                               'datafile':'Data File'})
     series_dict = {}
-    parameters = pointers['parameter'].drop_duplicates().values
-    for p in parameters:
-        df = pd.DataFrame(columns=date_cols)
-        filepaths = pointers.loc[pointers.parameter == p, 'datafile'].drop_duplicates().values
-        for fp in filepaths:
-            f = _read_csv(fp, clean_cols=False)
-            df = pd.merge(left=df, right=f, how='outer', on=date_cols)
-
-        df.Period -=1
-        df.index = pd.to_datetime(df[date_cols].rename(columns={'Period':'Hour'}))
+    for (simulation, p), df in resolver.resolve(source_pointers, per_unit=scale, folder=folder).items():
         df.index.name = 'snapshots'
-        series_dict[parameter_map[p]] = df.drop(columns=['Year', 'Month', 'Day', 'Period'])
-
-    # normalize to per-unit values
-    if scale:
-        for i, p in pointers.iterrows():
-            series_dict[parameter_map[p.parameter]][p.object] /= p.scalingfactor 
+        series_dict[parameter_map[p]] = df
 
     return series_dict
 
 
 # %%
-def create_genseries():
-    # get time-varying pointers and restrict to day ahead generation
-    pointers = _read_csv('timeseries_pointers.csv')
-    pointers = pointers.loc[(pointers.simulation == 'DAY_AHEAD')
+def create_genseries(simulation='DAY_AHEAD', folder=None):
+    # get time-varying pointers and restrict to the simulation's generation (day ahead by default)
+    pointers = _read_csv('timeseries_pointers.csv', folder=folder)
+    # (the CSP storage Natural_Inflow pointers have no pypsa attribute)
+    parameter_map = {'PMax MW':'p_max_pu', 'PMin MW':'p_min_pu'}
+    pointers = pointers.loc[(pointers.simulation == simulation)
                             & (pointers.category == 'Generator')
-                            & (pointers.object != '212_CSP_HEAD_STORAGE')
+                            & pointers.parameter.isin(parameter_map)
                             # & (pointers.parameter != 'PMin MW') # network doesn't optimize when we include this
                             ]
-    parameter_map = {'PMax MW':'p_max_pu', 'PMin MW':'p_min_pu'}
-    genseries = create_series(pointers, parameter_map)
+    genseries = create_series(pointers, parameter_map, folder=folder)
     
     return genseries
 
-gs = create_genseries()
-gs
 
 # %%
-def create_gens(unit_commitment):
+def create_gens(unit_commitment, busdata=None, simulation='DAY_AHEAD', folder=None):
     # Create generator data
     column_map_gen = {
         'genuid':'name',
@@ -209,7 +202,7 @@ def create_gens(unit_commitment):
         False:'ramp_limit_shut_down', # not available
         False:'weight' # used for aggregation
     }
-    gendata = _read_csv('gen.csv')
+    gendata = _read_csv('gen.csv', folder=folder)
     gendata = (gendata
             #    .drop(columns=[col for col in gendata.columns if col not in column_map_gen.keys()])
                .rename(columns=column_map_gen)
@@ -222,8 +215,10 @@ def create_gens(unit_commitment):
     nonintermittent_list = ['NG', 'Oil', 'Coal', 'Nuclear', 'Hydro']
     gendata = gendata.loc[gendata.carrier.isin(intermittent_list + nonintermittent_list)].copy()
     gendata = gendata.loc[gendata.category != 'CSP']
+    if busdata is None:
+        busdata = create_buses(folder)
     gendata = pd.merge(left=gendata, 
-                    right=create_buses().reset_index()[['name', 'busid', 'type']].rename(columns={'name':'bus','type':'control'}), 
+                    right=busdata.reset_index()[['name', 'busid', 'type']].rename(columns={'name':'bus','type':'control'}), 
                         on='busid').set_index('name')
     gendata.loc[gendata.control == 'Ref', 'control'] = 'Slack'
     # define p_nom
@@ -233,11 +228,12 @@ def create_gens(unit_commitment):
     # NOTE: network can't find feasible solution when pminmw exists
     # gendata['p_min_pu'] = gendata.pminmw / gendata.p_nom
 
-    # NOTE: Assume hourly snapshot
+    # NOTE: one snapshot per simulation period (hourly for DAY_AHEAD, 5 minutes for REAL_TIME)
+    minutes_per_snapshot = periods.simulation_resolution(simulation, folder) / 60
     gendata['ramp_limit_up'] = np.nan
     gendata.loc[gendata.carrier.isin(nonintermittent_list), 'ramp_limit_up'] = (
         gendata.loc[gendata.carrier.isin(nonintermittent_list), 'rampratemw/min'] / 
-        gendata.loc[gendata.carrier.isin(nonintermittent_list), 'p_nom']*60)
+        gendata.loc[gendata.carrier.isin(nonintermittent_list), 'p_nom']*minutes_per_snapshot)
     # unit commitments
     gendata['committable'] = unit_commitment
     gendata.loc[gendata.carrier.isin(intermittent_list), 'committable'] = False
@@ -251,8 +247,8 @@ def create_gens(unit_commitment):
     # assume constant marginal cost at output_pct_2 instead of one based on production relative to max capacity
     # Also and convert $/mmbtu to $/MWh
     # TODO: Future alternative solution: split each generator into separate generators with different costs
-    gendata['marginal_cost'] = (
-        gendata['fuelprice$/mmbtu'] * (1/1e6) * (gendata.hr_avg_0 + gendata.hr_incr_2) * (1e3))
+    gendata['marginal_cost'] = cost_curves.marginal_cost(
+        gendata.hr_avg_0 + gendata.hr_incr_2, gendata['fuelprice$/mmbtu'])
     
     # clean up columns
     keep_cols = ['busid','bus','control', 'type', 
@@ -264,22 +260,20 @@ def create_gens(unit_commitment):
     gendata = gendata.drop(columns=[col for col in gendata.columns if col not in keep_cols])
 
     # get generator series
-    genseries = create_genseries()
+    genseries = create_genseries(simulation, folder)
 
     return gendata, genseries
 
-gd, gs = create_gens(True)
-gd
-
 
 # %%
 # TODO -- storage data
 # storgendata = gendata.loc[gendata.carrier == 'Storage'].copy()
 
 # %%
-def create_loads():
-
-    loaddata = create_buses().astype({'area':'str'})
+def create_loads(busdata=None, simulation='DAY_AHEAD', folder=None):
+    if busdata is None:
+        busdata = create_buses(folder)
+    loaddata = busdata.astype({'area':'str'})
     loaddata['bus'] = loaddata.index
     loaddata.index.rename('name', inplace=True)
     loaddata['carrier'] = 'AC'
@@ -287,42 +281,78 @@ def create_loads():
     # clean up columns and drop 0-load
     loaddata = loaddata.loc[loaddata.pct_areaload > 0, ['bus', 'busid', 'carrier', 'area', 'pct_areaload']]
     # load series data
-    # get time-varying pointers and restrict to day ahead generation
-    pointers = _read_csv('timeseries_pointers.csv')
-    pointers = pointers.loc[(pointers.simulation == 'DAY_AHEAD') & (pointers.category == 'Area')]
+    # get time-varying pointers and restrict to the simulation's area loads
+    pointers = _read_csv('timeseries_pointers.csv', folder=folder)
+    pointers = pointers.loc[(pointers.simulation == simulation) & (pointers.category == 'Area')]
     parameter_map = {'MW Load':'p_set',}
-    loadseries = create_series(pointers, parameter_map, scale=False)['p_set']
+    loadseries = create_series(pointers, parameter_map, scale=False, folder=folder)['p_set']
     for i, b in loaddata.iterrows():
         loadseries[b.bus] = loadseries[b.area] * b.pct_areaload
 
-    loadseries = loadseries.drop(columns=['1', '2', '3'])
+    loadseries = loadseries.drop(columns=pointers.object.unique())
 
     return loaddata, loadseries
 
-ld, ls = create_loads()
-ld.shape
-
 
 # %%
-def write_pypsa_network_csvs(snapshots, unit_commitment, save_path):
+def data_snapshots(simulation='DAY_AHEAD', folder=None):
+    # every period of the simulation's area load series (the 8784 hours of 2020 for DAY_AHEAD)
+    return resolver.series(simulation, 'MW Load', category='Area', folder=folder).index
+
+
+def write_pypsa_network_csvs(snapshots, unit_commitment, save_path, simulation='DAY_AHEAD', use_cache=True,
+                             folder=None):
+    # NOTE: the csvs are restored from the build cache when neither the inputs nor the options changed
+    inputs = [source_data.table_path(t, folder) for t in ('bus', 'branch', 'gen', 'timeseries_pointers')]
+    inputs += resolver.data_files(simulation=simulation, category=['Generator', 'Area'], folder=folder)
+    options = {'snapshots': hashlib.sha256(np.asarray(snapshots, dtype='datetime64[ns]').tobytes()).hexdigest(),
+               'unit_commitment': unit_commitment, 'simulation': simulation}
+    build_cache.build('pypsa', lambda: _write_pypsa_network_csvs(snapshots, unit_commitment, save_path, simulation,
+                                                                 folder),
+                      inputs=inputs, output_dir=save_path, options=options, code=[__file__], patterns=None,
+                      use_cache=use_cache)
+    
+    return
+
+
+def _write_pypsa_network_csvs(snapshots, unit_commitment, save_path, simulation, folder=None):
+    # returns the names of the files written, the build cache keeps exactly those
     # buses
-    create_buses().drop(columns='busid').to_csv(os.path.join(save_path, 'buses.csv'))
+    busdata = create_buses(folder)
+    busdata.drop(columns='busid').to_csv(os.path.join(save_path, 'buses.csv'))
     # lines
-    lines, trans = create_branches()
+    lines, trans = create_branches(busdata, folder)
     lines.to_csv(os.path.join(save_path, 'lines.csv'))
     trans.to_csv(os.path.join(save_path, 'transformers.csv'))
     # generators
-    gendata, genseries = create_gens(unit_commitment)
+    gendata, genseries = create_gens(unit_commitment, busdata, simulation, folder)
     gendata.drop(columns='busid').to_csv(os.path.join(save_path, 'generators.csv'))
+    written = ['buses.csv', 'lines.csv', 'transformers.csv', 'generators.csv']
     for k in genseries.keys():
         (genseries[k]
          .loc[snapshots]
          .to_csv(os.path.join(save_path, f'generators-{k}.csv'), index=True))
+        written.append(f'generators-{k}.csv')
     # loads
-    loaddata, loadseries = create_loads()
+    loaddata, loadseries = create_loads(busdata, simulation, folder)
     loaddata.drop(columns='busid').to_csv(os.path.join(save_path, 'loads.csv'))
     loadseries.loc[snapshots].to_csv(os.path.join(save_path, 'loads-p_set.csv'), index=True)
-    
-    return
+    written += ['loads.csv', 'loads-p_set.csv']
 
-# %%
\ No newline at end of file
+    return written
+
+# %%
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Write the RTS-GMLC network as pypsa csv files.')
+    parser.add_argument('--simulation', dest='simulation', default='DAY_AHEAD', choices=periods.SIMULATIONS,
+                        help='simulation whose time series (and resolution) are written')
+    parser.add_argument('--save-path', dest='save_path', default=os.path.join(os.path.dirname(__file__), 'rts-gmlc/'),
+                        help='output folder')
+    parser.add_argument('--folder', dest='folder', default=source_data.SOURCE_DATA_DIR, help='source data folder path')
+    parser.add_argument('--no-unit-commitment', dest='unit_commitment', action='store_false',
+                        help='write all generators as non-committable')
+    args = parser.parse_args()
+
+    os.makedirs(args.save_path, exist_ok=True)
+    write_pypsa_network_csvs(data_snapshots(args.simulation, args.folder), args.unit_commitment, args.save_path,
+                             args.simulation, folder=args.folder)
@@ -0,0 +1,10 @@
+"""
+Shared helpers used by the RTS-GMLC format converters in FormattedData.
+
+    The converters (MATPOWER, Prescient, pandapower, pypsa, openTEPES) add the
+    FormattedData folder to sys.path and import from here, e.g.
+
+    # Examples:
+    #     >>> from rts_gmlc import source_data
+    #     >>> buses = source_data.bus()
+"""
@@ -0,0 +1,256 @@
+import argparse
+import datetime
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from . import export, periods, resolver, source_data, stream, timeseries
+
+HISTORY = os.path.join(timeseries.RTS_DATA_DIR, '.cache', 'benchmark_history.json')
+# a case is flagged when it got this much slower (or allocates this much more) than before
+THRESHOLD = 1.2
+# differences below these are noise, whatever the ratio
+MIN_SECONDS = 0.01
+MIN_MB = 1.0
+
+RT_WIND = '../timeseries_data_files/WIND/REAL_TIME_wind.csv'
+DA_PV = '../timeseries_data_files/PV/DAY_AHEAD_pv.csv'
+RT_RESERVES = ['../timeseries_data_files/Reserves/REAL_TIME_regional_Spin_Up_R{}.csv'.format(i) for i in (1, 2, 3)]
+
+
+# Every case takes a scratch output folder, does its setup and returns the callable that is timed.
+
+def case_matpower(output):
+    module = export._load('MATPOWER', 'script.py')
+    path = os.path.join(output, 'RTS_GMLC')
+    return lambda: module.create_rts_MATPOWER_file(source_data.SOURCE_DATA_DIR, ['m'], path)
+
+
+def case_prescient(output):
+    module = export._load('Prescient', 'topysp.py')
+    return lambda: module.export(output_dir=output, folder=source_data.SOURCE_DATA_DIR)
+
+
+def case_pypsa(output):
+    module = export._load('pypsa', 'source_to_pypsa_csv.py')
+    snapshots = pd.date_range(start='1/1/2020', end='1/1/2021', freq='h')[:-1]
+    return lambda: module.write_pypsa_network_csvs(snapshots, unit_commitment=True, save_path=output, use_cache=False)
+
+
+def case_pandapower(output):
+    module = export._load('pandapower', 'source_data_to_pp.py')
+    path = os.path.join(output, 'pandapower_net.json')
+    return lambda: module.create_pp_from_ppc(source_data.SOURCE_DATA_DIR, path, plot=False)
+
+
+def case_opentepes(output):
+    sys.path.append(os.path.join(export.FORMATTED_DATA_DIR, 'openTEPES'))
+    import Create_openTEPES_InputData as ID
+    os.makedirs(os.path.join(output, 'RTS-GMLC'), exist_ok=True)
+    path_data = timeseries.RTS_DATA_DIR
+    ID.GettingDataTo_oTDict(path_data, output, 'RTS-GMLC')
+    return lambda: ID.GettingDataTo_oTData(path_data, output, 'RTS-GMLC')
+
+
+def case_read_csv(output):
+    path = timeseries.data_file(RT_WIND)
+    return lambda: pd.read_csv(path)
+
+
+def case_read_full_year(output):
+    timeseries.open_store(RT_WIND)
+
+    def run():
+        timeseries._open_stores.clear()
+        return timeseries.read_frame(RT_WIND)
+    return run
+
+
+def case_read_window(output):
+    timeseries.open_store(DA_PV)
+
+    def run():
+        timeseries._open_stores.clear()
+        return timeseries.read_window(DA_PV, '2020-07-12', '2020-07-14')
+    return run
+
+
+def case_resolve_pointers(output):
+    resolver.resolve(simulation='DAY_AHEAD')
+
+    def run():
+        timeseries._open_stores.clear()
+        return resolver.resolve(simulation='DAY_AHEAD', per_unit=True)
+    return run
+
+
+def case_datetime_index(output):
+    calendar = np.array(timeseries.open_store(RT_WIND).calendar)
+
+    def run():
+        periods.clear_cache()
+        return periods.datetime_index(calendar, 300)
+    return run
+
+
+def case_stream_days(output):
+    for path in RT_RESERVES + [RT_WIND]:
+        timeseries.open_store(path)
+    return lambda: sum(len(block) for _, block in stream.days(RT_RESERVES + [RT_WIND]))
+
+
+CASES = {
+    'convert.MATPOWER': case_matpower,
+    'convert.Prescient': case_prescient,
+    'convert.pypsa': case_pypsa,
+    'convert.pandapower': case_pandapower,
+    'convert.openTEPES': case_opentepes,
+    'timeseries.read_csv': case_read_csv,
+    'timeseries.read_full_year': case_read_full_year,
+    'timeseries.read_window': case_read_window,
+    'timeseries.resolve_pointers': case_resolve_pointers,
+    'timeseries.datetime_index': case_datetime_index,
+    'timeseries.stream_days': case_stream_days,
+}
+
+
+def _measure(job):
+    # runs in a fresh worker process, so the peak RSS is this case's alone
+    name, repeat = job
+    os.environ.setdefault('MPLBACKEND', 'Agg')
+    # the build cache would turn a converter run into a file copy
+    os.environ['RTS_GMLC_NO_CACHE'] = '1'
+    with tempfile.TemporaryDirectory() as output:
+        try:
+            run = CASES[name](output)
+            times = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                run()
+                times.append(time.perf_counter() - start)
+            # allocations are traced in a separate run, tracing slows everything down
+            tracemalloc.start()
+            run()
+            allocated = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        except BaseException as error:
+            return name, {'status': 'failed: {}: {}'.format(type(error).__name__, error)}
+    return name, {'status': 'ok', 'seconds': min(times), 'mean_seconds': sum(times) / len(times),
+                  'allocated_mb': allocated / 1e6, 'peak_rss_mb': export._peak_rss_mb()}
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=export.FORMATTED_DATA_DIR,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(cases=None, repeat=3, history=HISTORY, label=None):
+    cases = list(cases or CASES)
+    unknown = [c for c in cases if c not in CASES]
+    if unknown:
+        raise ValueError('Unknown cases {}, expected some of {}'.format(unknown, ', '.join(CASES)))
+    record = {
+        'label': label,
+        'time': datetime.datetime.now().isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'cases': {},
+    }
+    # cases run one after the other so they do not compete for the CPU
+    pool = multiprocessing.Pool(1, maxtasksperchild=1)
+    try:
+        for name, result in pool.imap(_measure, [(name, repeat) for name in cases]):
+            record['cases'][name] = result
+            print(_format(name, result))
+    finally:
+        pool.close()
+        pool.join()
+    runs = load(history)
+    runs.append(record)
+    os.makedirs(os.path.dirname(os.path.abspath(history)), exist_ok=True)
+    with open(history, 'w') as f:
+        json.dump(runs, f, indent=1)
+    return record
+
+
+def _format(name, result):
+    if result['status'] != 'ok':
+        return '{:<30} {}'.format(name, result['status'])
+    return '{:<30} {seconds:9.4f} s {allocated_mb:9.1f} MB allocated {peak_rss_mb:9.1f} MB peak RSS'.format(name, **result)
+
+
+def load(history=HISTORY):
+    if not os.path.exists(history):
+        return []
+    with open(history) as f:
+        return json.load(f)
+
+
+def compare(before, after, threshold=THRESHOLD):
+    # returns (case, metric, before, after) for everything that got worse by more than threshold
+    regressions = []
+    for name, new in after['cases'].items():
+        old = before['cases'].get(name)
+        if old is None or old['status'] != 'ok' or new['status'] != 'ok':
+            continue
+        for metric, floor in (('seconds', MIN_SECONDS), ('allocated_mb', MIN_MB), ('peak_rss_mb', MIN_MB)):
+            if new[metric] > old[metric] * threshold and new[metric] - old[metric] > floor:
+                regressions.append((name, metric, old[metric], new[metric]))
+    return regressions
+
+
+def _select(runs, which):
+    # a run is picked by its position in the history (negative counts from the end) or its label
+    for record in runs:
+        if record.get('label') == which:
+            return record
+    return runs[int(which)]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the RTS-GMLC converters and time series access.')
+    parser.add_argument('--history', dest='history', default=HISTORY, help='json file holding every run')
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+    run_parser = commands.add_parser('run', help='run cases and append the results to the history')
+    run_parser.add_argument('cases', nargs='*', help='cases to run (default: all)')
+    run_parser.add_argument('--repeat', type=int, default=3, help='timed runs per case, the fastest is recorded')
+    run_parser.add_argument('--label', default=None, help='name to refer to this run by')
+    compare_parser = commands.add_parser('compare', help='flag regressions between two runs of the history')
+    compare_parser.add_argument('before', nargs='?', default='-2', help='label or index (default: -2)')
+    compare_parser.add_argument('after', nargs='?', default='-1', help='label or index (default: -1)')
+    compare_parser.add_argument('--threshold', type=float, default=THRESHOLD, help='ratio flagged as a regression')
+    commands.add_parser('list', help='list the cases')
+    args = parser.parse_args()
+
+    if args.command == 'list':
+        print('\n'.join(CASES))
+    elif args.command == 'run':
+        run(args.cases, args.repeat, args.history, args.label)
+    else:
+        runs = load(args.history)
+        before, after = _select(runs, args.before), _select(runs, args.after)
+        for name in after['cases']:
+            if name in before['cases']:
+                print('before ' + _format(name, before['cases'][name]))
+                print('after  ' + _format(name, after['cases'][name]))
+        regressions = compare(before, after, args.threshold)
+        for name, metric, old, new in regressions:
+            print('REGRESSION {} {}: {:.4g} -> {:.4g} ({:+.0%})'.format(name, metric, old, new, new / old - 1))
+        if regressions:
+            sys.exit(1)
+        print('no regressions')
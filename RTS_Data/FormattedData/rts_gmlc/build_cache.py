@@ -0,0 +1,115 @@
+import fnmatch
+import glob
+import hashlib
+import json
+import os
+import shutil
+import time
+
+from . import timeseries
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.environ.get('RTS_GMLC_BUILD_CACHE', os.path.join(timeseries.RTS_DATA_DIR, '.cache', 'builds'))
+# number of fingerprints kept per converter, older entries are pruned after every build
+KEEP = 4
+
+# keyed on absolute path, holds (mtime_ns, size, sha256) so a file is hashed once per process
+_hashes = {}
+
+
+def _file_hash(path):
+    stat = os.stat(path)
+    cached = _hashes.get(path)
+    if cached is None or cached[0] != stat.st_mtime_ns or cached[1] != stat.st_size:
+        cached = (stat.st_mtime_ns, stat.st_size, timeseries.file_hash(path))
+        _hashes[path] = cached
+    return cached[2]
+
+
+def fingerprint(name, inputs, options=None, code=()):
+    # The converter name, the content of every input file, the converter code (including the
+    # shared rts_gmlc helpers) and the options decide the output. File locations do not.
+    code = sorted(set(os.path.abspath(p) for p in code) | set(glob.glob(os.path.join(PACKAGE_DIR, '*.py'))))
+    digest = hashlib.sha256()
+    digest.update(name.encode())
+    for group in (sorted(os.path.abspath(p) for p in inputs), code):
+        for path in group:
+            digest.update(os.path.basename(path).encode())
+            digest.update(_file_hash(path).encode())
+    digest.update(json.dumps(options or {}, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+def entry_path(name, key):
+    return os.path.join(CACHE_DIR, name, key)
+
+
+def _outputs(output_dir, patterns):
+    found = []
+    for filename in sorted(os.listdir(output_dir)):
+        if any(fnmatch.fnmatch(filename, pattern) for pattern in patterns):
+            if os.path.isfile(os.path.join(output_dir, filename)):
+                found.append(filename)
+    return found
+
+
+def restore(name, key, output_dir):
+    entry = entry_path(name, key)
+    try:
+        with open(os.path.join(entry, 'manifest.json')) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return False
+    os.makedirs(output_dir, exist_ok=True)
+    for filename in manifest['files']:
+        shutil.copyfile(os.path.join(entry, 'files', filename), os.path.join(output_dir, filename))
+    # touch the entry so pruning keeps the fingerprints in use
+    os.utime(entry)
+    return True
+
+
+def save(name, key, output_dir, patterns, options=None, files=None):
+    entry = entry_path(name, key)
+    tmp = '{}.tmp-{}'.format(entry, os.getpid())
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(os.path.join(tmp, 'files'))
+    files = sorted(files) if files is not None else _outputs(output_dir, patterns)
+    for filename in files:
+        shutil.copyfile(os.path.join(output_dir, filename), os.path.join(tmp, 'files', filename))
+    with open(os.path.join(tmp, 'manifest.json'), 'w') as f:
+        json.dump({'name': name, 'options': options or {}, 'created': time.time(), 'files': files},
+                  f, indent=1, default=str)
+    shutil.rmtree(entry, ignore_errors=True)
+    try:
+        os.rename(tmp, entry)
+    except OSError:
+        # a parallel build of the same fingerprint finished first
+        shutil.rmtree(tmp, ignore_errors=True)
+    return files
+
+
+def prune(name, keep=KEEP):
+    folder = os.path.join(CACHE_DIR, name)
+    if not os.path.isdir(folder):
+        return
+    entries = sorted((os.path.join(folder, e) for e in os.listdir(folder) if '.tmp-' not in e),
+                     key=os.path.getmtime, reverse=True)
+    for entry in entries[keep:]:
+        shutil.rmtree(entry, ignore_errors=True)
+
+
+def build(name, create, inputs, output_dir, patterns=('*',), options=None, code=(), use_cache=True):
+    # Runs create() unless the outputs of the same fingerprint are cached, in which case the
+    # files matching patterns are copied back into output_dir. Returns True on a cache hit.
+    # With patterns None, create() returns the names of the files it wrote and only those are cached.
+    if not use_cache or os.environ.get('RTS_GMLC_NO_CACHE'):
+        create()
+        return False
+    key = fingerprint(name, inputs, options, code)
+    if restore(name, key, output_dir):
+        print('{}: inputs unchanged, restored cached output ({})'.format(name, key[:12]))
+        return True
+    written = create()
+    save(name, key, output_dir, patterns, options, files=None if patterns is not None else written)
+    prune(name)
+    return False
@@ -0,0 +1,66 @@
+import numpy as np
+
+OUTPUT_COLUMNS = ['Output_pct_0', 'Output_pct_1', 'Output_pct_2', 'Output_pct_3', 'Output_pct_4']
+INCR_COLUMNS = ['HR_incr_1', 'HR_incr_2', 'HR_incr_3', 'HR_incr_4']
+# BTU/kWh of a unit converting all of its fuel heat, lower average heat rates are data errors
+MIN_HEAT_RATE = 3412
+
+
+def heat_rates(gen, segments=3):
+    # (n_gen, segments + 1) output fractions, (n_gen,) average heat rate at the first point and
+    # (n_gen, segments) incremental heat rates. The fourth segment only exists for some units,
+    # the others get a zero length segment repeating their last point.
+    if not 1 <= segments <= len(INCR_COLUMNS):
+        raise ValueError('segments must be between 1 and {}'.format(len(INCR_COLUMNS)))
+    output = np.column_stack([_column(gen, c) for c in OUTPUT_COLUMNS[:segments + 1]])
+    incr = np.column_stack([_column(gen, c) for c in INCR_COLUMNS[:segments]])
+    for n in range(4, segments + 1):
+        missing = np.isnan(output[:, n])
+        output[missing, n] = output[missing, n - 1]
+        incr[missing, n - 1] = 0.0
+    return output, _column(gen, 'HR_avg_0'), incr
+
+
+def _column(gen, column):
+    if column in gen:
+        return gen[column].to_numpy(dtype=float)
+    return np.full(len(gen), np.nan)
+
+
+def io_curves(output, hr_avg_0, hr_incr, min_heat_rate=None):
+    # Input-output curves for every generator at once: x is the output (fraction or MW), y the
+    # heat input at x in BTU/kWh * x units, starting at the average heat rate times the first
+    # point and growing by the incremental heat rate of each segment.
+    x = np.asarray(output, dtype=float)
+    hr_avg_0 = np.asarray(hr_avg_0, dtype=float)
+    if min_heat_rate is not None:
+        hr_avg_0 = np.where(hr_avg_0 <= min_heat_rate, min_heat_rate, hr_avg_0)
+    # heat starts at the low end of the first segment, hydro rows list 1, 0, 0, 0 and burn nothing
+    steps = np.column_stack([hr_avg_0 * x[:, :2].min(axis=1), np.diff(x, axis=1) * np.asarray(hr_incr, dtype=float)])
+    return x, np.cumsum(steps, axis=1)
+
+
+def curves(gen, segments=3, min_heat_rate=None):
+    # io_curves straight from the gen.csv columns, x as a fraction of PMax
+    output, hr_avg_0, hr_incr = heat_rates(gen, segments)
+    return io_curves(output, hr_avg_0, hr_incr, min_heat_rate)
+
+
+def fuel_cost(heat, fuel_price):
+    # heat input in BTU/kWh * MW -> $/h: 1000 kWh/MWh and 1e-6 MMBTU/BTU
+    return heat * np.asarray(fuel_price, dtype=float)[..., None] / 1000
+
+
+def cost_curves(gen, segments=3, min_heat_rate=None, fuel_price=None):
+    # (n_gen, n_points) MW and $/h points of the piecewise linear production cost. fuel_price
+    # overrides the gen.csv prices, e.g. for price sweeps that reuse the heat rate curves.
+    x, y = curves(gen, segments, min_heat_rate)
+    pmax = gen['PMax MW'].to_numpy(dtype=float)[:, None]
+    if fuel_price is None:
+        fuel_price = gen['Fuel Price $/MMBTU'].to_numpy(dtype=float)
+    return x * pmax, fuel_cost(y * pmax, fuel_price)
+
+
+def marginal_cost(heat_rate, fuel_price):
+    # BTU/kWh at $/MMBTU -> $/MWh
+    return fuel_price * (1 / 1e6) * heat_rate * (1e3)
@@ -0,0 +1,139 @@
+import argparse
+import importlib.util
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+
+from . import source_data
+
+try:
+    import resource
+except ImportError:
+    # not available on Windows, peak memory is then not reported
+    resource = None
+
+FORMATTED_DATA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _load(converter, filename):
+    # converter folders are not packages, their scripts import siblings by plain name
+    folder = os.path.join(FORMATTED_DATA_DIR, converter)
+    if folder not in sys.path:
+        sys.path.append(folder)
+    name = os.path.splitext(filename)[0]
+    spec = importlib.util.spec_from_file_location(name, os.path.join(folder, filename))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def export_matpower(output, folder):
+    _load('MATPOWER', 'cli.py').create(folder=folder, case=os.path.join(output, 'RTS_GMLC'))
+
+
+def export_prescient(output, folder):
+    _load('Prescient', 'topysp.py').export(output_dir=output, folder=folder)
+
+
+def export_pypsa(output, folder):
+    module = _load('pypsa', 'source_to_pypsa_csv.py')
+    module.write_pypsa_network_csvs(module.data_snapshots(folder=folder), unit_commitment=True, save_path=output,
+                                    folder=folder)
+
+
+def export_pandapower(output, folder):
+    _load('pandapower', 'source_data_to_pp.py').create_pp_from_ppc(folder, os.path.join(output, 'pandapower_net.json'),
+                                                                   plot=False)
+
+
+def export_opentepes(output, folder):
+    sys.path.append(os.path.join(FORMATTED_DATA_DIR, 'openTEPES'))
+    import Create_openTEPES_InputData as ID
+    os.makedirs(os.path.join(output, 'RTS-GMLC'), exist_ok=True)
+    # openTEPES reads SourceData and timeseries_data_files below the same data path
+    path_data = os.path.dirname(os.path.abspath(folder))
+    ID.GettingDataTo_oTDict(path_data, output, 'RTS-GMLC')
+    ID.GettingDataTo_oTData(path_data, output, 'RTS-GMLC')
+
+
+def export_gis(output, folder):
+    _load('GIS', 'csv2geojson.py').create_geojson(folder, output)
+
+
+CONVERTERS = {
+    'MATPOWER': export_matpower,
+    'Prescient': export_prescient,
+    'pypsa': export_pypsa,
+    'pandapower': export_pandapower,
+    'openTEPES': export_opentepes,
+    'GIS': export_gis,
+}
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return float('nan')
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024.0 * 1024.0 if sys.platform == 'darwin' else 1024.0)
+
+
+def _run(job):
+    name, output, folder = job
+    os.environ.setdefault('MPLBACKEND', 'Agg')
+    start = time.perf_counter()
+    try:
+        os.makedirs(output, exist_ok=True)
+        CONVERTERS[name](output, folder)
+        status = 'ok'
+    except BaseException:
+        status = 'failed: ' + traceback.format_exc().strip().splitlines()[-1]
+    return {'converter': name, 'status': status, 'seconds': time.perf_counter() - start,
+            'peak_rss_mb': _peak_rss_mb(), 'output': output}
+
+
+def export(converters, target, folder=None, processes=None):
+    # Runs every converter as its own job on a process pool. The SourceData tables are parsed
+    # once here and handed to the workers, and every worker process runs a single job so its
+    # peak RSS belongs to that converter alone.
+    folder = os.path.abspath(folder or source_data.SOURCE_DATA_DIR)
+    target = os.path.abspath(target)
+    unknown = [c for c in converters if c not in CONVERTERS]
+    if unknown:
+        raise ValueError('Unknown converters {}, expected some of {}'.format(unknown, ', '.join(CONVERTERS)))
+    snapshot = source_data.snapshot(folder)
+    jobs = [(name, os.path.join(target, name), folder) for name in converters]
+    pool = multiprocessing.Pool(processes or len(jobs), initializer=source_data.load_snapshot,
+                                initargs=(snapshot,), maxtasksperchild=1)
+    try:
+        results = []
+        for result in pool.imap_unordered(_run, jobs):
+            print('{converter:<12} {seconds:8.2f} s {peak_rss_mb:9.1f} MB  {status}'.format(**result))
+            results.append(result)
+    finally:
+        pool.close()
+        pool.join()
+    return sorted(results, key=lambda r: converters.index(r['converter']))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(prog='rts-export', description='Export the RTS-GMLC data to every format in parallel.')
+    parser.add_argument('converters', nargs='+', help='"all" or any of: {}'.format(', '.join(CONVERTERS)))
+    parser.add_argument('--target', dest='target', default='export', help='output folder, one subfolder per converter')
+    parser.add_argument('--folder', dest='folder', default=source_data.SOURCE_DATA_DIR, help='source data folder path')
+    parser.add_argument('--processes', dest='processes', type=int, default=None,
+                        help='worker processes (default: one per converter)')
+    args = parser.parse_args()
+
+    converters = list(CONVERTERS) if args.converters == ['all'] else args.converters
+    start = time.perf_counter()
+    results = export(converters, args.target, args.folder, args.processes)
+    print('{} converters in {:.2f} s'.format(len(results), time.perf_counter() - start))
+    if any(r['status'] != 'ok' for r in results):
+        for r in results:
+            if r['status'] != 'ok':
+                print('{converter}: {status}'.format(**r))
+        sys.exit(1)
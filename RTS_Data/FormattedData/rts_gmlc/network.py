@@ -0,0 +1,161 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse import linalg
+
+from . import source_data, timeseries
+
+NETWORK_DIR = os.environ.get('RTS_GMLC_NETWORK_CACHE', os.path.join(timeseries.RTS_DATA_DIR, '.cache', 'network'))
+NETWORK_VERSION = 1
+BASE_MVA = 100.0
+SPARSE = ('incidence', 'Bf', 'Bbus', 'Yf', 'Yt', 'Ybus')
+# PTDF and LODF are dense by nature, they are kept as arrays that open as memory maps
+DENSE = ('PTDF', 'LODF')
+
+
+def table_key(folder=None, slack=None):
+    # content hash of bus.csv and branch.csv, the only inputs of the matrices
+    digest = hashlib.sha256('{}:{}'.format(NETWORK_VERSION, slack).encode())
+    for table in ('bus', 'branch'):
+        digest.update(timeseries.file_hash(source_data.table_path(table, folder)).encode())
+    return digest.hexdigest()[:16]
+
+
+def _positions(bus_ids, buses):
+    index = np.argsort(bus_ids)
+    positions = index[np.searchsorted(bus_ids, buses, sorter=index)]
+    if not np.array_equal(bus_ids[positions], buses):
+        raise KeyError('Branches end at unknown buses {}'.format(sorted(set(buses) - set(bus_ids))))
+    return positions
+
+
+def build(bus, branch, slack=None):
+    # Sparse network matrices of the bus and branch tables in their row order, per unit on 100 MVA:
+    #   incidence (n_branch, n_bus) +1 at the from and -1 at the to bus
+    #   Bf, Bbus  DC flow and injection matrices (MATPOWER makeBdc, Tr Ratio as the tap)
+    #   Yf, Yt, Ybus  AC admittances from R, X, B and Tr Ratio plus the bus shunts (MATPOWER makeYbus)
+    #   PTDF (n_branch, n_bus) flow per injection withdrawn at the slack bus
+    #   LODF (n_branch, n_branch) flow change of every branch per flow of an outaged branch,
+    #        NaN for branches whose outage splits the network
+    bus_ids = bus['Bus ID'].to_numpy()
+    if slack is None:
+        slack = int(bus.loc[bus['Bus Type'] == 'Ref', 'Bus ID'].iloc[0])
+    n_bus, n_branch = len(bus), len(branch)
+    f = _positions(bus_ids, branch['From Bus'].to_numpy())
+    t = _positions(bus_ids, branch['To Bus'].to_numpy())
+    rows = np.arange(n_branch)
+    Cf = sparse.csr_matrix((np.ones(n_branch), (rows, f)), shape=(n_branch, n_bus))
+    Ct = sparse.csr_matrix((np.ones(n_branch), (rows, t)), shape=(n_branch, n_bus))
+    incidence = (Cf - Ct).tocsr()
+
+    r, x, b = (branch[c].to_numpy(dtype=float) for c in ('R', 'X', 'B'))
+    tap = branch['Tr Ratio'].to_numpy(dtype=float)
+    tap = np.where(tap == 0, 1.0, tap)
+    Bf = sparse.diags(1 / (x * tap)) @ incidence
+    Bbus = (incidence.T @ Bf).tocsc()
+
+    ys = 1 / (r + 1j * x)
+    ytt = ys + 0.5j * b
+    Yf = sparse.diags(ytt / tap ** 2) @ Cf - sparse.diags(ys / tap) @ Ct
+    Yt = sparse.diags(-ys / tap) @ Cf + sparse.diags(ytt) @ Ct
+    shunt = (bus['MW Shunt G'].to_numpy(dtype=float) + 1j * bus['MVAR Shunt B'].to_numpy(dtype=float)) / BASE_MVA
+    Ybus = (Cf.T @ Yf + Ct.T @ Yt + sparse.diags(shunt)).tocsr()
+
+    # one factorization of Bbus without the slack row and column gives every PTDF row at once
+    keep = np.flatnonzero(bus_ids != slack)
+    lu = linalg.splu(Bbus[keep][:, keep].tocsc())
+    PTDF = np.zeros((n_branch, n_bus))
+    PTDF[:, keep] = lu.solve(Bf[:, keep].T.toarray()).T
+
+    H = PTDF @ incidence.T.toarray()
+    h = np.diag(H).copy()
+    bridge = np.isclose(h, 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        LODF = H / (1 - h)
+    LODF[:, bridge] = np.nan
+    np.fill_diagonal(LODF, -1)
+    LODF[bridge, bridge] = np.nan
+
+    return {
+        'incidence': incidence, 'Bf': Bf.tocsr(), 'Bbus': Bbus.tocsr(), 'Yf': Yf.tocsr(), 'Yt': Yt.tocsr(),
+        'Ybus': Ybus, 'PTDF': PTDF, 'LODF': LODF,
+        'bus_ids': bus_ids, 'branch_uids': branch['UID'].to_numpy(dtype=str), 'slack': slack,
+    }
+
+
+def _save(network, target, meta):
+    tmp = '{}.tmp-{}'.format(target, os.getpid())
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    for name in SPARSE:
+        sparse.save_npz(os.path.join(tmp, name + '.npz'), network[name])
+    for name in DENSE:
+        np.save(os.path.join(tmp, name + '.npy'), network[name])
+    np.save(os.path.join(tmp, 'bus_ids.npy'), network['bus_ids'])
+    np.save(os.path.join(tmp, 'branch_uids.npy'), network['branch_uids'])
+    with open(os.path.join(tmp, 'meta.json'), 'w') as f:
+        json.dump(dict(meta, slack=network['slack']), f, indent=1)
+    shutil.rmtree(target, ignore_errors=True)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    try:
+        os.rename(tmp, target)
+    except OSError:
+        # another process saved the same network first
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def _load(target):
+    with open(os.path.join(target, 'meta.json')) as f:
+        meta = json.load(f)
+    network = {name: sparse.load_npz(os.path.join(target, name + '.npz')) for name in SPARSE}
+    for name in DENSE:
+        network[name] = np.load(os.path.join(target, name + '.npy'), mmap_mode='r')
+    network['bus_ids'] = np.load(os.path.join(target, 'bus_ids.npy'))
+    network['branch_uids'] = np.load(os.path.join(target, 'branch_uids.npy'))
+    network['slack'] = meta['slack']
+    return network
+
+
+def matrices(folder=None, slack=None, use_cache=True):
+    # The network matrices of build(), restored from NETWORK_DIR while bus.csv and branch.csv keep
+    # their content. Studies over the full year load them once instead of rebuilding the topology.
+    key = table_key(folder, slack)
+    target = os.path.join(NETWORK_DIR, key)
+    if use_cache and not os.environ.get('RTS_GMLC_NO_CACHE'):
+        try:
+            return _load(target)
+        except (OSError, ValueError, KeyError):
+            pass
+    network = build(source_data.bus(folder), source_data.branch(folder), slack)
+    _save(network, target, {'version': NETWORK_VERSION, 'key': key,
+                            'bus': source_data.table_path('bus', folder),
+                            'branch': source_data.table_path('branch', folder)})
+    return network
+
+
+def flows(network, injections):
+    # DC branch flows in MW for (..., n_bus) net injections in MW, balanced by the slack bus
+    return np.asarray(injections, dtype=float) @ np.asarray(network['PTDF']).T
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build and cache the RTS-GMLC network matrices.')
+    parser.add_argument('--folder', dest='folder', default=source_data.SOURCE_DATA_DIR, help='source data folder path')
+    parser.add_argument('--slack', dest='slack', type=int, default=None, help='slack bus (default: the Ref bus)')
+    parser.add_argument('--no-cache', dest='use_cache', action='store_false', help='rebuild even if cached')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    network = matrices(args.folder, args.slack, args.use_cache)
+    print('{} in {:.3f} s'.format(os.path.join(NETWORK_DIR, table_key(args.folder, args.slack)),
+                                   time.perf_counter() - start))
+    for name in SPARSE + DENSE:
+        matrix = network[name]
+        stored = matrix.nnz if sparse.issparse(matrix) else matrix.size
+        print('{:<10} {:>14} {:>10} stored values'.format(name, '{} x {}'.format(*matrix.shape), stored))
@@ -0,0 +1,94 @@
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+from . import source_data
+
+DATE_COLUMNS = ['Year', 'Month', 'Day', 'Period']
+SECONDS_PER_DAY = 86400
+SIMULATIONS = ('DAY_AHEAD', 'REAL_TIME')
+
+# keyed on (layout, resolution, calendar digest), holds the DatetimeIndex built for it
+_index_cache = {}
+
+
+def simulation_resolution(simulation='DAY_AHEAD', folder=None):
+    # Period_Resolution in simulation_objects.csv is in seconds (3600 for DAY_AHEAD, 300 for REAL_TIME)
+    objects = source_data.simulation_objects(folder).set_index('Simulation_Parameters')
+    if simulation not in objects.columns:
+        raise ValueError('Unknown simulation {!r}, expected one of {}'.format(simulation, ', '.join(SIMULATIONS)))
+    return int(objects.loc['Period_Resolution', simulation])
+
+
+def file_simulation(path):
+    # time series files are named after the simulation they feed, e.g. REAL_TIME_wind.csv
+    name = os.path.basename(path)
+    for simulation in SIMULATIONS:
+        if name.startswith(simulation + '_'):
+            return simulation
+    return None
+
+
+def file_resolution(path, periods_per_day=None, folder=None):
+    simulation = file_simulation(path)
+    if simulation is not None:
+        resolution = simulation_resolution(simulation, folder)
+        if periods_per_day is not None and periods_per_day * resolution != SECONDS_PER_DAY:
+            raise ValueError('{} has {} periods per day but {} periods are {} seconds long'.format(
+                path, periods_per_day, simulation, resolution))
+        return resolution
+    if periods_per_day is None:
+        raise ValueError('Cannot tell the period resolution of {}'.format(path))
+    return SECONDS_PER_DAY // periods_per_day
+
+
+def _as_calendar(calendar):
+    if isinstance(calendar, pd.DataFrame):
+        calendar = calendar[DATE_COLUMNS].to_numpy()
+    return np.ascontiguousarray(calendar, dtype=np.int32)
+
+
+def datetime_index(calendar, resolution=None, layout='period'):
+    # calendar holds Year, Month, Day, Period rows (periods count from 1), either as an
+    # (n, 4) array or a frame with those columns. Equal calendars share one cached index.
+    calendar = _as_calendar(calendar)
+    if resolution is None:
+        resolution = SECONDS_PER_DAY // int(calendar[:, 3].max())
+    key = (layout, int(resolution), hashlib.sha1(calendar.tobytes()).hexdigest())
+    index = _index_cache.get(key)
+    if index is None:
+        # days since the epoch straight from the calendar fields, then one offset per period
+        months = (calendar[:, 0].astype(np.int64) - 1970) * 12 + calendar[:, 1] - 1
+        days = months.astype('datetime64[M]').astype('datetime64[D]') + (calendar[:, 2] - 1).astype('timedelta64[D]')
+        stamps = days.astype('datetime64[ns]') + (calendar[:, 3].astype(np.int64) - 1) * np.timedelta64(int(resolution), 's')
+        index = pd.DatetimeIndex(stamps)
+        _index_cache[key] = index
+    return index
+
+
+def index_calendar(index, resolution):
+    # inverse of datetime_index, the Year, Month, Day, Period rows of a DatetimeIndex
+    stamps = np.asarray(index, dtype='datetime64[ns]')
+    days = stamps.astype('datetime64[D]')
+    months = days.astype('datetime64[M]')
+    years = months.astype('datetime64[Y]')
+    period = (stamps - days.astype('datetime64[ns]')) // np.timedelta64(int(resolution), 's') + 1
+    return np.column_stack([years.astype(np.int64) + 1970,
+                            (months - years.astype('datetime64[M]')).astype(np.int64) + 1,
+                            (days - months.astype('datetime64[D]')).astype(np.int64) + 1,
+                            period.astype(np.int64)]).astype(np.int32)
+
+
+def load_levels(calendar):
+    # openTEPES load levels are the zero padded month, day and period, e.g. 071201
+    # (three period digits at the 288 periods per day of REAL_TIME)
+    calendar = _as_calendar(calendar)
+    width = max(2, len(str(int(calendar[:, 3].max()))))
+    padded = [np.char.zfill(calendar[:, i].astype(str), n) for i, n in ((1, 2), (2, 2), (3, width))]
+    return np.char.add(np.char.add(padded[0], padded[1]), padded[2])
+
+
+def clear_cache():
+    _index_cache.clear()
@@ -0,0 +1,233 @@
+import argparse
+import os
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from . import source_data, timeseries
+from .periods import DATE_COLUMNS
+
+TOPOLOGIES = ('chain', 'ring')
+
+
+def read_tables(folder=None):
+    return {table: source_data.read_table(table, folder) for table in source_data.TABLES
+            if os.path.exists(source_data.table_path(table, folder))}
+
+
+def offsets(tables):
+    # Copy k adds k times these to the bus, area and zone numbers of the base system, e.g. bus 101
+    # of the third copy is 2101. Powers of ten keep the numbers of the base system readable.
+    bus = tables['bus']
+    return {
+        'bus': 10 ** len(str(int(bus['Bus ID'].max()))),
+        'area': int(bus['Area'].max()),
+        'zone': 10 ** len(str(int(bus['Zone'].max()))),
+    }
+
+
+def _copies(frame, copies):
+    # every row once per copy, copy after copy, and the copy number of each row
+    rows = np.tile(np.arange(len(frame)), copies)
+    return frame.iloc[rows].reset_index(drop=True), np.repeat(np.arange(copies), len(frame))
+
+
+def _suffix(names, copy):
+    # the base system keeps its names, copy k >= 1 appends _k
+    names = pd.Series(names).astype(str).reset_index(drop=True)
+    return names.where(copy == 0, names + '_' + pd.Series(copy).astype(str))
+
+
+def _gen_uid(uids, copy, step):
+    # unit names start with their bus number (101_CT_1), which moves with the bus
+    uids = pd.Series(uids).astype(str).reset_index(drop=True)
+    parts = uids.str.extract(r'^(\d+)(_.*)$')
+    numbered = parts[0].notna().to_numpy()
+    renamed = _suffix(uids, copy)
+    bus = parts[0][numbered].astype(np.int64) + copy[numbered] * step
+    renamed[numbered] = bus.astype(str) + parts[1][numbered]
+    return renamed
+
+
+def _regions(regions, copy, step):
+    # Eligible Regions hold one area (1) or a list of them ((1,2,3))
+    return pd.Series([re.sub(r'\d+', lambda m: str(int(m.group()) + k * step), r) for r, k in zip(regions, copy)])
+
+
+def _objects(pointers, copy, steps):
+    objects = pointers['Object'].astype(str).reset_index(drop=True)
+    category = pointers['Category'].to_numpy()
+    renamed = _suffix(objects, copy)
+    generator = category == 'Generator'
+    renamed[generator] = _gen_uid(objects[generator], copy[generator], steps['bus']).to_numpy()
+    area = category == 'Area'
+    renamed[area] = (objects[area].astype(np.int64) + copy[area] * steps['area']).astype(str)
+    return renamed
+
+
+def _ties(branch, copies, ties, topology, step):
+    # one tie per template branch between consecutive copies: from its From Bus in copy k to its
+    # To Bus in copy k + 1 (and from the last copy back to the first for a ring)
+    template = branch.set_index('UID').loc[list(ties)].reset_index()
+    pairs = [(k, k + 1) for k in range(copies - 1)]
+    if topology == 'ring' and copies > 2:
+        pairs.append((copies - 1, 0))
+    if not pairs or template.empty:
+        return branch.iloc[:0]
+    rows = np.tile(np.arange(len(template)), len(pairs))
+    first = np.repeat([a for a, _ in pairs], len(template))
+    second = np.repeat([b for _, b in pairs], len(template))
+    tie = template.iloc[rows].reset_index(drop=True)
+    tie['UID'] = tie['UID'] + '_' + pd.Series(first).astype(str) + '-' + pd.Series(second).astype(str)
+    tie['From Bus'] = tie['From Bus'].to_numpy() + first * step
+    tie['To Bus'] = tie['To Bus'].to_numpy() + second * step
+    return tie
+
+
+def replicate(tables, copies, ties=None, topology='chain'):
+    # Returns the SourceData tables of `copies` renumbered copies of the system in tables, joined
+    # by tie lines. ties lists the UIDs of the branches copied as ties between consecutive copies,
+    # by default the branches between areas of the base system. Every table is built with one row
+    # gather per table, so time and memory grow linearly with the number of copies.
+    if copies < 1:
+        raise ValueError('copies must be at least 1, got {}'.format(copies))
+    if topology not in TOPOLOGIES:
+        raise ValueError('Unknown topology {}, expected one of {}'.format(topology, ', '.join(TOPOLOGIES)))
+    steps = offsets(tables)
+    result = dict(tables)
+
+    bus, copy = _copies(tables['bus'], copies)
+    bus['Bus ID'] += copy * steps['bus']
+    bus['Bus Name'] = _suffix(bus['Bus Name'], copy)
+    bus['Area'] += copy * steps['area']
+    bus['Sub Area'] += copy * steps['zone']
+    bus['Zone'] += copy * steps['zone']
+    # the ties make one synchronous system, which keeps the single reference bus of the base system
+    bus.loc[(copy > 0) & (bus['Bus Type'] == 'Ref').to_numpy(), 'Bus Type'] = 'PV'
+    # copies sit next to each other on the map
+    span = tables['bus']['lng'].max() - tables['bus']['lng'].min()
+    bus['lng'] += copy * span * 1.1
+    result['bus'] = bus
+
+    gen, copy = _copies(tables['gen'], copies)
+    gen['GEN UID'] = _gen_uid(gen['GEN UID'], copy, steps['bus'])
+    gen['Bus ID'] += copy * steps['bus']
+    result['gen'] = gen
+
+    if ties is None:
+        base = tables['bus'].set_index('Bus ID')['Area']
+        branch = tables['branch']
+        ties = branch['UID'][(base.reindex(branch['From Bus']).to_numpy() != base.reindex(branch['To Bus']).to_numpy())]
+    for table in ('branch', 'dc_branch'):
+        if table not in tables:
+            continue
+        frame, copy = _copies(tables[table], copies)
+        frame['UID'] = _suffix(frame['UID'], copy)
+        frame['From Bus'] += copy * steps['bus']
+        frame['To Bus'] += copy * steps['bus']
+        if table == 'branch':
+            frame = pd.concat([frame, _ties(tables['branch'], copies, ties, topology, steps['bus'])], ignore_index=True)
+        result[table] = frame
+
+    if 'storage' in tables:
+        storage, copy = _copies(tables['storage'], copies)
+        storage['GEN UID'] = _gen_uid(storage['GEN UID'], copy, steps['bus'])
+        storage['Storage'] = _gen_uid(storage['Storage'], copy, steps['bus'])
+        result['storage'] = storage
+
+    if 'reserves' in tables:
+        reserves, copy = _copies(tables['reserves'], copies)
+        reserves['Reserve Product'] = _suffix(reserves['Reserve Product'], copy)
+        reserves['Eligible Regions'] = _regions(reserves['Eligible Regions'], copy, steps['area'])
+        result['reserves'] = reserves
+
+    if 'timeseries_pointers' in tables:
+        pointers, copy = _copies(tables['timeseries_pointers'], copies)
+        pointers['Object'] = _objects(pointers, copy, steps)
+        result['timeseries_pointers'] = pointers
+    return result
+
+
+def _replicate_series(path, target, copies, tables, steps):
+    # The data file with every object column once per copy, named like the copied object. The
+    # copies share their values, so every row is written as its date columns followed by the raw
+    # text of its values once per copy, nothing is parsed or formatted again.
+    with open(path) as f:
+        header = f.readline().rstrip('\n').split(',')
+        if header[:4] != DATE_COLUMNS or len(header) == 5:
+            # single series files (reserve requirements, CSP inflow) serve every copy of their object
+            with open(target, 'w') as out:
+                out.write(','.join(header) + '\n')
+                out.writelines(f)
+            return
+        body = f.read().splitlines()
+    names = np.array(header[4:], dtype=object)
+    # columns are areas or units, renamed like the pointer objects
+    area = np.isin(names, tables['bus']['Area'].astype(str).unique())
+    columns = list(header[:4])
+    for k in range(copies):
+        copy = np.full(len(names), k)
+        renamed = _gen_uid(names, copy, steps['bus'])
+        renamed[area] = (names[area].astype(np.int64) + k * steps['area']).astype(str)
+        columns.extend(renamed)
+    with open(target, 'w') as out:
+        out.write(','.join(columns) + '\n')
+        for line in body:
+            if line:
+                parts = line.split(',', 4)
+                out.write(','.join(parts[:4]) + (',' + parts[4]) * copies + '\n')
+
+
+def write(tables, target, source=None, copies=1, series=True):
+    # Writes target/SourceData/*.csv and, with series, target/timeseries_data_files holding every
+    # data file of the pointers with one column per copied object. The pointers keep their
+    # ../timeseries_data_files paths, so converters read the tree like the original RTS_Data.
+    folder = os.path.join(target, 'SourceData')
+    os.makedirs(folder, exist_ok=True)
+    for table, frame in tables.items():
+        frame.to_csv(source_data.table_path(table, folder), index=False)
+    if not series:
+        return
+    source = source or source_data.SOURCE_DATA_DIR
+    base = read_tables(source)
+    steps = offsets(base)
+    pointers = base['timeseries_pointers']
+    for path in sorted(set(pointers['Data File'])):
+        try:
+            full = timeseries.data_file(path, source)
+        except FileNotFoundError:
+            # REAL_TIME pointers without a file of their own fall back to the DAY_AHEAD one
+            continue
+        # keep the folder spelling of the pointer, the lookup ignores case where it has to
+        destination = os.path.normpath(os.path.join(folder, path))
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        _replicate_series(full, destination, copies, base, steps)
+
+
+def replicate_folder(target, copies, source=None, ties=None, topology='chain', series=True):
+    tables = replicate(read_tables(source), copies, ties, topology)
+    write(tables, target, source, copies, series)
+    return tables
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Write an RTS-GMLC data tree of N renumbered copies of the system '
+                                                 'joined by tie lines.')
+    parser.add_argument('copies', type=int, help='number of copies')
+    parser.add_argument('--target', dest='target', required=True,
+                        help='output folder, gets SourceData and timeseries_data_files subfolders')
+    parser.add_argument('--folder', dest='folder', default=source_data.SOURCE_DATA_DIR, help='source data folder path')
+    parser.add_argument('--ties', dest='ties', nargs='+', default=None,
+                        help='UIDs of the branches copied as ties between copies (default: the branches between areas)')
+    parser.add_argument('--topology', dest='topology', default='chain', choices=TOPOLOGIES,
+                        help='tie copy k to k + 1 (chain) and also the last one to the first (ring)')
+    parser.add_argument('--no-timeseries', dest='series', action='store_false',
+                        help='only write SourceData, for converters that do not read the time series')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    tables = replicate_folder(args.target, args.copies, args.folder, args.ties, args.topology, args.series)
+    print('{} copies: {} buses, {} generators, {} branches in {:.2f} s'.format(
+        args.copies, len(tables['bus']), len(tables['gen']), len(tables['branch']), time.perf_counter() - start))
@@ -0,0 +1,91 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from . import periods, timeseries
+from .periods import DATE_COLUMNS, SIMULATIONS
+
+
+def resample_index(index, from_resolution, to_resolution):
+    stamps = np.asarray(index, dtype='datetime64[ns]')
+    if to_resolution == from_resolution:
+        return pd.DatetimeIndex(stamps)
+    if to_resolution > from_resolution:
+        # one stamp per target period that has any data in it
+        bins = _bins(stamps, to_resolution)
+        return pd.DatetimeIndex(bins[_starts(bins)])
+    steps = np.arange(from_resolution // to_resolution) * np.timedelta64(int(to_resolution), 's')
+    return pd.DatetimeIndex((stamps[:, None] + steps).ravel())
+
+
+def _bins(stamps, resolution):
+    step = np.timedelta64(int(resolution), 's').astype('timedelta64[ns]').astype(np.int64)
+    return (stamps.astype(np.int64) // step * step).astype('datetime64[ns]')
+
+
+def _starts(bins):
+    return np.flatnonzero(np.r_[True, bins[1:] != bins[:-1]])
+
+
+def resample(values, index, from_resolution, to_resolution):
+    # Aggregating averages the periods inside each target period (RT -> DA), upsampling holds
+    # every value for all of its sub periods (DA -> RT). Works on the array without any frames.
+    values = np.asarray(values)
+    if to_resolution == from_resolution:
+        return values
+    if to_resolution > from_resolution:
+        if to_resolution % from_resolution:
+            raise ValueError('Cannot aggregate {} s periods into {} s periods'.format(from_resolution, to_resolution))
+        starts = _starts(_bins(np.asarray(index, dtype='datetime64[ns]'), to_resolution))
+        counts = np.diff(np.r_[starts, len(values)])
+        sums = np.add.reduceat(values.astype(np.float64), starts, axis=0)
+        return sums / (counts if values.ndim == 1 else counts[:, None])
+    if from_resolution % to_resolution:
+        raise ValueError('Cannot split {} s periods into {} s periods'.format(from_resolution, to_resolution))
+    return np.repeat(values, from_resolution // to_resolution, axis=0)
+
+
+def resample_frame(frame, to_resolution, from_resolution):
+    if to_resolution == from_resolution:
+        return frame
+    return pd.DataFrame(resample(frame.to_numpy(), frame.index, from_resolution, to_resolution),
+                        index=resample_index(frame.index, from_resolution, to_resolution),
+                        columns=frame.columns)
+
+
+def simulation_file(path, simulation):
+    # DAY_AHEAD_wind.csv <-> REAL_TIME_wind.csv in the same folder
+    current = periods.file_simulation(path)
+    if current is None or current == simulation:
+        return path
+    directory, name = os.path.split(path)
+    return os.path.join(directory, simulation + name[len(current):])
+
+
+def simulation_data_file(path, simulation, folder=None):
+    # The file holding the series of path for this simulation. Only some series ship a
+    # REAL_TIME file, the others are served from the other simulation's file and resampled.
+    candidates = [simulation_file(path, simulation)]
+    candidates += [simulation_file(path, other) for other in SIMULATIONS if other != simulation]
+    for candidate in candidates:
+        try:
+            return timeseries.data_file(candidate, folder)
+        except FileNotFoundError:
+            continue
+    raise FileNotFoundError('No {} time series file for {}'.format(simulation, path))
+
+
+def open_simulation(path, simulation, folder=None):
+    return timeseries.open_store(simulation_data_file(path, simulation, folder))
+
+
+def read_simulation(path, simulation, columns=None, folder=None, date_columns=False, start=None, end=None):
+    store = open_simulation(path, simulation, folder)
+    resolution = periods.simulation_resolution(simulation, folder)
+    frame = resample_frame(store.window(start, end, columns), resolution, store.resolution)
+    if not date_columns:
+        return frame
+    calendar = periods.index_calendar(frame.index, resolution).astype(np.int64)
+    dates = pd.DataFrame(calendar, columns=DATE_COLUMNS)
+    return pd.concat([dates, frame.reset_index(drop=True)], axis=1)
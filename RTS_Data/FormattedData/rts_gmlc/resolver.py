@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+
+from . import periods, resample, source_data
+
+
+def _select(pointers, simulation=None, parameter=None, category=None, objects=None):
+    mask = np.ones(len(pointers), dtype=bool)
+    for column, wanted in (('Simulation', simulation), ('Parameter', parameter),
+                           ('Category', category), ('Object', objects)):
+        if wanted is None:
+            continue
+        wanted = [wanted] if isinstance(wanted, str) else list(wanted)
+        mask &= pointers[column].isin(wanted).to_numpy()
+    return pointers.loc[mask]
+
+
+def pointer_column(store, obj):
+    # objects normally name their column, single series files (CSP inflow, reserve
+    # requirements) hold one column that serves the only pointer into them
+    if obj in store.columns:
+        return obj
+    if len(store.columns) == 1:
+        return store.columns[0]
+    raise KeyError('Pointer object {} has no column in {}'.format(obj, store.path))
+
+
+def _stack(stores, start, end, resolution):
+    # every file of one simulation is on the same calendar, so the blocks line up row by row
+    if any(store.resolution != resolution for store, _ in stores):
+        return None
+    indexes = [store.datetime_index()[store.rows(start, end)] for store, _ in stores]
+    index = indexes[0]
+    if any(len(other) != len(index) or not other.equals(index) for other in indexes[1:]):
+        return None
+    width = sum(len(positions) for _, positions in stores)
+    matrix = np.empty((len(index), width), dtype=np.float64)
+    offset = 0
+    for store, positions in stores:
+        # one gather per file straight out of the memory map
+        matrix[:, offset:offset + len(positions)] = store.values[store.rows(start, end)][:, positions]
+        offset += len(positions)
+    return index, matrix
+
+
+def resolve(pointers=None, simulation=None, parameter=None, category=None, objects=None,
+            per_unit=False, start=None, end=None, resolution=None, folder=None):
+    # Returns {(simulation, parameter): frame} with one column per pointer object.
+    # per_unit divides every column by its Scaling Factor. Series come at the resolution of
+    # their simulation unless another one (in seconds) is asked for.
+    if pointers is None:
+        pointers = source_data.timeseries_pointers(folder)
+    pointers = _select(pointers, simulation, parameter, category, objects)
+    series = {}
+    for key, group in pointers.groupby(['Simulation', 'Parameter'], sort=False):
+        stores, names, factors = [], [], []
+        # each data file is opened once and only the columns its pointers need are read
+        for data_file, file_group in group.groupby('Data File', sort=False):
+            store = resample.open_simulation(data_file, key[0], folder)
+            columns = {obj: pointer_column(store, obj) for obj in file_group['Object']}
+            order = sorted(columns, key=lambda obj: store.columns.index(columns[obj]))
+            stores.append((store, [store.columns.index(columns[obj]) for obj in order]))
+            names.extend(order)
+            factors.extend(file_group.set_index('Object').loc[order, 'Scaling Factor'])
+        target = resolution or periods.simulation_resolution(key[0], folder)
+        stacked = _stack(stores, start, end, target)
+        if stacked is None:
+            frame = pd.concat([resample.resample_frame(store.window(start, end, [store.columns[p] for p in positions]),
+                                                       target, store.resolution)
+                               for store, positions in stores], axis=1, join='outer')
+            frame.columns = names
+        else:
+            frame = pd.DataFrame(stacked[1], index=stacked[0], columns=names)
+        if per_unit:
+            frame = frame / np.asarray(factors, dtype=np.float64)
+        series[key] = frame
+    return series
+
+
+def data_files(pointers=None, simulation=None, parameter=None, category=None, objects=None, folder=None):
+    # the files resolve() reads for the same selection of pointers
+    if pointers is None:
+        pointers = source_data.timeseries_pointers(folder)
+    pointers = _select(pointers, simulation, parameter, category, objects)
+    files = pointers[['Simulation', 'Data File']].drop_duplicates()
+    return sorted(set(resample.simulation_data_file(path, sim, folder)
+                      for sim, path in zip(files['Simulation'], files['Data File'])))
+
+
+def series(simulation, parameter, category=None, objects=None, per_unit=False, start=None, end=None,
+           resolution=None, folder=None):
+    # e.g. series('DAY_AHEAD', 'PMax MW') for every day ahead generator limit in one frame
+    resolved = resolve(simulation=simulation, parameter=parameter, category=category, objects=objects,
+                       per_unit=per_unit, start=start, end=end, resolution=resolution, folder=folder)
+    if (simulation, parameter) not in resolved:
+        raise KeyError('No time series pointers for {} {}'.format(simulation, parameter))
+    return resolved[(simulation, parameter)]
@@ -0,0 +1,151 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# RTS_GMLC_SOURCE_DATA points every converter at another data tree, e.g. one written by rts_gmlc.replicate
+SOURCE_DATA_DIR = os.path.abspath(os.environ.get('RTS_GMLC_SOURCE_DATA',
+                                                 os.path.join(os.path.dirname(__file__), '..', '..', 'SourceData')))
+
+# NOTE: identifiers, names and categories are pinned so that every converter sees the same types.
+# Measurement columns keep the dtype pandas infers, since the writers format ints and floats differently.
+DTYPES = {
+    'bus': {
+        'Bus ID': 'int64',
+        'Bus Name': 'str',
+        'Bus Type': 'str',
+        'Area': 'int64',
+    },
+    'gen': {
+        'GEN UID': 'str',
+        'Bus ID': 'int64',
+        'Gen ID': 'int64',
+        'Unit Group': 'str',
+        'Unit Type': 'str',
+        'Category': 'str',
+        'Fuel': 'str',
+    },
+    'branch': {
+        'UID': 'str',
+        'From Bus': 'int64',
+        'To Bus': 'int64',
+    },
+    'dc_branch': {
+        'UID': 'str',
+        'From Bus': 'int64',
+        'To Bus': 'int64',
+        'Control Mode': 'str',
+        'Metered end': 'str',
+    },
+    'storage': {
+        'GEN UID': 'str',
+        'Storage': 'str',
+        'position': 'str',
+    },
+    'reserves': {
+        'Reserve Product': 'str',
+        'Eligible Regions': 'str',
+        'Eligible Device Categories': 'str',
+        'Eligible Device SubCategories': 'str',
+        'Direction': 'str',
+    },
+    'timeseries_pointers': {
+        'Simulation': 'str',
+        'Category': 'str',
+        'Object': 'str',
+        'Parameter': 'str',
+        'Scaling Factor': 'float64',
+        'Data File': 'str',
+    },
+    'simulation_objects': {
+        'Simulation_Parameters': 'str',
+        'Description': 'str',
+        'DAY_AHEAD': 'str',
+        'REAL_TIME': 'str',
+    },
+}
+
+TABLES = tuple(DTYPES)
+
+# keyed on absolute file path, holds (mtime_ns, size, parsed frame)
+_cache = {}
+
+
+def _read_only(frame):
+    # The cached parse is shared by every caller, who each get a shallow copy of it. Its numpy
+    # blocks are made read-only (pandas has no public handle on them), so adding or replacing
+    # columns only touches the caller's copy while writing into the shared values
+    # (df.loc[mask, col] = ..., inplace fills) raises instead of corrupting the cache.
+    # Take a .copy() of a table before modifying its values in place.
+    for values in frame._mgr.arrays:
+        if isinstance(values, np.ndarray):
+            values.flags.writeable = False
+    return frame
+
+
+def table_path(table, folder=None):
+    return os.path.abspath(os.path.join(folder or SOURCE_DATA_DIR, table + '.csv'))
+
+
+def read_table(table, folder=None):
+    if table not in DTYPES:
+        raise ValueError('Unknown SourceData table {!r}, expected one of {}'.format(table, ', '.join(TABLES)))
+    path = table_path(table, folder)
+    stat = os.stat(path)
+    cached = _cache.get(path)
+    if cached is None or cached[0] != stat.st_mtime_ns or cached[1] != stat.st_size:
+        frame = _read_only(pd.read_csv(path, dtype=DTYPES[table]))
+        cached = (stat.st_mtime_ns, stat.st_size, frame)
+        _cache[path] = cached
+    return cached[2].copy(deep=False)
+
+
+def clear_cache():
+    _cache.clear()
+
+
+def snapshot(folder=None):
+    # every SourceData table parsed once, handed to worker processes so they skip the parsing
+    for table in TABLES:
+        if os.path.exists(table_path(table, folder)):
+            read_table(table, folder)
+    return dict(_cache)
+
+
+def load_snapshot(snapshot):
+    # entries are still checked against the file mtime and size before they are used,
+    # and pickling them to the worker made their arrays writeable again
+    for path, (mtime_ns, size, frame) in snapshot.items():
+        _cache[path] = (mtime_ns, size, _read_only(frame))
+
+
+def bus(folder=None):
+    return read_table('bus', folder)
+
+
+def gen(folder=None):
+    return read_table('gen', folder)
+
+
+def branch(folder=None):
+    return read_table('branch', folder)
+
+
+def dc_branch(folder=None):
+    return read_table('dc_branch', folder)
+
+
+def storage(folder=None):
+    return read_table('storage', folder)
+
+
+def reserves(folder=None):
+    return read_table('reserves', folder)
+
+
+def timeseries_pointers(folder=None):
+    return read_table('timeseries_pointers', folder)
+
+
+def simulation_objects(folder=None):
+    return read_table('simulation_objects', folder)
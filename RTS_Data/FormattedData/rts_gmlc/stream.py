@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+from . import resample, timeseries
+from .periods import SECONDS_PER_DAY
+
+
+def _span(stores):
+    first = min(store.index[0] for store in stores)
+    last = max(store.index[-1] + np.timedelta64(int(store.resolution), 's') for store in stores)
+    return pd.Timestamp(first), pd.Timestamp(last)
+
+
+def blocks(paths, block=SECONDS_PER_DAY, start=None, end=None, columns=None, resolution=None, folder=None):
+    # Yields (block start, frame) for consecutive [t, t + block seconds) windows of several
+    # aligned series, e.g. blocks([...REAL_TIME_regional_Spin_Up_R1.csv, ...REAL_TIME_wind.csv]).
+    # Every block is sliced out of the memory-mapped stores on its own, so only one block of
+    # each series is held at a time. columns maps a path to the columns wanted from it and
+    # series at another resolution are resampled block by block.
+    stores = [(path, timeseries.open_store(path, folder)) for path in paths]
+    columns = columns or {}
+    resolution = resolution or min(store.resolution for _, store in stores)
+    if block % resolution:
+        raise ValueError('Blocks of {} s do not hold whole {} s periods'.format(block, resolution))
+    selected = [(store, [store.columns.index(c) for c in columns.get(path, store.columns)]) for path, store in stores]
+    names = [store.columns[p] for store, positions in selected for p in positions]
+    duplicated = sorted(set(name for name in names if names.count(name) > 1))
+    if duplicated:
+        raise ValueError('Series {} appear in more than one file'.format(duplicated))
+    first, last = _span([store for _, store in stores])
+    start = first if start is None else pd.Timestamp(start)
+    end = last if end is None else pd.Timestamp(end)
+    step = pd.Timedelta(seconds=block)
+    while start < end:
+        stop = min(start + step, end)
+        index, parts = None, []
+        for store, positions in selected:
+            rows = store.rows(start, stop)
+            values = store.values[rows][:, positions]
+            if store.resolution != resolution:
+                values = resample.resample(values, store.index[rows], store.resolution, resolution)
+            elif index is None:
+                index = store.datetime_index()[rows]
+            parts.append(values)
+        if index is None:
+            store = selected[0][0]
+            index = resample.resample_index(store.index[store.rows(start, stop)], store.resolution, resolution)
+        if any(len(part) != len(index) for part in parts):
+            raise ValueError('Series are not aligned in the block starting {}'.format(start))
+        yield start, pd.DataFrame(np.hstack(parts), index=index, columns=names)
+        start = stop
+
+
+def days(paths, start=None, end=None, columns=None, resolution=None, folder=None):
+    return blocks(paths, SECONDS_PER_DAY, start, end, columns, resolution, folder)
@@ -0,0 +1,47 @@
+import os, sys
+
+path_file = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(path_file, '..', '..'))
+from rts_gmlc import build_cache
+
+
+def _build(tmp_path, output, create, **kwargs):
+    source = tmp_path / 'input.csv'
+    if not source.exists():
+        source.write_text('a,b\n1,2\n')
+    return build_cache.build('test', create, inputs=[str(source)], output_dir=str(output), **kwargs)
+
+
+def test_only_written_files_are_cached(tmp_path, monkeypatch):
+    monkeypatch.setattr(build_cache, 'CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.delenv('RTS_GMLC_NO_CACHE', raising=False)
+    first = tmp_path / 'first'
+    first.mkdir()
+    # left over from something else, and matching what a pattern like generators*.csv would catch
+    (first / 'generators-old.csv').write_text('stale')
+
+    def create():
+        (first / 'generators.csv').write_text('new')
+        return ['generators.csv']
+    assert not _build(tmp_path, first, create, patterns=None)
+
+    second = tmp_path / 'second'
+    assert _build(tmp_path, second, lambda: None, patterns=None)
+    assert sorted(os.listdir(second)) == ['generators.csv']
+    assert (second / 'generators.csv').read_text() == 'new'
+
+
+def test_patterns_pick_the_outputs(tmp_path, monkeypatch):
+    monkeypatch.setattr(build_cache, 'CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.delenv('RTS_GMLC_NO_CACHE', raising=False)
+    first = tmp_path / 'first'
+    first.mkdir()
+
+    def create():
+        (first / 'case.m').write_text('mpc')
+        (first / 'notes.txt').write_text('log')
+    assert not _build(tmp_path, first, create, patterns=['*.m'])
+
+    second = tmp_path / 'second'
+    assert _build(tmp_path, second, create, patterns=['*.m'])
+    assert os.listdir(second) == ['case.m']
@@ -0,0 +1,57 @@
+import os, sys
+import numpy as np
+import pandas as pd
+
+path_file = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(path_file, '..', '..'))
+from rts_gmlc import cost_curves, source_data
+
+source_folder = os.path.join(path_file, '..', '..', '..', 'SourceData')
+THERMAL_FUELS = ('Oil', 'Coal', 'NG', 'Nuclear')
+
+
+def _point_by_point(row):
+    # the per generator loop the converters ran before: MW points and $/h costs
+    x = [row['Output_pct_%d' % i] * row['PMax MW'] for i in range(4)]
+    y = [row['Fuel Price $/MMBTU'] * x[0] * row['HR_avg_0'] / 1000]
+    for i in range(1, 4):
+        y.append(row['Fuel Price $/MMBTU'] * (x[i] - x[i - 1]) * row['HR_incr_%d' % i] / 1000 + y[-1])
+    return x, y
+
+
+def test_thermal_costs_match_point_by_point_curves():
+    gen = source_data.gen(source_folder)
+    gen = gen[gen['Fuel'].isin(THERMAL_FUELS)].reset_index(drop=True)
+    x, y = cost_curves.cost_curves(gen)
+    assert x.shape == y.shape == (len(gen), 4)
+    for i, row in gen.iterrows():
+        expected_x, expected_y = _point_by_point(row)
+        np.testing.assert_allclose(x[i], expected_x)
+        np.testing.assert_allclose(y[i], expected_y)
+
+
+def test_fourth_segment_where_given():
+    gen = pd.DataFrame({
+        'PMax MW': [100.0, 100.0], 'Fuel Price $/MMBTU': [2.0, 2.0], 'HR_avg_0': [10000.0, 10000.0],
+        'Output_pct_0': [0.2, 0.2], 'Output_pct_1': [0.4, 0.4], 'Output_pct_2': [0.6, 0.6],
+        'Output_pct_3': [0.8, 1.0], 'Output_pct_4': [1.0, np.nan],
+        'HR_incr_1': [8000.0, 8000.0], 'HR_incr_2': [9000.0, 9000.0], 'HR_incr_3': [10000.0, 10000.0],
+        'HR_incr_4': [11000.0, np.nan],
+    })
+    x, y = cost_curves.cost_curves(gen, segments=4)
+    np.testing.assert_allclose(x, [[20, 40, 60, 80, 100], [20, 40, 60, 100, 100]])
+    # units without the fourth segment repeat their last point
+    np.testing.assert_allclose(y[:, -1] - y[:, -2], [2.0 * 20 * 11000 / 1000, 0.0])
+    np.testing.assert_allclose(cost_curves.cost_curves(gen, segments=3)[1], y[:, :4])
+
+
+def test_fuel_price_sweep_reuses_the_curves():
+    gen = source_data.gen(source_folder)
+    _, y = cost_curves.cost_curves(gen)
+    _, doubled = cost_curves.cost_curves(gen, fuel_price=2 * gen['Fuel Price $/MMBTU'].to_numpy())
+    np.testing.assert_allclose(doubled, 2 * y)
+
+
+def test_heat_rates_below_the_minimum_are_raised():
+    _, y = cost_curves.io_curves([[0.5, 1.0]], [1000.0], [[0.0]], min_heat_rate=cost_curves.MIN_HEAT_RATE)
+    np.testing.assert_allclose(y[0], [0.5 * cost_curves.MIN_HEAT_RATE] * 2)
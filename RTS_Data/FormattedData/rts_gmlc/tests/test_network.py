@@ -0,0 +1,54 @@
+import os, sys
+import numpy as np
+
+path_file = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(path_file, '..', '..'))
+sys.path.append(os.path.join(path_file, '..', '..', 'MATPOWER'))
+from rts_gmlc import network
+from script import create_mpc
+import dcpf
+
+source_folder = os.path.join(path_file, '..', '..', '..', 'SourceData')
+
+
+def _injections(mpc, dispatch):
+    # MW net injections per bus of a solved dispatch
+    index = {int(b): i for i, b in enumerate(mpc['bus'][:, dcpf.BUS_I])}
+    injections = -mpc['bus'][:, dcpf.PD] - mpc['bus'][:, dcpf.GS]
+    online = mpc['gen'][:, dcpf.GEN_STATUS] > 0
+    np.add.at(injections, [index[int(b)] for b in mpc['gen'][online, dcpf.GEN_BUS]], dispatch[online])
+    return injections
+
+
+def test_ptdf_flows_match_the_dc_power_flow():
+    net = network.matrices(source_folder, use_cache=False)
+    mpc = create_mpc(source_folder)
+    _, flows, dispatch = dcpf.solve(mpc)
+    np.testing.assert_allclose(network.flows(net, _injections(mpc, dispatch[0])), flows[0], atol=1e-6)
+
+
+def test_lodf_predicts_an_outage():
+    net = network.matrices(source_folder, use_cache=False)
+    mpc = create_mpc(source_folder)
+    _, flows, dispatch = dcpf.solve(mpc)
+    # the first branch whose outage keeps the network connected
+    outage = int(np.flatnonzero(~np.isnan(net['LODF']).any(axis=0))[0])
+    after = dict(mpc, branch=mpc['branch'].copy())
+    after['branch'][outage, dcpf.BR_STATUS] = 0
+    _, expected, _ = dcpf.solve(after)
+    predicted = flows[0] + net['LODF'][:, outage] * flows[0, outage]
+    predicted[outage] = 0
+    np.testing.assert_allclose(predicted, expected[0], atol=1e-6)
+
+
+def test_matrices_are_restored_from_the_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(network, 'NETWORK_DIR', str(tmp_path))
+    monkeypatch.delenv('RTS_GMLC_NO_CACHE', raising=False)
+    built = network.matrices(source_folder)
+    assert os.listdir(str(tmp_path)) == [network.table_key(source_folder)]
+    restored = network.matrices(source_folder)
+    for name in network.SPARSE:
+        assert (built[name] != restored[name]).nnz == 0
+    for name in network.DENSE:
+        np.testing.assert_array_equal(np.asarray(restored[name]), built[name])
+    assert restored['slack'] == built['slack']
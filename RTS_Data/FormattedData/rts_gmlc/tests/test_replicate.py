@@ -0,0 +1,63 @@
+import os, sys
+import numpy as np
+
+path_file = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(path_file, '..', '..'))
+from rts_gmlc import replicate
+
+source_folder = os.path.join(path_file, '..', '..', '..', 'SourceData')
+COPIES = 3
+
+
+def _base():
+    return replicate.read_tables(source_folder)
+
+
+def test_buses_and_areas_are_renumbered():
+    base = _base()
+    steps = replicate.offsets(base)
+    assert steps['bus'] == 1000 and steps['area'] == 3
+    tables = replicate.replicate(base, COPIES)
+    bus = tables['bus']
+    n = len(base['bus'])
+    assert len(bus) == COPIES * n
+    assert bus['Bus ID'].is_unique
+    for k in range(COPIES):
+        copy = bus.iloc[k * n:(k + 1) * n]
+        np.testing.assert_array_equal(copy['Bus ID'], base['bus']['Bus ID'] + 1000 * k)
+        np.testing.assert_array_equal(copy['Area'], base['bus']['Area'] + 3 * k)
+    # the copies share the reference bus of the base system
+    assert (bus['Bus Type'] == 'Ref').sum() == (base['bus']['Bus Type'] == 'Ref').sum()
+    # every unit moves with its bus
+    assert set(tables['gen']['Bus ID']) <= set(bus['Bus ID'])
+    assert (tables['gen']['GEN UID'].str.split('_').str[0].astype(int) == tables['gen']['Bus ID']).all()
+
+
+def test_dc_lines_are_renumbered():
+    base = _base()
+    tables = replicate.replicate(base, COPIES)
+    dc_branch = tables['dc_branch']
+    n = len(base['dc_branch'])
+    assert len(dc_branch) == COPIES * n
+    for k in range(COPIES):
+        copy = dc_branch.iloc[k * n:(k + 1) * n]
+        np.testing.assert_array_equal(copy['From Bus'], base['dc_branch']['From Bus'] + 1000 * k)
+        np.testing.assert_array_equal(copy['To Bus'], base['dc_branch']['To Bus'] + 1000 * k)
+    assert dc_branch['UID'].is_unique
+
+
+def test_ties_join_consecutive_copies():
+    base = _base()
+    n = len(base['branch'])
+    area = base['bus'].set_index('Bus ID')['Area']
+    inter_area = (area.reindex(base['branch']['From Bus']).to_numpy()
+                  != area.reindex(base['branch']['To Bus']).to_numpy()).sum()
+
+    chain = replicate.replicate(base, COPIES)['branch']
+    ties = chain.iloc[COPIES * n:]
+    assert len(ties) == (COPIES - 1) * inter_area
+    assert ((ties['To Bus'] // 1000) - (ties['From Bus'] // 1000) == 1).all()
+    assert set(chain['From Bus']) | set(chain['To Bus']) <= set(replicate.replicate(base, COPIES)['bus']['Bus ID'])
+
+    ring = replicate.replicate(base, COPIES, topology='ring')['branch']
+    assert len(ring) - COPIES * n == COPIES * inter_area
@@ -0,0 +1,50 @@
+import os, sys
+import numpy as np
+import pandas as pd
+
+path_file = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(path_file, '..', '..'))
+from rts_gmlc import resample
+
+DAY_AHEAD, REAL_TIME = 3600, 300
+
+
+def test_day_ahead_real_time_round_trip():
+    index = pd.date_range('2020-07-01', periods=48, freq='h')
+    values = np.random.default_rng(0).uniform(0, 100, (len(index), 3))
+
+    real_time = resample.resample(values, index, DAY_AHEAD, REAL_TIME)
+    real_time_index = resample.resample_index(index, DAY_AHEAD, REAL_TIME)
+    assert real_time.shape == (len(index) * 12, 3)
+    assert len(real_time_index) == len(real_time)
+    assert real_time_index[1] - real_time_index[0] == pd.Timedelta(minutes=5)
+
+    day_ahead = resample.resample(real_time, real_time_index, REAL_TIME, DAY_AHEAD)
+    np.testing.assert_allclose(day_ahead, values)
+    assert resample.resample_index(real_time_index, REAL_TIME, DAY_AHEAD).equals(index)
+
+
+def test_real_time_averages_into_day_ahead():
+    index = pd.date_range('2020-07-01', periods=24, freq='5min')
+    frame = pd.DataFrame({'1': np.arange(24.0)}, index=index)
+    hourly = resample.resample_frame(frame, DAY_AHEAD, REAL_TIME)
+    assert list(hourly.index) == list(pd.date_range('2020-07-01', periods=2, freq='h'))
+    np.testing.assert_allclose(hourly['1'], [5.5, 17.5])
+
+
+def test_read_simulation_uses_the_folder_resolution(tmp_path, monkeypatch):
+    # a SourceData folder with 15 minute REAL_TIME periods, and a series that only has a DAY_AHEAD file
+    monkeypatch.setattr(resample.timeseries, 'STORE_DIR', str(tmp_path / 'store'))
+    folder = tmp_path / 'SourceData'
+    folder.mkdir()
+    objects = pd.read_csv(os.path.join(path_file, '..', '..', '..', 'SourceData', 'simulation_objects.csv'))
+    objects.loc[objects['Simulation_Parameters'] == 'Period_Resolution', 'REAL_TIME'] = '900'
+    objects.to_csv(folder / 'simulation_objects.csv', index=False)
+    path = str(tmp_path / 'DAY_AHEAD_series.csv')
+    pd.DataFrame({'Year': 2020, 'Month': 7, 'Day': 12, 'Period': np.arange(1, 25), 'a': np.arange(24.)}).to_csv(
+        path, index=False)
+
+    frame = resample.read_simulation(path, 'REAL_TIME', folder=str(folder))
+    assert len(frame) == 24 * 4
+    assert frame.index[1] - frame.index[0] == pd.Timedelta(minutes=15)
+    np.testing.assert_array_equal(frame['a'].to_numpy()[:8], [0, 0, 0, 0, 1, 1, 1, 1])
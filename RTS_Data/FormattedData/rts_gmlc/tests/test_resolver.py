@@ -0,0 +1,39 @@
+import os, sys
+import numpy as np
+import pandas as pd
+
+path_file = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(path_file, '..', '..'))
+from rts_gmlc import resolver, source_data, timeseries
+
+source_folder = os.path.join(path_file, '..', '..', '..', 'SourceData')
+
+
+def _pointers(simulation, parameter):
+    pointers = source_data.timeseries_pointers(source_folder)
+    return pointers[(pointers['Simulation'] == simulation) & (pointers['Parameter'] == parameter)]
+
+
+def test_every_pointer_is_its_data_file_column():
+    frame = resolver.series('DAY_AHEAD', 'PMax MW', start='2020-07-12', end='2020-07-13', folder=source_folder)
+    pointers = _pointers('DAY_AHEAD', 'PMax MW')
+    assert sorted(frame.columns) == sorted(pointers['Object'])
+    assert len(frame) == 24
+    for obj, data_file in zip(pointers['Object'], pointers['Data File']):
+        store = timeseries.open_store(data_file, source_folder)
+        expected = store.window('2020-07-12', '2020-07-13', [resolver.pointer_column(store, obj)]).iloc[:, 0]
+        np.testing.assert_array_equal(frame[obj].to_numpy(), expected.to_numpy())
+
+
+def test_per_unit_divides_by_scaling_factor():
+    pointers = _pointers('DAY_AHEAD', 'MW Load').set_index('Object')
+    absolute = resolver.series('DAY_AHEAD', 'MW Load', category='Area', end='2020-01-02', folder=source_folder)
+    relative = resolver.series('DAY_AHEAD', 'MW Load', category='Area', end='2020-01-02', per_unit=True,
+                               folder=source_folder)
+    factors = pointers.loc[absolute.columns, 'Scaling Factor'].to_numpy(dtype=float)
+    np.testing.assert_allclose(relative.to_numpy() * factors, absolute.to_numpy())
+
+
+def test_pointers_share_data_files():
+    files = resolver.data_files(simulation='DAY_AHEAD', parameter='PMax MW', folder=source_folder)
+    assert len(files) == len(set(files)) < len(_pointers('DAY_AHEAD', 'PMax MW'))
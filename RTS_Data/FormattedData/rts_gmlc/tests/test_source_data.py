@@ -0,0 +1,36 @@
+import os, sys, pickle
+import pytest
+
+path_file = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(path_file, '..', '..'))
+from rts_gmlc import source_data
+
+source_folder = os.path.join(path_file, '..', '..', '..', 'SourceData')
+
+
+def test_callers_cannot_change_the_cached_table():
+    gen = source_data.gen(source_folder)
+    pmax = gen['PMax MW'].sum()
+    # new and replaced columns stay with the caller
+    gen['PMax MW'] = gen['PMax MW'] * 2
+    gen['scaled'] = True
+    # writes into the shared values are refused
+    with pytest.raises(ValueError):
+        gen.loc[gen['Fuel'] == 'Oil', 'Min Down Time Hr'] = 0
+    again = source_data.gen(source_folder)
+    assert again['PMax MW'].sum() == pmax
+    assert 'scaled' not in again.columns
+    # a private copy is free to change
+    private = again.copy()
+    private.loc[private['Fuel'] == 'Oil', 'Min Down Time Hr'] = 0
+    assert source_data.gen(source_folder)['Min Down Time Hr'].equals(again['Min Down Time Hr'])
+    assert not private['Min Down Time Hr'].equals(again['Min Down Time Hr'])
+
+
+def test_snapshot_stays_read_only_in_workers():
+    snapshot = pickle.loads(pickle.dumps(source_data.snapshot(source_folder)))
+    source_data.clear_cache()
+    source_data.load_snapshot(snapshot)
+    bus = source_data.bus(source_folder)
+    with pytest.raises(ValueError):
+        bus.loc[0, 'Area'] = 4
@@ -0,0 +1,38 @@
+import os, sys
+import numpy as np
+import pandas as pd
+import pytest
+
+path_file = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(path_file, '..', '..'))
+from rts_gmlc import stream, timeseries
+
+data_dir = os.path.join(path_file, '..', '..', '..', 'timeseries_data_files')
+spin_file = os.path.join(data_dir, 'Reserves', 'REAL_TIME_regional_Spin_Up_R1.csv')
+wind_file = os.path.join(data_dir, 'WIND', 'REAL_TIME_wind.csv')
+hourly_wind_file = os.path.join(data_dir, 'WIND', 'DAY_AHEAD_wind.csv')
+
+
+def test_days_add_up_to_the_window():
+    blocks = list(stream.days([spin_file, wind_file], '2020-07-12', '2020-07-15'))
+    assert [start for start, _ in blocks] == list(pd.date_range('2020-07-12', periods=3, freq='D'))
+    assert all(len(block) == 288 for _, block in blocks)
+    joined = pd.concat([block for _, block in blocks])
+    expected = pd.concat([timeseries.read_window(spin_file, '2020-07-12', '2020-07-15'),
+                          timeseries.read_window(wind_file, '2020-07-12', '2020-07-15')], axis=1)
+    assert joined.index.equals(expected.index)
+    np.testing.assert_array_equal(joined.to_numpy(), expected.to_numpy())
+
+
+def test_blocks_resample_other_resolutions():
+    # the hourly file is held for all 5 minute periods of every hour
+    _, block = next(stream.blocks([spin_file, hourly_wind_file], 6 * 3600, '2020-07-12',
+                                  columns={hourly_wind_file: ['309_WIND_1']}))
+    hourly = timeseries.read_window(hourly_wind_file, '2020-07-12', '2020-07-12 06:00', ['309_WIND_1'])
+    assert len(block) == 72
+    np.testing.assert_array_equal(block['309_WIND_1'].to_numpy(), np.repeat(hourly['309_WIND_1'].to_numpy(), 12))
+
+
+def test_blocks_of_partial_periods():
+    with pytest.raises(ValueError):
+        next(stream.blocks([spin_file], 450))
@@ -0,0 +1,71 @@
+import os, sys
+import numpy as np
+import pandas as pd
+import pytest
+
+path_file = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(os.path.join(path_file, '..', '..'))
+from rts_gmlc import timeseries
+
+source_folder = os.path.join(path_file, '..', '..', '..', 'SourceData')
+
+pv_file = os.path.join(path_file, '..', '..', '..', 'timeseries_data_files', 'PV', 'DAY_AHEAD_pv.csv')
+load_file = os.path.join(path_file, '..', '..', '..', 'timeseries_data_files', 'Load', 'DAY_AHEAD_regional_Load.csv')
+
+
+def _read_csv(path, start, end):
+    # the full year through pandas, hour ending periods as hour starting timestamps
+    frame = pd.read_csv(path)
+    index = (pd.to_datetime(frame[['Year', 'Month', 'Day']])
+             + pd.to_timedelta(frame['Period'] - 1, unit='h'))
+    frame.index = pd.DatetimeIndex(index)
+    return frame.drop(columns=['Year', 'Month', 'Day', 'Period'])[start:pd.Timestamp(end) - pd.Timedelta(seconds=1)]
+
+
+def test_window_matches_full_read():
+    expected = _read_csv(pv_file, '2020-07-12', '2020-07-14')
+    window = timeseries.read_window(pv_file, '2020-07-12', '2020-07-14', ['314_PV_1', '320_PV_1'])
+    assert len(window) == 48
+    assert window.index.equals(expected.index)
+    np.testing.assert_array_equal(window.to_numpy(), expected[['314_PV_1', '320_PV_1']].to_numpy())
+
+
+def test_windows_of_several_files():
+    windows = timeseries.read_windows({'pv': (pv_file, '314_PV_1'), 'area': (load_file, '2')},
+                                      '2020-12-31', '2021-01-02')
+    # the window ends with the data at the end of the year
+    assert len(windows['pv']) == len(windows['area']) == 24
+    np.testing.assert_array_equal(windows['area'].to_numpy(), _read_csv(load_file, '2020-12-31', '2021-01-02')['2'])
+
+
+def test_empty_window():
+    rows = timeseries.open_store(pv_file).rows('2020-07-12', '2020-07-12')
+    assert rows.start == rows.stop
+    assert timeseries.read_window(pv_file, '2021-03-01', '2021-04-01').empty
+
+
+def _half_hourly_tree(tmp_path):
+    # a SourceData folder whose DAY_AHEAD periods are 30 minutes long, with one day of data
+    folder = tmp_path / 'SourceData'
+    folder.mkdir()
+    objects = pd.read_csv(os.path.join(source_folder, 'simulation_objects.csv'))
+    objects.loc[objects['Simulation_Parameters'] == 'Period_Resolution', 'DAY_AHEAD'] = '1800'
+    objects.to_csv(folder / 'simulation_objects.csv', index=False)
+    data = pd.DataFrame({'Year': 2020, 'Month': 7, 'Day': 12, 'Period': np.arange(1, 49), 'a': np.arange(48.)})
+    path = str(tmp_path / 'DAY_AHEAD_half_hourly.csv')
+    data.to_csv(path, index=False)
+    return str(folder), path
+
+
+def test_store_resolution_from_its_folder(tmp_path, monkeypatch):
+    monkeypatch.setattr(timeseries, 'STORE_DIR', str(tmp_path / 'store'))
+    folder, path = _half_hourly_tree(tmp_path)
+    store = timeseries.open_store(path, folder)
+    assert store.resolution == 1800
+    assert store.datetime_index()[1] - store.datetime_index()[0] == pd.Timedelta(minutes=30)
+    # opened again, the compiled store is still fresh against the same folder
+    timeseries._open_stores.clear()
+    assert timeseries.open_store(path, folder).resolution == 1800
+    # the checkout's hourly DAY_AHEAD cannot hold 48 periods a day
+    with pytest.raises(ValueError):
+        timeseries.open_store(path)
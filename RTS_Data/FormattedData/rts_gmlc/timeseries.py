@@ -0,0 +1,276 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from . import periods, source_data
+from .periods import DATE_COLUMNS
+
+RTS_DATA_DIR = os.path.dirname(source_data.SOURCE_DATA_DIR)
+TIMESERIES_DIR = os.path.join(RTS_DATA_DIR, 'timeseries_data_files')
+STORE_DIR = os.environ.get('RTS_GMLC_STORE', os.path.join(RTS_DATA_DIR, '.cache', 'timeseries'))
+# bump whenever the on-disk layout below changes so old stores get rebuilt
+STORE_VERSION = 1
+
+# keyed on (csv path, dtype, SourceData folder), holds (mtime_ns, size, TimeSeriesStore)
+_open_stores = {}
+
+
+def data_file(path, folder=None):
+    # Data File entries in timeseries_pointers.csv are relative to the SourceData folder
+    # absolute, so the result resolves the same when it is looked up again without the folder
+    full = os.path.abspath(os.path.join(folder or source_data.SOURCE_DATA_DIR, path))
+    if os.path.exists(full):
+        return full
+    # pointers spell some folders differently from the checkout (HYDRO vs Hydro),
+    # which only matters on case sensitive file systems
+    drive, rest = os.path.splitdrive(full)
+    resolved = drive + os.sep
+    for part in rest.split(os.sep):
+        if not part:
+            continue
+        candidate = os.path.join(resolved, part)
+        if not os.path.exists(candidate) and os.path.isdir(resolved):
+            matches = [p for p in os.listdir(resolved) if p.lower() == part.lower()]
+            if len(matches) == 1:
+                candidate = os.path.join(resolved, matches[0])
+        resolved = candidate
+    if not os.path.exists(resolved):
+        raise FileNotFoundError('Time series file not found: {}'.format(full))
+    return resolved
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def store_path(path, dtype='float64'):
+    # mirror the csv location below RTS_Data so stores of files with the same name never collide
+    rel = os.path.relpath(path, RTS_DATA_DIR)
+    if rel.startswith(os.pardir):
+        rel = os.path.join('external', hashlib.sha1(path.encode()).hexdigest()[:16], os.path.basename(path))
+    return os.path.join(STORE_DIR, os.path.splitext(rel)[0], np.dtype(dtype).name)
+
+
+def _parse_csv(path):
+    df = pd.read_csv(path)
+    columns = [str(c) for c in df.columns]
+    if columns[:4] == DATE_COLUMNS:
+        layout = 'period'
+        calendar = df.iloc[:, :4].to_numpy(dtype=np.int32)
+        data = df.iloc[:, 4:]
+        names = columns[4:]
+    elif columns[:3] == DATE_COLUMNS[:3] and all(c.isdigit() for c in columns[3:]):
+        # one row per day and one column per period (e.g. DAY_AHEAD_regional_Reg_Up.csv),
+        # flattened to one row per period holding a single series named after the file
+        layout = 'day'
+        periods = np.array([int(c) for c in columns[3:]], dtype=np.int32)
+        days = df.iloc[:, :3].to_numpy(dtype=np.int32)
+        calendar = np.column_stack([np.repeat(days, len(periods), axis=0), np.tile(periods, len(days))])
+        data = pd.DataFrame({os.path.splitext(os.path.basename(path))[0]: df.iloc[:, 3:].to_numpy().ravel()})
+        names = list(data.columns)
+    else:
+        raise ValueError('Unrecognized time series layout in {}: {}'.format(path, columns[:5]))
+    integer_columns = [n for n, dtype in zip(names, data.dtypes) if pd.api.types.is_integer_dtype(dtype)]
+    return layout, calendar, data.to_numpy(dtype=np.float64), names, integer_columns
+
+
+def _datetime_index(calendar, path, layout, folder=None):
+    resolution = periods.file_resolution(path, int(calendar[:, 3].max()), folder)
+    return periods.datetime_index(calendar, resolution, layout).to_numpy(), resolution
+
+
+def compile_store(path, dtype='float64', folder=None):
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    layout, calendar, values, columns, integer_columns = _parse_csv(path)
+    index, resolution = _datetime_index(calendar, path, layout, folder)
+    meta = {
+        'version': STORE_VERSION,
+        'source': path,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': file_hash(path),
+        'layout': layout,
+        'resolution': resolution,
+        'rows': len(index),
+        'columns': columns,
+        'integer_columns': integer_columns,
+        'dtype': np.dtype(dtype).name,
+    }
+    target = store_path(path, dtype)
+    tmp = '{}.tmp-{}'.format(target, os.getpid())
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    np.save(os.path.join(tmp, 'index.npy'), index)
+    np.save(os.path.join(tmp, 'calendar.npy'), calendar)
+    # column major, so every series is one contiguous block of the memory map
+    np.save(os.path.join(tmp, 'values.npy'), np.asfortranarray(values.astype(dtype)))
+    with open(os.path.join(tmp, 'meta.json'), 'w') as f:
+        json.dump(meta, f, indent=1)
+    shutil.rmtree(target, ignore_errors=True)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    try:
+        os.rename(tmp, target)
+    except OSError:
+        # another process finished compiling the same file first
+        shutil.rmtree(tmp, ignore_errors=True)
+    return meta
+
+
+def _read_meta(target):
+    try:
+        with open(os.path.join(target, 'meta.json')) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _is_fresh(meta, path, stat, dtype, folder=None):
+    if meta is None or meta.get('version') != STORE_VERSION:
+        return False
+    # a new Period_Resolution in simulation_objects.csv changes every timestamp of the file,
+    # read from the SourceData folder the file was looked up from
+    simulation = periods.file_simulation(path)
+    if simulation is not None and meta['resolution'] != periods.simulation_resolution(simulation, folder):
+        return False
+    if meta['size'] == stat.st_size and meta['mtime_ns'] == stat.st_mtime_ns:
+        return True
+    # touched but maybe not changed, only the content hash decides
+    if meta['size'] == stat.st_size and meta['sha256'] == file_hash(path):
+        meta['mtime_ns'] = stat.st_mtime_ns
+        with open(os.path.join(store_path(path, dtype), 'meta.json'), 'w') as f:
+            json.dump(meta, f, indent=1)
+        return True
+    return False
+
+
+class TimeSeriesStore(object):
+
+    def __init__(self, target, meta):
+        self.path = meta['source']
+        self.meta = meta
+        self.columns = meta['columns']
+        self.resolution = meta['resolution']
+        self.index = np.load(os.path.join(target, 'index.npy'), mmap_mode='r')
+        self.calendar = np.load(os.path.join(target, 'calendar.npy'), mmap_mode='r')
+        self.values = np.load(os.path.join(target, 'values.npy'), mmap_mode='r')
+        self._positions = {c: i for i, c in enumerate(self.columns)}
+        self._datetime_index = None
+
+    def __len__(self):
+        return len(self.index)
+
+    def datetime_index(self):
+        # shared with every other store on the same calendar and resolution
+        if self._datetime_index is None:
+            self._datetime_index = periods.datetime_index(self.calendar, self.resolution, self.meta['layout'])
+        return self._datetime_index
+
+    def column(self, name):
+        return self.values[:, self._positions[name]]
+
+    def frame(self, columns=None, date_columns=False):
+        columns = self.columns if columns is None else list(columns)
+        missing = [c for c in columns if c not in self._positions]
+        if missing:
+            raise KeyError('{} not in {}'.format(missing, self.path))
+        data = {c: self.column(c) for c in columns}
+        for c in self.meta['integer_columns']:
+            if c in data:
+                data[c] = data[c].astype(np.int64)
+        if date_columns:
+            # drop-in replacement for pd.read_csv on a Year,Month,Day,Period file
+            dates = {c: self.calendar[:, i].astype(np.int64) for i, c in enumerate(DATE_COLUMNS)}
+            return pd.DataFrame({**dates, **data}, columns=DATE_COLUMNS + columns)
+        return pd.DataFrame(data, index=self.datetime_index(), columns=columns)
+
+    def rows(self, start=None, end=None):
+        # the index is sorted, so a binary search gives the row offsets of [start, end)
+        # without touching any of the values
+        first = 0 if start is None else int(np.searchsorted(self.index, np.datetime64(pd.Timestamp(start), 'ns'), 'left'))
+        last = len(self) if end is None else int(np.searchsorted(self.index, np.datetime64(pd.Timestamp(end), 'ns'), 'left'))
+        return slice(first, max(first, last))
+
+    def window(self, start=None, end=None, columns=None):
+        columns = self.columns if columns is None else list(columns)
+        missing = [c for c in columns if c not in self._positions]
+        if missing:
+            raise KeyError('{} not in {}'.format(missing, self.path))
+        rows = self.rows(start, end)
+        data = {c: np.array(self.values[rows, self._positions[c]]) for c in columns}
+        for c in self.meta['integer_columns']:
+            if c in data:
+                data[c] = data[c].astype(np.int64)
+        return pd.DataFrame(data, index=self.datetime_index()[rows], columns=columns)
+
+
+def open_store(path, folder=None, dtype='float64'):
+    path = data_file(path, folder)
+    stat = os.stat(path)
+    key = (path, np.dtype(dtype).name, os.path.abspath(folder or source_data.SOURCE_DATA_DIR))
+    cached = _open_stores.get(key)
+    if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+    target = store_path(path, dtype)
+    meta = _read_meta(target)
+    if not _is_fresh(meta, path, stat, dtype, folder):
+        compile_store(path, dtype, folder)
+        meta = _read_meta(target)
+    store = TimeSeriesStore(target, meta)
+    _open_stores[key] = (stat.st_mtime_ns, stat.st_size, store)
+    return store
+
+
+def read_frame(path, columns=None, folder=None, date_columns=False):
+    return open_store(path, folder).frame(columns, date_columns)
+
+
+def read_window(path, start=None, end=None, columns=None, folder=None):
+    return open_store(path, folder).window(start, end, columns)
+
+
+def read_windows(requests, start=None, end=None, folder=None):
+    # requests maps a key to a (data file, column) pair. Every file is opened once and
+    # all of its requested columns are sliced in one call, the result keeps the request keys.
+    by_file = {}
+    for key, (path, column) in requests.items():
+        by_file.setdefault(path, []).append((key, column))
+    windows = {}
+    for path, wanted in by_file.items():
+        frame = read_window(path, start, end, list(dict.fromkeys(c for _, c in wanted)), folder)
+        for key, column in wanted:
+            windows[key] = frame[column]
+    return windows
+
+
+def compile_all(root=TIMESERIES_DIR, dtype='float64'):
+    compiled = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        # origin/ holds the raw Promod exports the regional load files were built from
+        dirnames[:] = sorted(d for d in dirnames if d != 'origin')
+        for name in sorted(filenames):
+            if name.lower().endswith('.csv'):
+                store = open_store(os.path.join(dirpath, name), dtype=dtype)
+                compiled.append(store.path)
+    return compiled
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compile the RTS time series csv files into binary stores.')
+    parser.add_argument('--folder', dest='folder', default=TIMESERIES_DIR,
+                        help='time series folder path')
+    parser.add_argument('--dtype', dest='dtype', default='float64', choices=['float32', 'float64'],
+                        help='value dtype of the compiled stores')
+    args = parser.parse_args()
+
+    for path in compile_all(args.folder, args.dtype):
+        print('compiled {} -> {}'.format(path, store_path(path)))